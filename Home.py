@@ -1,10 +1,37 @@
+import io
+import os
+
 import streamlit as st
 
+from painel_tempos import CronometroPagina
+
+cronometro = CronometroPagina('Home')
+
 st.set_page_config(
     page_title="Projeto UFC Data Engineering",
     layout="wide"
 )
 
+FOTO_PERFIL = "assets/foto perfil.png"
+LARGURA_FOTO = 200
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _miniatura(caminho, largura, versao):
+    """
+    Foto reduzida para a largura exibida e codificada em PNG UMA vez por processo
+    (`versao` = mtime do arquivo). Com os bytes já na largura e no formato pedidos,
+    o st.image não redimensiona nem recodifica a foto original a cada rerun.
+    """
+    from PIL import Image
+
+    with Image.open(caminho) as imagem:
+        largura = min(largura, imagem.width)
+        altura = max(1, round(imagem.height * largura / imagem.width))
+        saida = io.BytesIO()
+        imagem.resize((largura, altura), Image.LANCZOS).save(saida, format="PNG", optimize=True)
+    return saida.getvalue()
+
 # --- Título Principal ---
 st.title("🏆 Projeto de Portfólio: Análise de Estatísticas de Lutadores do UFC")
 st.markdown("---")
@@ -35,7 +62,9 @@ st.info("Navegue até a página **'Análise dos Lutadores'** no menu lateral par
 
 
 ## 🧑‍💻 Sobre Mim
-st.image("assets/foto perfil.png", caption="Foto de Perfil", width=200, output_format="PNG")
+with cronometro.etapa('Foto de perfil'):
+    foto = _miniatura(FOTO_PERFIL, LARGURA_FOTO, os.stat(FOTO_PERFIL).st_mtime_ns)
+    st.image(foto, caption="Foto de Perfil", width=LARGURA_FOTO, output_format="PNG")
 st.header("Hugo Dias")
 st.write("""
 Olá! Meu nome é Hugo, tenho 20 anos e estou atuando na área de Engenharia de Dados.
@@ -43,4 +72,6 @@ Este projeto demonstra minhas habilidades em **WebScraping-Pipelines** e **Visua
 Estou fazendo esse projeto pessoal, por conta de que gosto bastante do universo das lutas, então, uni o meu Hobby com minha profissão atual para fazer com muito empenho, espero que gostem!
 """)
 st.markdown(f"**LinkedIn:** https://linkedin.com/in/hugoduartedias")
-st.markdown("---")
\ No newline at end of file
+st.markdown("---")
+
+cronometro.painel()
@@ -0,0 +1,111 @@
+"""
+Benchmark dos backends de parsing (parsers.py).
+
+Lê as páginas .html de cada categoria do diretório de fixtures (indice/, lutador/ e luta/),
+confere que todos os backends produzem exatamente os mesmos dicionários que o backend de
+referência (bs4) em todas as funções de parsing e mede páginas/segundo de cada uma. O corpus
+padrão (benchmarks/fixtures) é marcação sintética até ser regravado do site real (veja o
+README dele).
+
+Uso:
+    python benchmarks/benchmark_parsers.py benchmarks/fixtures --repeticoes 3
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers import backends_disponiveis, obter_parser
+
+BASE_DETAIL_PATH = "/fighter-details/"
+
+# Medições: (rótulo, subdiretório do corpus, função de parsing aplicada a cada página)
+MEDICOES = [
+    ('Lutador', 'lutador', lambda backend, html: backend.parse_lutador(html)),
+    ('Lutas', 'lutador', lambda backend, html: backend.parse_lutas(html)),
+    ('Luta', 'luta', lambda backend, html: backend.parse_detalhes_luta(html)),
+    ('Índice', 'indice', lambda backend, html: backend.parse_links(html, BASE_DETAIL_PATH)),
+]
+CATEGORIAS = list(dict.fromkeys(categoria for _, categoria, _ in MEDICOES))
+
+
+def carregar_paginas(diretorio):
+    """Retorna {categoria: [HTML de cada arquivo .html]} para cada subdiretório de CATEGORIAS."""
+    paginas = {}
+    for categoria in CATEGORIAS:
+        caminho = os.path.join(diretorio, categoria)
+        arquivos = sorted(os.listdir(caminho)) if os.path.isdir(caminho) else []
+        paginas[categoria] = []
+        for arquivo in arquivos:
+            if arquivo.endswith('.html'):
+                with open(os.path.join(caminho, arquivo), encoding='utf-8') as f:
+                    paginas[categoria].append(f.read())
+    return paginas
+
+
+def medir(funcao, paginas, repeticoes):
+    """Executa funcao em todas as páginas `repeticoes` vezes e retorna páginas/segundo."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for html in paginas:
+            funcao(html)
+    decorrido = time.perf_counter() - inicio
+    return (len(paginas) * repeticoes) / decorrido if decorrido else float('inf')
+
+
+def verificar_equivalencia(backends, paginas):
+    """
+    Garante que todos os backends geram a mesma saída que o primeiro (referência) em
+    todas as medições. Retorna {rótulo da medição: páginas com saída diferente}.
+    """
+    referencia = backends[0]
+    divergencias = {}
+    for rotulo, categoria, funcao in MEDICOES:
+        esperados = [funcao(referencia, html) for html in paginas[categoria]]
+        divergencias[rotulo] = sum(
+            funcao(backend, html) != esperado
+            for backend in backends[1:]
+            for html, esperado in zip(paginas[categoria], esperados)
+        )
+    return divergencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a velocidade dos backends de parsing.")
+    parser.add_argument("diretorio", nargs='?', default=os.path.join(os.path.dirname(__file__), "fixtures"),
+                        help="Diretório com as páginas HTML salvas.")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Quantas vezes cada página é processada.")
+    parser.add_argument("--backends", nargs='+', default=None, help="Backends a comparar (padrão: todos disponíveis).")
+    args = parser.parse_args()
+
+    paginas = carregar_paginas(args.diretorio)
+    if not any(paginas.values()):
+        print(f"❌ Nenhuma página .html encontrada em {', '.join(f'{c}/' for c in CATEGORIAS)} de '{args.diretorio}'.")
+        return 1
+
+    nomes = args.backends or backends_disponiveis()
+    backends = [obter_parser(nome) for nome in nomes]
+    print(f"Páginas: {len(paginas['lutador'])} de lutador, {len(paginas['luta'])} de luta, "
+          f"{len(paginas['indice'])} de índice. Backends: {', '.join(nomes)}")
+
+    divergencias = verificar_equivalencia(backends, paginas)
+    if any(divergencias.values()):
+        detalhes = ', '.join(f"{rotulo}: {total}" for rotulo, total in divergencias.items() if total)
+        print(f"❌ Páginas com saída diferente da referência ({nomes[0]}): {detalhes}.")
+        return 1
+    print("✅ Todos os backends produziram saídas idênticas.")
+
+    print(f"\n{'Backend':<10}" + ''.join(f"{rotulo + ' (pág/s)':>18}" for rotulo, _, _ in MEDICOES))
+    for backend in backends:
+        taxas = [
+            medir(lambda html: funcao(backend, html), paginas[categoria], args.repeticoes) if paginas[categoria] else 0
+            for _, categoria, funcao in MEDICOES
+        ]
+        print(f"{backend.nome:<10}" + ''.join(f"{taxa:>18.1f}" for taxa in taxas))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
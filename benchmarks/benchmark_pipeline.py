@@ -0,0 +1,312 @@
+"""
+Benchmark offline do pipeline inteiro: coleta -> transformação -> carga do dashboard.
+
+Sobe o servidor stub (servidor_stub.py) com o corpus gravado em benchmarks/fixtures e
+latência/falhas injetadas, e roda cada etapa em um processo próprio, em sequência, em
+um diretório temporário:
+  1. coleta:        webscraping.pipeline_coleta_completa contra o stub -> CSV bruto
+  2. transformacao: transform.transformar_dados_ufc (em memória) e executar_transformacao
+                    (mart + índice + matriz + partições, como o transform.py)
+  3. dashboard:     Home.py e cada página em pages/ pelo AppTest do Streamlit, a
+                    primeira execução (fria) e uma segunda (caches do processo quentes)
+
+Um processo por etapa dá medidas limpas: tempo de parede da etapa, CPU (usuário +
+sistema, incluindo os processos de parsing) e pico de RSS vêm do os.wait4 do processo.
+O resultado vai para um JSON (--saida); com --comparar, as medidas são comparadas com
+um resultado anterior e o script termina com código 1 se alguma piorou além da --tolerancia.
+
+Uso:
+    python benchmarks/benchmark_pipeline.py --fator 20 --latencia-ms 20 --taxa-erro 0.01
+    python benchmarks/benchmark_pipeline.py --fator 20 --comparar benchmarks/resultados/anterior.json
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIR_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+DIR_RESULTADOS = os.path.join(DIR_BENCHMARKS, 'resultados')
+
+ETAPAS = ['coleta', 'transformacao', 'dashboard']
+PAGINAS_DASHBOARD = ['Home.py', 'pages/01_Análise_Dos_Lutadores.py', 'pages/02_Filtro_Por_Peso.py']
+# Medidas comparadas com --comparar (maior = pior)
+MEDIDAS_COMPARADAS = ['segundos', 'cpu_segundos', 'pico_rss_mb']
+
+# --------------------------------------------------------------------------------
+# ETAPAS (cada uma roda em um processo filho, com o diretório de trabalho como cwd)
+# --------------------------------------------------------------------------------
+
+def etapa_coleta(args):
+    from webscraping import pipeline_coleta_completa
+
+    inicio = time.perf_counter()
+    df = pipeline_coleta_completa(max_workers=args.workers, requisicoes_por_segundo=args.rps, max_em_voo=args.max_em_voo,
+                                  parser=args.parser, processos_parse=args.processos_parse, spool_dir='spool_html',
+                                  com_lutas=args.lutas)
+    segundos = time.perf_counter() - inicio
+    df.to_csv('dados_ufc_brutos.csv', index=False)
+    if args.lutas:
+        df.attrs['lutas'].to_csv('dados_ufc_lutas_brutos.csv', index=False)
+
+    metricas = df.attrs['metricas']
+    requisicao = next((latencia for latencia in metricas['latencias'] if latencia['nome'] == 'requisicao'), {})
+    return {
+        'segundos': segundos,
+        'lutadores': len(df),
+        'paginas': metricas['paginas'],
+        'paginas_por_segundo': metricas['paginas'] / segundos if segundos else None,
+        'bytes': metricas['bytes'],
+        'requisicao_p50_ms': requisicao['p50'] * 1000 if requisicao.get('p50') is not None else None,
+        'requisicao_p99_ms': requisicao['p99'] * 1000 if requisicao.get('p99') is not None else None,
+        'lutadores_com_falha': len(df.attrs['urls_com_falha']),
+        'estatisticas_http': df.attrs['estatisticas_http'],
+    }
+
+
+def etapa_transformacao(args):
+    import pandas as pd
+    from transform import executar_transformacao, executar_transformacao_lutas, transformar_dados_ufc
+
+    inicio = time.perf_counter()
+    df_bruto = pd.read_csv('dados_ufc_brutos.csv')
+    leitura = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    transformar_dados_ufc(df_bruto)
+    em_memoria = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    linhas = executar_transformacao('dados_ufc_brutos.csv')
+    if args.lutas:
+        executar_transformacao_lutas('dados_ufc_lutas_brutos.csv')
+    segundos = time.perf_counter() - inicio
+    return {
+        'segundos': segundos,
+        'lutadores': linhas,
+        'lutadores_por_segundo': linhas / segundos if segundos else None,
+        'leitura_csv_segundos': leitura,
+        'transformar_dados_ufc_segundos': em_memoria,
+    }
+
+
+def etapa_dashboard(args):
+    from streamlit.testing.v1 import AppTest
+
+    # As páginas leem os artefatos (e as imagens) do diretório atual
+    if not os.path.exists('assets'):
+        shutil.copytree(os.path.join(RAIZ, 'assets'), 'assets')
+
+    paginas = {}
+    inicio_etapa = time.perf_counter()
+    for pagina in PAGINAS_DASHBOARD:
+        app = AppTest.from_file(os.path.join(RAIZ, pagina), default_timeout=120)
+        inicio = time.perf_counter()
+        app.run()
+        fria = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        app.run()
+        quente = time.perf_counter() - inicio
+        paginas[pagina] = {
+            'fria_segundos': fria,
+            'quente_segundos': quente,
+            'erros': len(app.exception) + len(app.error),
+        }
+    return {
+        'segundos': time.perf_counter() - inicio_etapa,
+        'paginas': paginas,
+    }
+
+
+FUNCOES_ETAPAS = {'coleta': etapa_coleta, 'transformacao': etapa_transformacao, 'dashboard': etapa_dashboard}
+
+
+def _executar_etapa_filho(args):
+    """Ponto de entrada do processo filho: roda a etapa e grava <etapa>.json no diretório de trabalho."""
+    sys.path.insert(0, RAIZ)
+    os.chdir(args.dir_trabalho)
+    resultado = FUNCOES_ETAPAS[args.etapa](args)
+    with open(f'{args.etapa}.json', 'w', encoding='utf-8') as f:
+        json.dump(resultado, f)
+    return 0
+
+# --------------------------------------------------------------------------------
+# ORQUESTRAÇÃO (processo principal)
+# --------------------------------------------------------------------------------
+
+def _iniciar_servidor(args):
+    comando = [sys.executable, os.path.join(DIR_BENCHMARKS, 'servidor_stub.py'), '--porta', '0',
+               '--fator', str(args.fator), '--latencia-ms', str(args.latencia_ms), '--jitter-ms', str(args.jitter_ms),
+               '--taxa-erro', str(args.taxa_erro), '--taxa-queda', str(args.taxa_queda), '--semente', str(args.semente)]
+    if args.fixtures:
+        comando += ['--fixtures', args.fixtures]
+    servidor = subprocess.Popen(comando, stdout=subprocess.PIPE, text=True, encoding='utf-8')
+    linha = servidor.stdout.readline()
+    endereco = re.search(r'http://\S+', linha)
+    if endereco is None:
+        servidor.kill()
+        raise RuntimeError(f"O servidor stub não iniciou: {linha.strip() or 'sem saída'}")
+    print(linha.strip())
+    return servidor, endereco.group(0)
+
+
+def _medir_processo(comando, ambiente, log):
+    """Roda o comando e retorna (código, segundos, cpu_segundos, pico_rss_mb) do processo."""
+    inicio = time.perf_counter()
+    with open(log, 'w', encoding='utf-8') as saida:
+        processo = subprocess.Popen(comando, env=ambiente, stdout=saida, stderr=subprocess.STDOUT)
+        if not hasattr(os, 'wait4'):
+            return processo.wait(), time.perf_counter() - inicio, None, None
+        _, status, uso = os.wait4(processo.pid, 0)
+        processo.returncode = os.waitstatus_to_exitcode(status)
+    segundos = time.perf_counter() - inicio
+    # ru_maxrss: KB no Linux, bytes no macOS
+    pico_rss_mb = uso.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return processo.returncode, segundos, uso.ru_utime + uso.ru_stime, pico_rss_mb
+
+
+def _versao_do_codigo():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(atual, anterior, tolerancia):
+    """Lista de (etapa, medida, anterior, atual) que pioraram mais que a `tolerancia` (fração)."""
+    regressoes = []
+    for etapa, medidas in atual['etapas'].items():
+        base = anterior.get('etapas', {}).get(etapa)
+        if not base:
+            continue
+        for medida in MEDIDAS_COMPARADAS:
+            valor, valor_base = medidas.get(medida), base.get(medida)
+            if valor is not None and valor_base and valor > valor_base * (1 + tolerancia):
+                regressoes.append((etapa, medida, valor_base, valor))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline da coleta, transformação e carga do dashboard.")
+    parser.add_argument("--etapas", nargs='+', choices=ETAPAS, default=ETAPAS,
+                        help="Etapas medidas (as anteriores rodam mesmo assim, para gerar a entrada).")
+    parser.add_argument("--fixtures", default=None, help="Corpus gravado (padrão: benchmarks/fixtures).")
+    parser.add_argument("--fator", type=int, default=10, help="Cópias de cada lutador gravado servidas pelo stub.")
+    parser.add_argument("--latencia-ms", type=float, default=20.0, help="Latência fixa injetada em cada resposta.")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Latência aleatória extra (0 a N ms).")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="Fração de respostas 503 injetadas.")
+    parser.add_argument("--taxa-queda", type=float, default=0.0, help="Fração de conexões derrubadas.")
+    parser.add_argument("--semente", type=int, default=0, help="Semente das falhas e latências do stub.")
+    parser.add_argument("--workers", type=int, default=8, help="Threads de coleta.")
+    parser.add_argument("--rps", type=float, default=200.0, help="Requisições por segundo (limite do cliente).")
+    parser.add_argument("--max-em-voo", type=int, default=8, help="Requisições simultâneas.")
+    parser.add_argument("--parser", default=None, help="Backend de parsing (padrão: o mais rápido disponível).")
+    parser.add_argument("--processos-parse", type=int, default=0, help="Processos de parsing (coleta em estágios).")
+    parser.add_argument("--lutas", action="store_true", help="Modo por luta (também busca as páginas de luta).")
+    parser.add_argument("--saida", default=None,
+                        help="Arquivo JSON do resultado (padrão: benchmarks/resultados/<versão>.json).")
+    parser.add_argument("--comparar", default=None, metavar="JSON", help="Resultado anterior para detectar regressões.")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Piora tolerada no --comparar (0.25 = 25%%).")
+    parser.add_argument("--manter", action="store_true", help="Não apaga o diretório de trabalho no final.")
+    # Uso interno: execução de uma etapa no processo filho
+    parser.add_argument("--etapa", choices=ETAPAS, help=argparse.SUPPRESS)
+    parser.add_argument("--dir-trabalho", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.etapa:
+        return _executar_etapa_filho(args)
+
+    versao = _versao_do_codigo()
+    ultima_etapa = max(ETAPAS.index(etapa) for etapa in args.etapas)
+    diretorio = tempfile.mkdtemp(prefix='benchmark_pipeline_')
+    servidor, endereco = _iniciar_servidor(args)
+    ambiente = dict(os.environ, UFCSTATS_BASE_URL=endereco, PYTHONUNBUFFERED='1')
+    resultado = {
+        'versao': versao,
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'configuracao': {chave: valor for chave, valor in vars(args).items()
+                         if chave not in ('etapa', 'dir_trabalho', 'saida', 'comparar', 'manter')},
+        'etapas': {},
+    }
+
+    try:
+        for etapa in ETAPAS[:ultima_etapa + 1]:
+            print(f"⏱️ Etapa '{etapa}'...")
+            comando = [sys.executable, os.path.abspath(__file__), *sys.argv[1:], '--etapa', etapa, '--dir-trabalho', diretorio]
+            codigo, segundos, cpu, pico_rss_mb = _medir_processo(comando, ambiente, os.path.join(diretorio, f'{etapa}.log'))
+            if codigo != 0:
+                print(f"❌ A etapa '{etapa}' falhou (código {codigo}); veja '{os.path.join(diretorio, etapa + '.log')}'.")
+                args.manter = True
+                return 1
+            if etapa not in args.etapas:
+                continue
+            with open(os.path.join(diretorio, f'{etapa}.json'), encoding='utf-8') as f:
+                medidas = json.load(f)
+            medidas.update({'segundos_processo': segundos, 'cpu_segundos': cpu, 'pico_rss_mb': pico_rss_mb})
+            resultado['etapas'][etapa] = medidas
+
+        with urllib.request.urlopen(f"{endereco}/_stub/estatisticas") as resposta:
+            resultado['servidor'] = json.load(resposta)
+    finally:
+        servidor.terminate()
+        servidor.wait()
+        if not args.manter:
+            shutil.rmtree(diretorio, ignore_errors=True)
+        else:
+            print(f"📁 Diretório de trabalho mantido em '{diretorio}'.")
+
+    # --- Resultado ---
+    print(f"\n{'Etapa':<15}{'Tempo (s)':>11}{'Processo (s)':>14}{'CPU (s)':>10}{'Pico RSS (MB)':>15}  Vazão")
+    for etapa, medidas in resultado['etapas'].items():
+        if 'paginas_por_segundo' in medidas:
+            vazao = f"{medidas['paginas_por_segundo']:.1f} páginas/s"
+        elif 'lutadores_por_segundo' in medidas:
+            vazao = f"{medidas['lutadores_por_segundo']:.0f} lutadores/s"
+        else:
+            vazao = ''
+        cpu = f"{medidas['cpu_segundos']:10.2f}" if medidas['cpu_segundos'] is not None else f"{'-':>10}"
+        rss = f"{medidas['pico_rss_mb']:15.1f}" if medidas['pico_rss_mb'] is not None else f"{'-':>15}"
+        print(f"{etapa:<15}{medidas['segundos']:11.2f}{medidas['segundos_processo']:14.2f}{cpu}{rss}  {vazao}")
+    if 'dashboard' in resultado['etapas']:
+        for pagina, medidas in resultado['etapas']['dashboard']['paginas'].items():
+            print(f"  {pagina:<40} fria {medidas['fria_segundos']:6.2f} s   quente {medidas['quente_segundos']:6.2f} s"
+                  + (f"   ⚠️ {medidas['erros']} erros" if medidas['erros'] else ''))
+    if 'coleta' in resultado['etapas']:
+        coleta = resultado['etapas']['coleta']
+        print(f"\nColeta: {coleta['paginas']} páginas, {coleta['bytes'] / 1e6:.1f} MB, {coleta['lutadores']} lutadores "
+              f"({coleta['lutadores_com_falha']} com falha); servidor: {resultado['servidor']}")
+
+    saida = args.saida or os.path.join(DIR_RESULTADOS, f"{versao or 'resultado'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"\n📄 Resultado salvo em '{saida}'.")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            anterior = json.load(f)
+        if anterior.get('configuracao') != resultado['configuracao']:
+            print("⚠️ O resultado anterior usou outra configuração (fator, latência, falhas...): a comparação pode não ser justa.")
+        regressoes = comparar(resultado, anterior, args.tolerancia)
+        for etapa, medida, valor_base, valor in regressoes:
+            print(f"❌ Regressão em {etapa}.{medida}: {valor_base:.2f} -> {valor:.2f} (+{valor / valor_base - 1:.0%})")
+        if regressoes:
+            return 1
+        print(f"✅ Nenhuma regressão acima de {args.tolerancia:.0%} em relação a '{args.comparar}' "
+              f"(versão {anterior.get('versao')}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Benchmark da busca dos lutadores mais parecidos (similaridade.MotorSimilaridade).
+
+Replica o mart N vezes (com um pequeno ruído, para não haver empates exatos), monta
+a matriz padronizada e mede a latência de consultas aleatórias com e sem a restrição
+por peso. Confere cada resposta contra uma busca de referência (distância completa +
+ordenação do elenco inteiro); como há lutadores com estatísticas idênticas (ex: sem
+lutas no UFC), a comparação é pelas distâncias, não pelas posições.
+
+Uso:
+    python benchmarks/benchmark_similaridade.py --fator 100
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from similaridade import COLUNAS_SIMILARIDADE, MotorSimilaridade, construir_matriz
+from transform import ARQUIVO_MART, ler_mart
+
+
+def busca_referencia(matriz, linha, n, grupos=None):
+    """Distância de todos para todos os candidatos + ordenação completa (sem truques)."""
+    distancias = np.linalg.norm(matriz.astype('float64') - matriz[linha].astype('float64'), axis=1)
+    distancias[linha] = np.inf
+    if grupos is not None:
+        distancias[grupos != grupos[linha]] = np.inf
+    return np.sort(distancias)[:min(n, int(np.isfinite(distancias).sum()))]
+
+
+def medir(motor, linhas, n, grupos):
+    tempos = []
+    for linha in linhas:
+        inicio = time.perf_counter()
+        motor.mais_parecidos(linha, n, grupos)
+        tempos.append(time.perf_counter() - inicio)
+    tempos = np.array(tempos) * 1000
+    return np.percentile(tempos, 50), np.percentile(tempos, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a busca dos N lutadores mais parecidos.")
+    parser.add_argument("--arquivo", default=os.path.join(RAIZ, ARQUIVO_MART), help="Mart (Parquet) de entrada.")
+    parser.add_argument("--fator", type=int, default=100, help="Quantas vezes o mart é replicado.")
+    parser.add_argument("--consultas", type=int, default=200, help="Consultas aleatórias medidas.")
+    parser.add_argument("--n", type=int, default=10, help="Quantidade de lutadores parecidos por consulta.")
+    args = parser.parse_args()
+
+    df_base = ler_mart(args.arquivo, COLUNAS_SIMILARIDADE + ['Weight'])
+    df = pd.concat([df_base] * args.fator, ignore_index=True)
+    gerador = np.random.default_rng(0)
+    df[COLUNAS_SIMILARIDADE] = df[COLUNAS_SIMILARIDADE].astype('float64') * gerador.uniform(0.99, 1.01, (len(df), len(COLUNAS_SIMILARIDADE)))
+    grupos = df['Weight'].to_numpy()
+    print(f"Entrada: {len(df_base)} lutadores x {args.fator} = {len(df)} lutadores")
+
+    inicio = time.perf_counter()
+    motor = MotorSimilaridade(construir_matriz(df))
+    tempo_construcao = time.perf_counter() - inicio
+
+    linhas = gerador.integers(0, len(df), args.consultas)
+    for linha in linhas[:20]:
+        for grupos_consulta in (None, grupos):
+            esperado = busca_referencia(motor.matriz, linha, args.n, grupos_consulta)
+            _, obtido = motor.mais_parecidos(linha, args.n, grupos_consulta)
+            if len(obtido) != len(esperado) or not np.allclose(obtido, esperado, atol=1e-3):
+                print(f"❌ Resultado diferente da busca de referência na linha {linha}.")
+                return 1
+    print("✅ Mesmas distâncias da busca de referência.")
+
+    p50, p99 = medir(motor, linhas, args.n, None)
+    p50_peso, p99_peso = medir(motor, linhas, args.n, grupos)
+    print(f"\nMatriz ({motor.matriz.shape[0]} x {motor.matriz.shape[1]}, float32): {tempo_construcao:8.3f} s")
+    print(f"Top-{args.n} (elenco inteiro): p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+    print(f"Top-{args.n} (mesmo peso):     p50 {p50_peso:7.2f} ms   p99 {p99_peso:7.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Benchmark do transform vetorizado (transform.transformar_dados_ufc) contra a
+implementação anterior, linha a linha (transformar_dados_ufc_legado, abaixo).
+
+Replica o CSV bruto N vezes, mede as duas versões e confere que a saída é igual
+para as linhas válidas (o legado perdia os empates de recordes como '17-2-0 (1 NC)'
+e mantinha DOB como texto; essas diferenças são esperadas e ficam fora da comparação).
+
+Uso:
+    python benchmarks/benchmark_transform.py --fator 100
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from transform import transformar_dados_ufc
+
+
+def transformar_dados_ufc_legado(df):
+    """Cópia da implementação original (apply por linha + replace por coluna)."""
+    df_clean = df.copy()
+
+    percentual_cols = ['Str. Acc.', 'Str. Def', 'TD Acc.', 'TD Def.']
+    for col in percentual_cols:
+        df_clean[col] = df_clean[col].astype(str).str.replace('%', '', regex=False).str.strip()
+        df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce') / 100.0
+
+    df_clean['Weight'] = df_clean['Weight'].astype(str).str.replace(' lbs.', '', regex=False).str.strip()
+    df_clean['Weight'] = pd.to_numeric(df_clean['Weight'], errors='coerce')
+
+    df_clean['Reach'] = df_clean['Reach'].astype(str).str.replace('"', '', regex=False).str.strip()
+    df_clean['Reach'] = pd.to_numeric(df_clean['Reach'], errors='coerce')
+
+    def converter_altura(altura_str):
+        if pd.isna(altura_str) or 'N/A' in altura_str or 'None' in altura_str:
+            return None
+        try:
+            partes = altura_str.replace('"', '').split("'")
+            feet = float(partes[0].strip())
+            inches = float(partes[1].strip())
+            return (feet * 12) + inches
+        except:
+            return None
+
+    df_clean['Height_in_inches'] = df_clean['Height'].apply(converter_altura)
+    df_clean = df_clean.drop(columns=['Height'])
+
+    df_clean[['Wins', 'Losses', 'Draws']] = df_clean['Recorde'].str.split('-', expand=True).fillna(0)
+    df_clean['Wins'] = pd.to_numeric(df_clean['Wins'], errors='coerce')
+    df_clean['Losses'] = pd.to_numeric(df_clean['Losses'], errors='coerce')
+    df_clean['Draws'] = pd.to_numeric(df_clean['Draws'], errors='coerce')
+    df_clean = df_clean.drop(columns=['Recorde'])
+
+    numeric_cols_to_convert = ['SLpM', 'SApM', 'TD Avg.', 'Sub. Avg.']
+    for col in numeric_cols_to_convert:
+        df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+
+    return df_clean
+
+
+def cronometrar(funcao, df, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(df)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def comparar(legado, novo):
+    """Retorna a lista de colunas em que as linhas válidas divergem."""
+    divergentes = []
+    for col in legado.columns:
+        if col == 'DOB':
+            continue
+        a, b = legado[col], novo[col]
+        if col == 'Draws':
+            validas = a.notna()
+            a, b = a[validas], b[validas]
+        if pd.api.types.is_numeric_dtype(a):
+            iguais = np.allclose(a.astype(float), b.astype(float), equal_nan=True)
+        else:
+            iguais = a.fillna('').astype(str).equals(b.fillna('').astype(str))
+        if not iguais:
+            divergentes.append(col)
+    return divergentes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o transform vetorizado contra a versão legada.")
+    parser.add_argument("--arquivo", default=os.path.join(RAIZ, 'dados_ufc_brutos.csv'), help="CSV bruto de entrada.")
+    parser.add_argument("--fator", type=int, default=100, help="Quantas vezes o CSV é replicado.")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Execuções por versão (vale a melhor).")
+    args = parser.parse_args()
+
+    df_base = pd.read_csv(args.arquivo)
+    df = pd.concat([df_base] * args.fator, ignore_index=True)
+    print(f"Entrada: {len(df_base)} linhas x {args.fator} = {len(df)} linhas")
+
+    tempo_legado, saida_legado = cronometrar(transformar_dados_ufc_legado, df, args.repeticoes)
+    tempo_novo, saida_nova = cronometrar(transformar_dados_ufc, df, args.repeticoes)
+
+    divergentes = comparar(saida_legado, saida_nova)
+    if divergentes:
+        print(f"❌ Saídas diferentes nas colunas: {', '.join(divergentes)}")
+        return 1
+    print("✅ Saída idêntica à versão legada para as linhas válidas.")
+
+    print(f"\nLegado:     {tempo_legado:8.3f} s ({len(df) / tempo_legado:,.0f} linhas/s)")
+    print(f"Vetorizado: {tempo_novo:8.3f} s ({len(df) / tempo_novo:,.0f} linhas/s)")
+    print(f"Speedup:    {tempo_legado / tempo_novo:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
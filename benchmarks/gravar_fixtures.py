@@ -0,0 +1,88 @@
+"""
+Grava o corpus de páginas do UFCStats usado pelos benchmarks (benchmarks/fixtures).
+
+Para cada letra, baixa a página de índice e as páginas dos primeiros --por-letra
+lutadores (e, com --lutas-por-lutador, as páginas das lutas de cada um). O índice
+gravado fica só com as linhas desses lutadores e todos os links são gravados com a
+base do UFCStats (servidor_stub.BASE_GRAVADA), qualquer que seja a origem.
+A coleta respeita o limitador de taxa (--rps) como o webscraping.py.
+
+Uso:
+    python benchmarks/gravar_fixtures.py --por-letra 2 --lutas-por-lutador 1
+    UFCSTATS_BASE_URL=http://127.0.0.1:8790 python benchmarks/gravar_fixtures.py  # servidor_sintetico.py
+"""
+import argparse
+import os
+import shutil
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from indice_lutadores import id_lutador
+from parsers import obter_parser
+from servidor_stub import BASE_GRAVADA, DIR_FIXTURES, EXTENSAO, REGEX_LINHA_INDICE
+from transporte import ClienteHTTP, LimitadorDeTaxa
+from webscraping import ALFABETO, BASE_DETAIL_URL, BASE_INDEX_URL, BASE_URL, REQUISICOES_POR_SEGUNDO
+
+
+def _gravar(diretorio, nome, html):
+    os.makedirs(diretorio, exist_ok=True)
+    with open(os.path.join(diretorio, nome + EXTENSAO), 'w', encoding='utf-8') as f:
+        f.write(html.replace(BASE_URL, BASE_GRAVADA))
+
+
+def recortar_indice(html, urls):
+    """Página de índice só com as linhas dos lutadores em `urls` (o restante da página não muda)."""
+    linhas = list(REGEX_LINHA_INDICE.finditer(html))
+    if not linhas:
+        return html
+    mantidas = ''.join(linha.group(0) for linha in linhas if any(url in linha.group(0) for url in urls))
+    return html[:linhas[0].start()] + mantidas + html[linhas[-1].end():]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grava o corpus de páginas do UFCStats dos benchmarks.")
+    parser.add_argument("--saida", default=DIR_FIXTURES, help="Diretório do corpus (substituído).")
+    parser.add_argument("--por-letra", type=int, default=2, help="Lutadores gravados por letra do índice.")
+    parser.add_argument("--lutas-por-lutador", type=int, default=1, help="Páginas de luta gravadas por lutador.")
+    parser.add_argument("--rps", type=float, default=REQUISICOES_POR_SEGUNDO, help="Requisições por segundo.")
+    args = parser.parse_args()
+
+    analisador = obter_parser()
+    temporario = args.saida + '.tmp'
+    shutil.rmtree(temporario, ignore_errors=True)
+    total_lutadores = total_lutas = 0
+
+    print(f"Gravando o corpus de '{BASE_URL}' em '{args.saida}'...")
+    with ClienteHTTP(limitador=LimitadorDeTaxa(requisicoes_por_segundo=args.rps, max_em_voo=1)) as cliente:
+        for letra in ALFABETO:
+            html, _ = cliente.baixar(f"{BASE_INDEX_URL}?char={letra}&page=all")
+            urls = sorted(analisador.parse_links(html, BASE_DETAIL_URL))[:args.por_letra]
+            if not urls:
+                continue
+            _gravar(os.path.join(temporario, 'indice'), letra, recortar_indice(html, urls))
+
+            for url in urls:
+                html_lutador, _ = cliente.baixar(url)
+                _gravar(os.path.join(temporario, 'lutador'), id_lutador(url), html_lutador)
+                total_lutadores += 1
+                for luta in analisador.parse_lutas(html_lutador)[:args.lutas_por_lutador]:
+                    html_luta, _ = cliente.baixar(luta['URL_Luta'])
+                    _gravar(os.path.join(temporario, 'luta'), luta['ID_Luta'], html_luta)
+                    total_lutas += 1
+            print(f"✅ Letra {letra}: {len(urls)} lutadores gravados.")
+
+    # A descrição do corpus (README.md) continua no diretório regravado
+    descricao = os.path.join(args.saida, 'README.md')
+    if os.path.exists(descricao):
+        shutil.copy2(descricao, temporario)
+    shutil.rmtree(args.saida, ignore_errors=True)
+    os.replace(temporario, args.saida)
+    print(f"\n📼 Corpus gravado: {total_lutadores} lutadores e {total_lutas} páginas de luta em '{args.saida}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+"""
+Servidor HTTP local com páginas sintéticas no formato do UFCStats, geradas a partir do
+dados_ufc_brutos.csv. É a origem do corpus sintético de benchmarks/fixtures: o
+gravar_fixtures.py grava o corpus a partir deste servidor quando não há acesso ao site real.
+
+- /statistics/fighters?char=X: página de índice com os lutadores cujo último nome começa
+  com a letra, na ordem do CSV.
+- /fighter-details/<id>: página do lutador com as estatísticas do CSV e um histórico de
+  lutas fictício contra os vizinhos do lutador no CSV (até 5 antes e 5 depois).
+- /fight-details/<id>: página de detalhes de uma dessas lutas.
+
+Tudo é determinístico (IDs derivados do nome e da data de nascimento, resultados e números
+derivados da posição no CSV), então o mesmo CSV sempre gera o mesmo corpus. As páginas usam
+as mesmas classes e tabelas que o parsers.py lê, mas os eventos e os números das lutas são
+fictícios.
+
+Uso:
+    python benchmarks/servidor_sintetico.py --porta 8790
+    UFCSTATS_BASE_URL=http://127.0.0.1:8790 python benchmarks/gravar_fixtures.py --por-letra 2 --lutas-por-lutador 1
+"""
+import argparse
+import csv
+import hashlib
+import html
+import http.server
+import os
+import re
+import sys
+from collections import defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_BRUTO = os.path.join(RAIZ, 'dados_ufc_brutos.csv')
+# Base dos links gerados (trocada pela base do servidor ao servir, como no servidor_stub.py)
+BASE_GERADA = 'http://ufcstats.com'
+# Vizinhos no CSV (antes e depois) enfrentados por cada lutador
+VIZINHOS = 5
+
+# --------------------------------------------------------------------------------
+# ELENCO (lido do CSV bruto)
+# --------------------------------------------------------------------------------
+
+def id_sintetico(texto):
+    return hashlib.sha1(texto.encode()).hexdigest()[:16]
+
+
+class Elenco:
+    """Lutadores do CSV bruto com IDs sintéticos, agrupados por letra e com as lutas entre vizinhos."""
+
+    def __init__(self, caminho=ARQUIVO_BRUTO):
+        with open(caminho, encoding='utf-8') as f:
+            self.linhas = list(csv.DictReader(f))
+        for linha in self.linhas:
+            linha['id'] = id_sintetico(linha['Nome'] + '|' + linha['DOB'])
+        self.ids = [linha['id'] for linha in self.linhas]
+        self.posicao = {id_: posicao for posicao, id_ in enumerate(self.ids)}
+        self.por_id = {linha['id']: linha for linha in self.linhas}
+
+        self.por_letra = defaultdict(list)
+        for linha in self.linhas:
+            partes = linha['Nome'].split()
+            inicial = (partes[-1] if partes else 'X')[0].upper()
+            if 'A' <= inicial <= 'Z':
+                self.por_letra[inicial].append(linha)
+
+        # ID da luta -> par de lutadores (em ordem de ID)
+        self.lutas = {}
+        for id_ in self.ids:
+            for oponente in self.oponentes(id_):
+                self.lutas[id_luta(id_, oponente)] = tuple(sorted([id_, oponente]))
+
+    def __len__(self):
+        return len(self.linhas)
+
+    def oponentes(self, id_):
+        posicao = self.posicao[id_]
+        encontrados = []
+        for distancia in range(1, VIZINHOS + 1):
+            for outra in (posicao - distancia, posicao + distancia):
+                if 0 <= outra < len(self.ids):
+                    encontrados.append(self.ids[outra])
+        return encontrados
+
+    def resultado(self, id_, oponente):
+        menor, maior = sorted([id_, oponente])
+        if (self.posicao[menor] + self.posicao[maior]) % 3:
+            return 'win'
+        return 'loss' if id_ == menor else 'win'
+
+
+def id_luta(id_1, id_2):
+    return id_sintetico('|'.join(sorted([id_1, id_2])))
+
+# --------------------------------------------------------------------------------
+# PÁGINAS (mesma estrutura HTML do UFCStats)
+# --------------------------------------------------------------------------------
+
+CABECALHO = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta http-equiv="X-UA-Compatible" content="IE=edge">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>{titulo}</title>
+  <link rel="stylesheet" href="http://ufcstats.com/static/css/app.css">
+  <link rel="shortcut icon" href="http://ufcstats.com/static/img/favicon.ico">
+</head>
+<body class="b-page">
+<header class="b-statistics__header">
+  <div class="b-statistics__container">
+    <nav class="b-statistics__nav">
+      <ul class="b-statistics__nav-items">
+        <li class="b-statistics__nav-item"><a class="b-statistics__nav-link" href="http://ufcstats.com/statistics/events/completed">Events</a></li>
+        <li class="b-statistics__nav-item"><a class="b-statistics__nav-link b-statistics__nav-link_active" href="http://ufcstats.com/statistics/fighters">Fighters</a></li>
+      </ul>
+    </nav>
+  </div>
+</header>
+'''
+RODAPE = '''
+<footer class="b-statistics__footer"><div class="b-statistics__container"><p class="b-statistics__copyright">Copyright © 2024 UFC Stats</p></div></footer>
+<script src="http://ufcstats.com/static/js/app.js"></script>
+</body>
+</html>
+'''
+
+
+def pagina_indice(elenco, letra):
+    linhas = []
+    for lutador in elenco.por_letra.get(letra, []):
+        partes = lutador['Nome'].split()
+        primeiro, ultimo = ' '.join(partes[:-1]), (partes[-1] if partes else '')
+        url = f"{BASE_GERADA}/fighter-details/{lutador['id']}"
+        recorde = re.match(r'(\d+)-(\d+)-(\d+)', lutador['Recorde'])
+        vitorias, derrotas, empates = recorde.groups() if recorde else ('', '', '')
+        linhas.append(f'''<tr class="b-statistics__table-row">
+              <td class="b-statistics__table-col">
+                <a href="{url}" class="b-link b-link_style_black">{html.escape(primeiro)}</a>
+              </td>
+              <td class="b-statistics__table-col">
+                <a href="{url}" class="b-link b-link_style_black">{html.escape(ultimo)}</a>
+              </td>
+              <td class="b-statistics__table-col">
+                <a href="{url}" class="b-link b-link_style_black"></a>
+              </td>
+              <td class="b-statistics__table-col">{html.escape(lutador['Height'])}</td>
+              <td class="b-statistics__table-col">{html.escape(lutador['Weight'])}</td>
+              <td class="b-statistics__table-col">{html.escape(lutador['Reach'])}</td>
+              <td class="b-statistics__table-col">{html.escape(lutador['STANCE'])}</td>
+              <td class="b-statistics__table-col">{vitorias}</td>
+              <td class="b-statistics__table-col">{derrotas}</td>
+              <td class="b-statistics__table-col">{empates}</td>
+              <td class="b-statistics__table-col"></td>
+            </tr>
+''')
+    letras = ''.join(
+        f'<li class="b-statistics__nav-item"><a class="b-statistics__nav-link" '
+        f'href="{BASE_GERADA}/statistics/fighters?char={c.lower()}&amp;page=all">{c}</a></li>'
+        for c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    )
+    return CABECALHO.format(titulo='Fighters') + f'''<section class="b-statistics__section">
+  <div class="b-statistics__container">
+    <div class="b-statistics__sub-nav">
+      <ul class="b-statistics__nav-items">{letras}</ul>
+    </div>
+    <table class="b-statistics__table">
+      <thead class="b-statistics__table-caption"><tr class="b-statistics__table-row_type_first">
+        <th class="b-statistics__table-col">First</th><th class="b-statistics__table-col">Last</th><th class="b-statistics__table-col">Nickname</th>
+        <th class="b-statistics__table-col">Ht.</th><th class="b-statistics__table-col">Wt.</th><th class="b-statistics__table-col">Reach</th>
+        <th class="b-statistics__table-col">Stance</th><th class="b-statistics__table-col">W</th><th class="b-statistics__table-col">L</th>
+        <th class="b-statistics__table-col">D</th><th class="b-statistics__table-col">Belt</th></tr></thead>
+      <tbody>
+            <tr class="b-statistics__table-row"><td class="b-statistics__table-col b-statistics__table-col_type_clear" colspan="11"></td></tr>
+{''.join(linhas)}      </tbody>
+    </table>
+  </div>
+</section>''' + RODAPE
+
+
+def _item_lista(rotulo, valor):
+    return f'''
+          <li class="b-list__box-list-item b-list__box-list-item_type_block">
+            <i class="b-list__box-item-title b-list__box-item-title_type_width">
+              {rotulo}:
+            </i>
+            {html.escape(valor)}
+          </li>'''
+
+
+def _dois_textos(texto_1, texto_2):
+    return f'''
+              <p class="b-fight-details__table-text">{texto_1}</p>
+              <p class="b-fight-details__table-text">{texto_2}</p>'''
+
+
+def _linha_luta(elenco, id_, oponente):
+    """Linha da tabela de lutas da página do lutador (luta fictícia contra um vizinho no CSV)."""
+    posicao, posicao_oponente = elenco.posicao[id_], elenco.posicao[oponente]
+    resultado = elenco.resultado(id_, oponente)
+    url = f"{BASE_GERADA}/fight-details/{id_luta(id_, oponente)}"
+    evento = min(posicao, posicao_oponente)
+    venceu = resultado == 'win'
+    return f'''
+        <tr class="b-fight-details__table-row b-fight-details__table-row__hover js-fight-details-click" data-link="{url}" onclick="doNav('{url}')">
+          <td class="b-fight-details__table-col">
+            <p class="b-fight-details__table-text"><a href="{url}" class="b-flag b-flag_style_{'green' if venceu else 'red'}"><span class="b-flag__inner"><span class="b-flag__text">{resultado}</span></span></a></p>
+          </td>
+          <td class="b-fight-details__table-col l-page_align_left">
+            <p class="b-fight-details__table-text"><a class="b-link b-link_style_black" href="{BASE_GERADA}/fighter-details/{id_}">{html.escape(elenco.por_id[id_]['Nome'])}</a></p>
+            <p class="b-fight-details__table-text"><a class="b-link b-link_style_black" href="{BASE_GERADA}/fighter-details/{oponente}">{html.escape(elenco.por_id[oponente]['Nome'])}</a></p>
+          </td>
+          <td class="b-fight-details__table-col">{_dois_textos(posicao % 2, posicao_oponente % 2)}
+          </td>
+          <td class="b-fight-details__table-col">{_dois_textos(posicao % 60 + 10, posicao_oponente % 60 + 10)}
+          </td>
+          <td class="b-fight-details__table-col">{_dois_textos(posicao % 4, posicao_oponente % 4)}
+          </td>
+          <td class="b-fight-details__table-col">{_dois_textos(posicao % 3, posicao_oponente % 3)}
+          </td>
+          <td class="b-fight-details__table-col l-page_align_left">
+            <p class="b-fight-details__table-text"><a class="b-link b-link_style_black" href="{BASE_GERADA}/event-details/{id_sintetico(str(evento))}">UFC Fight Night: Evento {evento}</a></p>
+            <p class="b-fight-details__table-text">Apr. {1 + evento % 28:02d}, {2010 + evento % 14}</p>
+          </td>
+          <td class="b-fight-details__table-col l-page_align_left">{_dois_textos('KO/TKO' if venceu else 'U-DEC', 'Punches' if venceu else '')}
+          </td>
+          <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">{2 if venceu else 3}</p></td>
+          <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">{'3:27' if venceu else '5:00'}</p></td>
+        </tr>'''
+
+
+def pagina_lutador(elenco, id_):
+    lutador = elenco.por_id[id_]
+    linhas = ''.join(_linha_luta(elenco, id_, oponente) for oponente in elenco.oponentes(id_))
+    fisico = ''.join(_item_lista(rotulo, lutador[rotulo]) for rotulo in ['Height', 'Weight', 'Reach', 'STANCE', 'DOB'])
+    golpes = ''.join(_item_lista(rotulo, lutador[rotulo]) for rotulo in ['SLpM', 'Str. Acc.', 'SApM', 'Str. Def'])
+    quedas = ''.join(_item_lista(rotulo, lutador[rotulo]) for rotulo in ['TD Avg.', 'TD Acc.', 'TD Def.', 'Sub. Avg.'])
+    return CABECALHO.format(titulo='Fighter Details') + f'''<section class="b-statistics__section_details">
+  <div class="l-page__container">
+    <h2 class="b-content__title">
+      <span class="b-content__title-highlight">
+        {html.escape(lutador['Nome'])}
+      </span>
+      <span class="b-content__title-record">
+        Record: {html.escape(lutador['Recorde'])}
+      </span>
+    </h2>
+    <p class="b-content__Nickname"></p>
+    <div class="b-fight-details b-fight-details_margin-top">
+      <div class="b-list__info-box b-list__info-box_style_small-width js-guide">
+        <ul class="b-list__box-list">{fisico}
+        </ul>
+      </div>
+      <div class="b-list__info-box b-list__info-box_style_middle-width js-guide clearfix">
+        <div class="b-list__info-box-left clearfix">
+          <i class="b-list__box-item-title">Career statistics:</i>
+          <ul class="b-list__box-list b-list__box-list_margin-top">{golpes}
+          </ul>
+        </div>
+        <div class="b-list__info-box-right b-list__info-box_style-margin-right">
+          <ul class="b-list__box-list b-list__box-list_margin-top">
+            <li class="b-list__box-list-item b-list__box-list-item_type_block"><i class="b-list__box-item-title b-list__box-item-title_font_lowercase b-list__box-item-title_type_width">&nbsp;</i>&nbsp;</li>{quedas}
+          </ul>
+        </div>
+      </div>
+      <table class="b-fight-details__table b-fight-details__table_style_margin-top b-fight-details__table_type_event-details js-fight-table">
+        <thead class="b-fight-details__table-head">
+          <tr class="b-fight-details__table-row">
+            <th class="b-fight-details__table-col">W/L</th><th class="b-fight-details__table-col">Fighter</th><th class="b-fight-details__table-col">Kd</th>
+            <th class="b-fight-details__table-col">Str</th><th class="b-fight-details__table-col">Td</th><th class="b-fight-details__table-col">Sub</th>
+            <th class="b-fight-details__table-col">Event</th><th class="b-fight-details__table-col">Method/</th><th class="b-fight-details__table-col">Round</th><th class="b-fight-details__table-col">Time</th>
+          </tr>
+        </thead>
+        <tbody class="b-fight-details__table-body">
+        <tr class="b-fight-details__table-row b-fight-details__table-row__hover"><td class="b-fight-details__table-col b-fight-details__table-col_style_empty" colspan="10"><p class="b-fight-details__table-text"></p></td></tr>{linhas}
+        </tbody>
+      </table>
+    </div>
+  </div>
+</section>''' + RODAPE
+
+
+def _coluna_dupla(texto_1, texto_2):
+    return f'''
+          <td class="b-fight-details__table-col">
+            <p class="b-fight-details__table-text">{texto_1}</p>
+            <p class="b-fight-details__table-text">{texto_2}</p>
+          </td>'''
+
+
+def pagina_luta(elenco, id_):
+    menor, maior = elenco.lutas[id_]
+    vermelho, azul = (maior, menor) if elenco.posicao[menor] % 2 else (menor, maior)
+    nome_vermelho, nome_azul = html.escape(elenco.por_id[vermelho]['Nome']), html.escape(elenco.por_id[azul]['Nome'])
+    posicao_vermelho, posicao_azul = elenco.posicao[vermelho] % 50, elenco.posicao[azul] % 50
+    totais = ''.join([
+        _coluna_dupla(0, 1),
+        _coluna_dupla(f"{posicao_vermelho} of {posicao_vermelho + 20}", f"{posicao_azul} of {posicao_azul + 20}"),
+        _coluna_dupla('50%', '40%'),
+        _coluna_dupla(f"{posicao_vermelho + 5} of 80", f"{posicao_azul + 5} of 80"),
+        _coluna_dupla('1 of 2', '0 of 0'),
+        _coluna_dupla('50%', '---'),
+        _coluna_dupla(0, 1),
+        _coluna_dupla(elenco.posicao[vermelho] % 2, 0),
+        _coluna_dupla('1:23', '0:00'),
+    ])
+    return CABECALHO.format(titulo='Fight Details') + f'''<section class="b-statistics__section_details">
+  <div class="l-page__container">
+    <div class="b-fight-details">
+      <div class="b-fight-details__persons clearfix">
+        <div class="b-fight-details__person"><i class="b-fight-details__person-status b-fight-details__person-status_style_green">W</i>
+          <div class="b-fight-details__person-text"><h3 class="b-fight-details__person-name"><a class="b-link b-fight-details__person-link" href="{BASE_GERADA}/fighter-details/{vermelho}">{nome_vermelho}</a></h3></div></div>
+        <div class="b-fight-details__person"><i class="b-fight-details__person-status b-fight-details__person-status_style_gray">L</i>
+          <div class="b-fight-details__person-text"><h3 class="b-fight-details__person-name"><a class="b-link b-fight-details__person-link" href="{BASE_GERADA}/fighter-details/{azul}">{nome_azul}</a></h3></div></div>
+      </div>
+      <div class="b-fight-details__fight">
+        <div class="b-fight-details__fight-head">
+          <i class="b-fight-details__fight-title">
+            {'Lightweight' if elenco.posicao[menor] % 2 else 'Welterweight'} Bout
+          </i>
+        </div>
+        <div class="b-fight-details__content">
+          <p class="b-fight-details__text">
+            <i class="b-fight-details__text-item_first"><i class="b-fight-details__label">Method:</i><i style="font-style: normal">KO/TKO</i></i>
+            <i class="b-fight-details__text-item"><i class="b-fight-details__label">Round:</i> 2 </i>
+            <i class="b-fight-details__text-item"><i class="b-fight-details__label">Time:</i> 3:27 </i>
+            <i class="b-fight-details__text-item"><i class="b-fight-details__label">Time format:</i> 3 Rnd (5-5-5) </i>
+            <i class="b-fight-details__text-item"><i class="b-fight-details__label">Referee:</i><span>Herb Dean</span></i>
+          </p>
+        </div>
+      </div>
+      <section class="b-fight-details__section js-fight-section"><p class="b-fight-details__collapse-link_tot">Totals</p></section>
+      <section class="b-fight-details__section js-fight-section">
+        <table style="width: 745px">
+          <thead class="b-fight-details__table-head"><tr class="b-fight-details__table-row"><th class="b-fight-details__table-col">Fighter</th><th class="b-fight-details__table-col">KD</th></tr></thead>
+          <tbody class="b-fight-details__table-body">
+            <tr class="b-fight-details__table-row">
+              <td class="b-fight-details__table-col l-page_align_left">
+                <p class="b-fight-details__table-text"><a class="b-link b-link_style_black" href="{BASE_GERADA}/fighter-details/{vermelho}">{nome_vermelho}</a></p>
+                <p class="b-fight-details__table-text"><a class="b-link b-link_style_black" href="{BASE_GERADA}/fighter-details/{azul}">{nome_azul}</a></p>
+              </td>{totais}
+            </tr>
+          </tbody>
+        </table>
+      </section>
+    </div>
+  </div>
+</section>''' + RODAPE
+
+# --------------------------------------------------------------------------------
+# SERVIDOR
+# --------------------------------------------------------------------------------
+
+class ServidorSintetico(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, endereco, elenco):
+        super().__init__(endereco, _Manipulador)
+        self.elenco = elenco
+        self.base = f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def pagina(self, caminho, consulta):
+        try:
+            if caminho.startswith('/statistics/fighters'):
+                letra = re.search(r'char=(\w)', consulta)
+                html_pagina = pagina_indice(self.elenco, letra.group(1).upper()) if letra else None
+            elif '/fight-details/' in caminho:
+                html_pagina = pagina_luta(self.elenco, caminho.rstrip('/').rsplit('/', 1)[-1])
+            elif '/fighter-details/' in caminho:
+                html_pagina = pagina_lutador(self.elenco, caminho.rstrip('/').rsplit('/', 1)[-1])
+            else:
+                html_pagina = None
+        except KeyError:
+            html_pagina = None
+        return None if html_pagina is None else html_pagina.replace(BASE_GERADA, self.base).encode('utf-8')
+
+
+class _Manipulador(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        caminho, _, consulta = self.path.partition('?')
+        corpo = self.server.pagina(caminho, consulta)
+        self.send_response(404 if corpo is None else 200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo or b'')))
+        self.end_headers()
+        self.wfile.write(corpo or b'')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve páginas sintéticas do UFCStats geradas a partir do CSV bruto.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8790, help="Porta (0 = qualquer porta livre).")
+    parser.add_argument("--bruto", default=ARQUIVO_BRUTO, help="CSV bruto com os lutadores.")
+    args = parser.parse_args()
+
+    elenco = Elenco(args.bruto)
+    servidor = ServidorSintetico((args.host, args.porta), elenco)
+    print(f"🧪 Servidor sintético em {servidor.base} ({len(elenco)} lutadores, {len(elenco.lutas)} lutas)", flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+Servidor HTTP local que reproduz o UFCStats a partir do corpus gravado (benchmarks/fixtures),
+para medir a coleta sem acessar o site de verdade.
+
+- /statistics/fighters?char=X: página de índice gravada da letra; com --fator N, cada
+  lutador do índice aparece N vezes (cópias com IDs novos), multiplicando a carga.
+- /fighter-details/<id> e /fight-details/<id>: página gravada; IDs sem página gravada
+  (cópias do --fator, adversários) recebem uma das páginas gravadas, sempre a mesma por ID.
+- Latência injetada (--latencia-ms + jitter uniforme) e falhas injetadas: respostas 503
+  com Retry-After (--taxa-erro) e conexões derrubadas sem resposta (--taxa-queda).
+- /_stub/estatisticas: contadores do servidor (requisições, 503 e quedas injetados) em JSON.
+
+As páginas são gravadas com os links do UFCStats (BASE_GRAVADA) e servidas com os links
+apontando para o próprio servidor.
+
+Uso:
+    python benchmarks/servidor_stub.py --porta 8791 --latencia-ms 50 --taxa-erro 0.02
+    UFCSTATS_BASE_URL=http://127.0.0.1:8791 python webscraping.py --rps 50
+"""
+import argparse
+import http.server
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+
+DIR_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+# Base dos links nas páginas gravadas (trocada pela base do servidor ao servir)
+BASE_GRAVADA = 'http://ufcstats.com'
+EXTENSAO = '.html'
+ROTA_ESTATISTICAS = '/_stub/estatisticas'
+
+# Uma linha (um lutador) da tabela da página de índice
+REGEX_LINHA_INDICE = re.compile(r'<tr class="b-statistics__table-row">.*?</tr>', re.S)
+REGEX_ID_LUTADOR = re.compile(r'(/fighter-details/)([^"/?#]+)')
+
+# --------------------------------------------------------------------------------
+# CORPUS GRAVADO
+# --------------------------------------------------------------------------------
+
+def _ler_paginas(diretorio):
+    paginas = {}
+    if os.path.isdir(diretorio):
+        for nome in sorted(os.listdir(diretorio)):
+            if nome.endswith(EXTENSAO):
+                with open(os.path.join(diretorio, nome), encoding='utf-8') as f:
+                    paginas[nome[:-len(EXTENSAO)]] = f.read()
+    return paginas
+
+
+class Corpus:
+    """
+    Páginas gravadas por gravar_fixtures.py: indice/<LETRA>.html, lutador/<id>.html e
+    luta/<id>.html, todas com os links em BASE_GRAVADA.
+    """
+
+    def __init__(self, diretorio=DIR_FIXTURES):
+        self.indices = _ler_paginas(os.path.join(diretorio, 'indice'))
+        self.lutadores = _ler_paginas(os.path.join(diretorio, 'lutador'))
+        self.lutas = _ler_paginas(os.path.join(diretorio, 'luta'))
+        self._ids_lutadores = sorted(self.lutadores)
+        self._ids_lutas = sorted(self.lutas)
+
+    def __len__(self):
+        return len(self.lutadores)
+
+    def pagina_indice(self, letra, fator=1):
+        html = self.indices.get(letra.upper())
+        if html is None or fator <= 1:
+            return html
+        linhas = list(REGEX_LINHA_INDICE.finditer(html))
+        if not linhas:
+            return html
+        copias = ''.join(
+            REGEX_ID_LUTADOR.sub(lambda m: f"{m.group(1)}{m.group(2)}c{copia}", linha.group(0))
+            for copia in range(1, fator) for linha in linhas
+        )
+        fim = linhas[-1].end()
+        return html[:fim] + copias + html[fim:]
+
+    @staticmethod
+    def _pagina(paginas, ids, id_):
+        if id_ in paginas:
+            return paginas[id_]
+        # ID sem página gravada: sempre a mesma página gravada para o mesmo ID
+        return paginas[ids[zlib.crc32(id_.encode('utf-8')) % len(ids)]] if ids else None
+
+    def pagina_lutador(self, id_):
+        return self._pagina(self.lutadores, self._ids_lutadores, id_)
+
+    def pagina_luta(self, id_):
+        return self._pagina(self.lutas, self._ids_lutas, id_)
+
+# --------------------------------------------------------------------------------
+# SERVIDOR (latência e falhas injetadas)
+# --------------------------------------------------------------------------------
+
+class ServidorStub(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, endereco, corpus, fator=1, latencia=0.0, jitter=0.0, taxa_erro=0.0, taxa_queda=0.0, semente=0):
+        super().__init__(endereco, _Manipulador)
+        self.corpus = corpus
+        self.fator = fator
+        self.latencia = latencia
+        self.jitter = jitter
+        self.taxa_erro = taxa_erro
+        self.taxa_queda = taxa_queda
+        self.base = f"http://{self.server_address[0]}:{self.server_address[1]}"
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+        self.contadores = {'requisicoes': 0, 'respostas_200': 0, 'respostas_404': 0, 'erros_503': 0, 'quedas': 0,
+                           'bytes': 0}
+
+    def contar(self, chave, quantidade=1):
+        with self._lock:
+            self.contadores[chave] += quantidade
+
+    def sortear(self):
+        """(espera em segundos, falha injetada: None, 'erro' ou 'queda')."""
+        with self._lock:
+            espera = self.latencia + self._aleatorio.uniform(0, self.jitter)
+            sorteio = self._aleatorio.random()
+        if sorteio < self.taxa_queda:
+            return espera, 'queda'
+        if sorteio < self.taxa_queda + self.taxa_erro:
+            return espera, 'erro'
+        return espera, None
+
+    def pagina(self, caminho, consulta):
+        if caminho.startswith('/statistics/fighters'):
+            letra = re.search(r'char=(\w)', consulta)
+            html = self.corpus.pagina_indice(letra.group(1), self.fator) if letra else None
+        elif '/fighter-details/' in caminho:
+            html = self.corpus.pagina_lutador(caminho.rstrip('/').rsplit('/', 1)[-1])
+        elif '/fight-details/' in caminho:
+            html = self.corpus.pagina_luta(caminho.rstrip('/').rsplit('/', 1)[-1])
+        else:
+            html = None
+        return None if html is None else html.replace(BASE_GRAVADA, self.base).encode('utf-8')
+
+
+class _Manipulador(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, como o site real
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, status, corpo, tipo='text/html; charset=utf-8', cabecalhos=()):
+        self.send_response(status)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(corpo)))
+        for chave, valor in cabecalhos:
+            self.send_header(chave, valor)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        servidor = self.server
+        caminho, _, consulta = self.path.partition('?')
+        if caminho == ROTA_ESTATISTICAS:
+            with servidor._lock:
+                corpo = json.dumps(servidor.contadores).encode('utf-8')
+            self._responder(200, corpo, 'application/json')
+            return
+
+        servidor.contar('requisicoes')
+        espera, falha = servidor.sortear()
+        if espera:
+            time.sleep(espera)
+        if falha == 'queda':
+            servidor.contar('quedas')
+            self.close_connection = True
+            return
+        if falha == 'erro':
+            servidor.contar('erros_503')
+            self._responder(503, b'', cabecalhos=[('Retry-After', '0')])
+            return
+
+        corpo = servidor.pagina(caminho, consulta)
+        if corpo is None:
+            servidor.contar('respostas_404')
+            self._responder(404, b'')
+            return
+        servidor.contar('respostas_200')
+        servidor.contar('bytes', len(corpo))
+        self._responder(200, corpo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve o corpus gravado do UFCStats com latência e falhas injetadas.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8791, help="Porta (0 = qualquer porta livre).")
+    parser.add_argument("--fixtures", default=DIR_FIXTURES, help="Diretório do corpus gravado.")
+    parser.add_argument("--fator", type=int, default=1, help="Cópias de cada lutador nas páginas de índice.")
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="Latência fixa de cada resposta.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Latência extra aleatória (0 a N ms).")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="Fração das requisições respondidas com 503.")
+    parser.add_argument("--taxa-queda", type=float, default=0.0, help="Fração das conexões derrubadas sem resposta.")
+    parser.add_argument("--semente", type=int, default=0, help="Semente das falhas e latências sorteadas.")
+    args = parser.parse_args()
+
+    corpus = Corpus(args.fixtures)
+    if not len(corpus):
+        print(f"❌ Nenhuma página de lutador gravada em '{args.fixtures}'.")
+        return 1
+    servidor = ServidorStub((args.host, args.porta), corpus, args.fator, args.latencia_ms / 1000,
+                            args.jitter_ms / 1000, args.taxa_erro, args.taxa_queda, args.semente)
+    # A primeira linha (com a URL) é lida pelo benchmark_pipeline.py
+    print(f"🛰️ Servidor stub em {servidor.base} ({len(corpus)} lutadores gravados x {args.fator}, "
+          f"{len(corpus.lutas)} lutas)", flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
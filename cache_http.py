@@ -0,0 +1,146 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# --- CONFIGURAÇÃO PADRÃO DO CACHE ---
+CACHE_PADRAO = "cache_http.sqlite"
+IDADE_MAXIMA = 30 * 24 * 3600        # segundos (entradas mais velhas são descartadas)
+TAMANHO_MAXIMO = 500 * 1024 * 1024   # bytes comprimidos (acima disso, remove as menos recentes)
+
+# --------------------------------------------------------------------------------
+# CACHE HTTP PERSISTENTE (SQLite, chave = URL)
+# --------------------------------------------------------------------------------
+
+class CacheHTTP:
+    """
+    Cache em disco das respostas HTTP, usado para re-coletas incrementais.
+
+    Para cada URL guarda o corpo (comprimido com zlib), o ETag, o Last-Modified,
+    um hash do conteúdo e o horário da última busca. Política de despejo:
+    entradas com mais de `idade_maxima` segundos são ignoradas/removidas e, se o
+    total passar de `tamanho_maximo` bytes, as entradas buscadas há mais tempo saem primeiro.
+    """
+
+    def __init__(self, caminho=CACHE_PADRAO, idade_maxima=IDADE_MAXIMA, tamanho_maximo=TAMANHO_MAXIMO):
+        self.caminho = caminho
+        self.idade_maxima = idade_maxima
+        self.tamanho_maximo = tamanho_maximo
+
+        diretorio = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(diretorio, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS respostas (
+                url TEXT PRIMARY KEY,
+                corpo BLOB NOT NULL,
+                hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                buscado_em REAL NOT NULL,
+                tamanho INTEGER NOT NULL
+            )
+        """)
+        self._conexao.commit()
+
+    def obter(self, url):
+        """
+        Retorna um dicionário com 'texto', 'hash', 'etag', 'last_modified' e 'buscado_em',
+        ou None se a URL não está no cache (ou a entrada expirou).
+        """
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT corpo, hash, etag, last_modified, buscado_em FROM respostas WHERE url = ?", (url,)
+            ).fetchone()
+
+        if linha is None:
+            return None
+
+        corpo, hash_conteudo, etag, last_modified, buscado_em = linha
+        if self.idade_maxima is not None and time.time() - buscado_em > self.idade_maxima:
+            return None
+
+        return {
+            'texto': zlib.decompress(corpo).decode('utf-8'),
+            'hash': hash_conteudo,
+            'etag': etag,
+            'last_modified': last_modified,
+            'buscado_em': buscado_em,
+        }
+
+    def salvar(self, url, texto, etag=None, last_modified=None, confirmado=True):
+        """
+        Grava (ou substitui) a resposta da URL. Retorna o hash do conteúdo.
+        Com `confirmado=False` o corpo é gravado sem hash, ETag e Last-Modified: até
+        confirmar() ser chamado, a próxima busca não é condicional e a página conta
+        como alterada (o resultado dela ainda não foi salvo por quem a baixou).
+        """
+        hash_conteudo = calcular_hash(texto)
+        corpo = zlib.compress(texto.encode('utf-8'))
+        if not confirmado:
+            hash_gravado, etag, last_modified = '', None, None
+        else:
+            hash_gravado = hash_conteudo
+        with self._lock:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO respostas (url, corpo, hash, etag, last_modified, buscado_em, tamanho) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, corpo, hash_gravado, etag, last_modified, time.time(), len(corpo)),
+            )
+            self._conexao.commit()
+        return hash_conteudo
+
+    def confirmar(self, url, hash_conteudo, etag=None, last_modified=None):
+        """Completa uma entrada gravada com confirmado=False (o resultado da página já foi salvo)."""
+        with self._lock:
+            self._conexao.execute(
+                "UPDATE respostas SET hash = ?, etag = ?, last_modified = ? WHERE url = ?",
+                (hash_conteudo, etag, last_modified, url),
+            )
+            self._conexao.commit()
+
+    def renovar(self, url):
+        """Marca a entrada como confirmada agora (após um 304 Not Modified)."""
+        with self._lock:
+            self._conexao.execute("UPDATE respostas SET buscado_em = ? WHERE url = ?", (time.time(), url))
+            self._conexao.commit()
+
+    def despejar(self):
+        """Aplica a política de despejo (idade e tamanho total). Retorna o número de entradas removidas."""
+        removidas = 0
+        with self._lock:
+            if self.idade_maxima is not None:
+                cursor = self._conexao.execute(
+                    "DELETE FROM respostas WHERE buscado_em < ?", (time.time() - self.idade_maxima,)
+                )
+                removidas += cursor.rowcount
+
+            if self.tamanho_maximo is not None:
+                total = self._conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM respostas").fetchone()[0]
+                if total > self.tamanho_maximo:
+                    excesso = total - self.tamanho_maximo
+                    urls_para_remover = []
+                    for url, tamanho in self._conexao.execute("SELECT url, tamanho FROM respostas ORDER BY buscado_em"):
+                        if excesso <= 0:
+                            break
+                        urls_para_remover.append((url,))
+                        excesso -= tamanho
+                    self._conexao.executemany("DELETE FROM respostas WHERE url = ?", urls_para_remover)
+                    removidas += len(urls_para_remover)
+
+            self._conexao.commit()
+        return removidas
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+
+def calcular_hash(texto):
+    """Hash do conteúdo da página (usado quando o servidor não envia ETag/Last-Modified)."""
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()
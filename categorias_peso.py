@@ -0,0 +1,120 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- PARTIÇÕES POR CATEGORIA (geradas pelo transform.py junto com o mart) ---
+ARQUIVO_CATEGORIAS = 'categorias_peso.json'
+
+# Categorias de peso do UFC e o limite de cada uma (em lbs), da mais leve para a mais pesada.
+# Semântica de faixa: o lutador fica na categoria mais leve cujo limite comporta o peso
+# registrado (ex: 225 lbs -> Peso Pesado), não só quando o peso é exatamente o limite.
+CATEGORIAS_PESO = [
+    ('Peso Palha Feminino (115 lbs)', 115),
+    ('Peso Mosca (125 lbs)', 125),
+    ('Peso Galo (135 lbs)', 135),
+    ('Peso Pena (145 lbs)', 145),
+    ('Peso Leve (155 lbs)', 155),
+    ('Meio Médio (170 lbs)', 170),
+    ('Peso Médio (185 lbs)', 185),
+    ('Meio Pesado (205 lbs)', 205),
+    ('Peso Pesado (265 lbs)', 265),
+]
+# Acima do limite do Peso Pesado (eventos antigos sem categoria) e sem peso informado
+PESO_LIVRE = 'Peso Livre (> 265 lbs)'
+PESO_DESCONHECIDO = 'Peso Desconhecido'
+ORDEM_CATEGORIAS = [rotulo for rotulo, _ in CATEGORIAS_PESO] + [PESO_LIVRE, PESO_DESCONHECIDO]
+TODAS = 'Todos'
+
+# Ordenação de cada partição (mesmo ranking que a página de filtro usava)
+ORDENACAO = ['Wins', 'SLpM']
+# Estatísticas resumidas por categoria
+COLUNAS_AGREGADAS = ['Height_in_inches', 'Reach', 'Wins', 'Losses', 'SLpM', 'Str. Acc.', 'SApM', 'Str. Def',
+                     'TD Avg.', 'TD Acc.', 'TD Def.', 'Sub. Avg.']
+PERCENTIS = [10, 25, 50, 75, 90]
+
+# --------------------------------------------------------------------------------
+# ATRIBUIÇÃO DA CATEGORIA (no transform, vetorizada)
+# --------------------------------------------------------------------------------
+
+def categoria_de_peso(pesos):
+    """Rótulo da categoria de cada peso (Series em lbs) pela semântica de faixa."""
+    limites = [0] + [limite for _, limite in CATEGORIAS_PESO] + [np.inf]
+    rotulos = [rotulo for rotulo, _ in CATEGORIAS_PESO] + [PESO_LIVRE]
+    categorias = pd.cut(pesos.astype('float64'), bins=limites, labels=rotulos, right=True)
+    return categorias.astype(object).where(categorias.notna(), PESO_DESCONHECIDO)
+
+# --------------------------------------------------------------------------------
+# PARTIÇÕES PRÉ-ORDENADAS E AGREGADOS (no transform)
+# --------------------------------------------------------------------------------
+
+def _agregados(df):
+    resumo = {}
+    for coluna in COLUNAS_AGREGADAS:
+        if coluna not in df.columns:
+            continue
+        valores = df[coluna].astype('float64').dropna().to_numpy()
+        estatisticas = {'Lutadores': int(len(valores)), 'Média': float(valores.mean()) if len(valores) else None}
+        percentis = np.percentile(valores, PERCENTIS) if len(valores) else [None] * len(PERCENTIS)
+        for percentil, valor in zip(PERCENTIS, percentis):
+            estatisticas['Mediana' if percentil == 50 else f'P{percentil}'] = None if valor is None else float(valor)
+        resumo[coluna] = estatisticas
+    return resumo
+
+
+def construir_particoes(df_limpo):
+    """
+    Monta as partições da página de filtro a partir do mart (mesma ordem de linhas):
+    - ordem: posições das linhas do mart, primeiro o elenco inteiro ordenado por
+      ORDENACAO (decrescente) e depois cada categoria, já ordenada, uma após a outra
+    - categorias: rótulo -> {'inicio', 'fim', 'lutadores', 'agregados'}; as linhas da
+      categoria são ordem[inicio:fim] (uma fatia, sem filtrar nem ordenar no dashboard)
+    """
+    total = len(df_limpo)
+    chaves = [df_limpo[coluna].astype('float64').fillna(-np.inf).to_numpy() for coluna in reversed(ORDENACAO)]
+    # lexsort: a última chave é a principal; posição como desempate (resultado determinístico)
+    ranking = np.lexsort([np.arange(total)] + [-chave for chave in chaves])
+
+    categorias_por_linha = df_limpo['Categoria_Peso'].astype(object).to_numpy()
+    ordem = [ranking]
+    categorias = {TODAS: {'inicio': 0, 'fim': total, 'lutadores': total, 'agregados': _agregados(df_limpo)}}
+    inicio = total
+    for rotulo in ORDEM_CATEGORIAS:
+        linhas = ranking[categorias_por_linha[ranking] == rotulo]
+        if not len(linhas):
+            continue
+        ordem.append(linhas)
+        categorias[rotulo] = {
+            'inicio': inicio,
+            'fim': inicio + len(linhas),
+            'lutadores': int(len(linhas)),
+            'agregados': _agregados(df_limpo.iloc[linhas]),
+        }
+        inicio += len(linhas)
+
+    return {
+        'total': total,
+        'ordem': np.concatenate(ordem).tolist(),
+        'categorias': categorias,
+    }
+
+
+def salvar_particoes(particoes, caminho=ARQUIVO_CATEGORIAS):
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(particoes, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temporario, caminho)
+
+
+def ler_particoes(caminho=ARQUIVO_CATEGORIAS):
+    """Partições com a 'ordem' já como array NumPy (fatiar não copia)."""
+    with open(caminho, encoding='utf-8') as f:
+        particoes = json.load(f)
+    particoes['ordem'] = np.asarray(particoes['ordem'], dtype=np.int64)
+    return particoes
+
+
+def agregados_da_categoria(particoes, rotulo):
+    """Tabela (estatística x Lutadores/Média/percentis) da categoria."""
+    return pd.DataFrame.from_dict(particoes['categorias'][rotulo]['agregados'], orient='index')
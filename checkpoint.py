@@ -0,0 +1,303 @@
+import json
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+# --- CONFIGURAÇÃO PADRÃO DO CHECKPOINT ---
+CHECKPOINT_PADRAO = "checkpoint_coleta.sqlite"
+TAMANHO_LOTE = 500  # linhas por lote ao exportar/importar CSV
+
+# Estados de uma URL na fronteira
+PENDENTE = 'pendente'
+CONCLUIDO = 'concluido'
+FALHA = 'falha'
+
+# --------------------------------------------------------------------------------
+# CHECKPOINT DA COLETA (fronteira de URLs + lutadores já coletados, em SQLite)
+# --------------------------------------------------------------------------------
+
+class CheckpointColeta:
+    """
+    Armazena o progresso da coleta em disco para que uma execução interrompida
+    (erro, Ctrl-C, bloqueio) continue exatamente de onde parou.
+
+    - fronteira: todas as URLs de lutadores descobertas e o estado de cada uma.
+    - lutadores: cada lutador coletado é gravado assim que termina (append).
+    - anteriores: o snapshot bruto anterior, consultado por URL no modo incremental.
+    - lutas: lutas extraídas das páginas dos lutadores (modo por luta), uma linha por
+      'ID_Luta'; a mesma luta vista pelos dois adversários é gravada uma única vez.
+    Nada disso fica em memória, então o consumo não cresce com o tamanho do elenco.
+    """
+
+    def __init__(self, caminho=CHECKPOINT_PADRAO):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        if caminho != ':memory:':
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS fronteira (url TEXT PRIMARY KEY, estado TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS lutadores (url TEXT PRIMARY KEY, dados TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS anteriores (url TEXT PRIMARY KEY, dados TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT);
+            CREATE TABLE IF NOT EXISTS lutas (id TEXT PRIMARY KEY, dados TEXT NOT NULL, detalhada INTEGER NOT NULL);
+        """)
+        self._conexao.commit()
+
+    @property
+    def em_disco(self):
+        """False para o checkpoint em memória (':memory:'), que some se o processo cair."""
+        return self.caminho != ':memory:'
+
+    # --- Metadados ---
+
+    def _obter_meta(self, chave):
+        with self._lock:
+            linha = self._conexao.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+        return linha[0] if linha else None
+
+    def _definir_meta(self, chave, valor):
+        self._conexao.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", (chave, valor))
+
+    # --- Fronteira ---
+
+    def fronteira_completa(self):
+        """True se a etapa de links (A-Z) já terminou em uma execução anterior."""
+        return self._obter_meta('fronteira_completa') == '1'
+
+    def registrar_fronteira(self, urls):
+        """Grava todas as URLs descobertas como pendentes (as já conhecidas mantêm o estado)."""
+        with self._lock:
+            self._conexao.executemany(
+                "INSERT OR IGNORE INTO fronteira (url, estado) VALUES (?, ?)", ((url, PENDENTE) for url in urls)
+            )
+            self._definir_meta('fronteira_completa', '1')
+            self._conexao.commit()
+
+    def pendentes(self):
+        """URLs ainda não concluídas (falhas de execuções anteriores são tentadas de novo)."""
+        with self._lock:
+            return [linha[0] for linha in self._conexao.execute(
+                "SELECT url FROM fronteira WHERE estado != ? ORDER BY url", (CONCLUIDO,)
+            )]
+
+    def urls_fronteira(self):
+        with self._lock:
+            return [linha[0] for linha in self._conexao.execute("SELECT url FROM fronteira ORDER BY url")]
+
+    def total_fronteira(self):
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM fronteira").fetchone()[0]
+
+    # --- Lutadores ---
+
+    def salvar_lutador(self, url, dados, lutas=None):
+        """Grava o lutador (e as suas `lutas`, se houver) e marca a URL como concluída (na mesma transação)."""
+        with self._lock:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO lutadores (url, dados) VALUES (?, ?)", (url, json.dumps(dados, ensure_ascii=False))
+            )
+            if lutas:
+                self._inserir_lutas(lutas)
+            self._conexao.execute("INSERT OR REPLACE INTO fronteira (url, estado) VALUES (?, ?)", (url, CONCLUIDO))
+            self._conexao.commit()
+
+    def registrar_falha(self, url):
+        with self._lock:
+            self._conexao.execute("INSERT OR REPLACE INTO fronteira (url, estado) VALUES (?, ?)", (url, FALHA))
+            self._conexao.commit()
+
+    def urls_com_falha(self):
+        with self._lock:
+            return [linha[0] for linha in self._conexao.execute(
+                "SELECT url FROM fronteira WHERE estado = ? ORDER BY url", (FALHA,)
+            )]
+
+    def total_lutadores(self):
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM lutadores").fetchone()[0]
+
+    def iterar_lutadores(self, tamanho_lote=TAMANHO_LOTE):
+        """Gera os dicionários dos lutadores coletados, lendo do disco em lotes."""
+        with self._lock:
+            urls = [linha[0] for linha in self._conexao.execute("SELECT url FROM lutadores ORDER BY url")]
+        for inicio in range(0, len(urls), tamanho_lote):
+            lote = urls[inicio:inicio + tamanho_lote]
+            marcadores = ','.join('?' * len(lote))
+            with self._lock:
+                linhas = self._conexao.execute(
+                    f"SELECT dados FROM lutadores WHERE url IN ({marcadores}) ORDER BY url", lote
+                ).fetchall()
+            for (dados,) in linhas:
+                yield json.loads(dados)
+
+    # --- Snapshot anterior (modo incremental) ---
+
+    def carregar_anteriores(self, registros):
+        """Importa as linhas do snapshot anterior (iterável de dicionários com a chave 'URL')."""
+        if self._obter_meta('anteriores_carregados') == '1':
+            return
+        with self._lock:
+            self._conexao.executemany(
+                "INSERT OR REPLACE INTO anteriores (url, dados) VALUES (?, ?)",
+                ((r['URL'], json.dumps(r, ensure_ascii=False)) for r in registros if r.get('URL')),
+            )
+            self._definir_meta('anteriores_carregados', '1')
+            self._conexao.commit()
+
+    def carregar_anteriores_csv(self, caminho_csv):
+        """Importa o CSV bruto anterior em lotes (sem carregá-lo inteiro na memória)."""
+        def registros():
+            for lote in pd.read_csv(caminho_csv, dtype=str, keep_default_na=False, chunksize=TAMANHO_LOTE):
+                yield from lote.to_dict('records')
+        self.carregar_anteriores(registros())
+
+    def obter_anterior(self, url):
+        """Linha do snapshot anterior para a URL, ou None."""
+        with self._lock:
+            linha = self._conexao.execute("SELECT dados FROM anteriores WHERE url = ?", (url,)).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    # --- Lutas (modo por luta) ---
+
+    def _inserir_lutas(self, lutas):
+        # OR IGNORE: a luta já gravada (pelo adversário ou pelo snapshot anterior) é mantida.
+        # Lutas com 'Categoria' já trazem os dados da página de detalhes da luta.
+        def linha(luta):
+            detalhada = isinstance(luta.get('Categoria'), str) and luta['Categoria'] != ''
+            return luta['ID_Luta'], json.dumps(luta, ensure_ascii=False), int(detalhada)
+
+        self._conexao.executemany(
+            "INSERT OR IGNORE INTO lutas (id, dados, detalhada) VALUES (?, ?, ?)",
+            (linha(luta) for luta in lutas if luta.get('ID_Luta')),
+        )
+
+    def salvar_lutas(self, lutas):
+        """Grava lutas avulsas (uma luta já gravada com o mesmo 'ID_Luta' é mantida)."""
+        with self._lock:
+            self._inserir_lutas(lutas)
+            self._conexao.commit()
+
+    def carregar_lutas(self, registros):
+        """
+        Importa a tabela de lutas bruta anterior (iterável de dicionários). Lutas passadas
+        não mudam, então continuam valendo para lutadores cujas páginas não foram
+        re-processadas, e as que já têm os detalhes da página da luta não são buscadas de novo.
+        """
+        if self._obter_meta('lutas_carregadas') == '1':
+            return
+        with self._lock:
+            self._inserir_lutas(registros)
+            self._definir_meta('lutas_carregadas', '1')
+            self._conexao.commit()
+
+    def carregar_lutas_csv(self, caminho_csv):
+        """Importa o CSV de lutas anterior em lotes (sem carregá-lo inteiro na memória)."""
+        def registros():
+            for lote in pd.read_csv(caminho_csv, dtype=str, keep_default_na=False, chunksize=TAMANHO_LOTE):
+                yield from lote.to_dict('records')
+        self.carregar_lutas(registros())
+
+    def lutas_sem_detalhes(self, ids_lutador=None):
+        """
+        (ID_Luta, URL_Luta) das lutas cuja página de detalhes ainda não foi processada.
+        Com `ids_lutador`, só as lutas cujo lado 1 ('ID_1') está no conjunto.
+        """
+        with self._lock:
+            linhas = self._conexao.execute("SELECT dados FROM lutas WHERE detalhada = 0 ORDER BY id").fetchall()
+        lutas = (json.loads(dados) for (dados,) in linhas)
+        return [(luta['ID_Luta'], luta['URL_Luta']) for luta in lutas if ids_lutador is None or luta.get('ID_1') in ids_lutador]
+
+    def salvar_detalhes_luta(self, id_luta, detalhes):
+        """Completa a luta com os dados da página de detalhes e a marca como detalhada."""
+        with self._lock:
+            linha = self._conexao.execute("SELECT dados FROM lutas WHERE id = ?", (id_luta,)).fetchone()
+            if linha is None:
+                return
+            luta = json.loads(linha[0])
+            luta.update(detalhes)
+            self._conexao.execute(
+                "UPDATE lutas SET dados = ?, detalhada = 1 WHERE id = ?", (json.dumps(luta, ensure_ascii=False), id_luta)
+            )
+            self._conexao.commit()
+
+    def total_lutas(self):
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM lutas").fetchone()[0]
+
+    def iterar_lutas(self, tamanho_lote=TAMANHO_LOTE):
+        """Gera os dicionários das lutas (ordenadas por ID), lendo do disco em lotes."""
+        ultimo = ''
+        while True:
+            with self._lock:
+                linhas = self._conexao.execute(
+                    "SELECT id, dados FROM lutas WHERE id > ? ORDER BY id LIMIT ?", (ultimo, tamanho_lote)
+                ).fetchall()
+            if not linhas:
+                return
+            for _, dados in linhas:
+                yield json.loads(dados)
+            ultimo = linhas[-1][0]
+
+    # --- Exportação e encerramento ---
+
+    def exportar_csv(self, caminho_csv, tamanho_lote=TAMANHO_LOTE):
+        """
+        Escreve o CSV bruto a partir do checkpoint, em lotes.
+        Lutadores que falharam nesta execução mas existem no snapshot anterior
+        são mantidos com os dados anteriores. Retorna o número de linhas escritas.
+        """
+        return _escrever_csv(caminho_csv, self.iterar_resultado, tamanho_lote)
+
+    def exportar_lutas_csv(self, caminho_csv, tamanho_lote=TAMANHO_LOTE):
+        """Escreve a tabela de lutas bruta (uma linha por 'ID_Luta'). Retorna o número de linhas."""
+        return _escrever_csv(caminho_csv, self.iterar_lutas, tamanho_lote)
+
+    def iterar_resultado(self):
+        """Lutadores coletados + versão anterior dos que falharam nesta execução."""
+        yield from self.iterar_lutadores()
+        for url in self.urls_com_falha():
+            anterior = self.obter_anterior(url)
+            if anterior is not None:
+                yield anterior
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+    def descartar(self):
+        """Fecha e apaga o checkpoint (chamado depois que a coleta terminou e o CSV foi salvo)."""
+        self.fechar()
+        if self.caminho != ':memory:':
+            for sufixo in ('', '-wal', '-shm'):
+                if os.path.exists(self.caminho + sufixo):
+                    os.remove(self.caminho + sufixo)
+
+
+def _escrever_csv(caminho_csv, gerar_registros, tamanho_lote=TAMANHO_LOTE):
+    """
+    Escreve os dicionários de gerar_registros() em um CSV, em lotes, sem carregá-los
+    todos na memória. Retorna o número de linhas escritas.
+    """
+    # 1ª passada: união das colunas, na ordem em que aparecem
+    colunas = {}
+    for dados in gerar_registros():
+        colunas.update(dict.fromkeys(dados))
+    colunas = list(colunas)
+
+    # 2ª passada: escreve em lotes
+    total = 0
+    lote = []
+    with open(caminho_csv, 'w', encoding='utf-8', newline='') as arquivo:
+        for dados in gerar_registros():
+            lote.append(dados)
+            if len(lote) >= tamanho_lote:
+                pd.DataFrame(lote, columns=colunas).to_csv(arquivo, index=False, header=total == 0)
+                total += len(lote)
+                lote = []
+        if lote or total == 0:
+            pd.DataFrame(lote, columns=colunas).to_csv(arquivo, index=False, header=total == 0)
+            total += len(lote)
+    return total
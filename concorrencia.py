@@ -0,0 +1,26 @@
+import itertools
+from concurrent.futures import FIRST_COMPLETED, wait
+
+# --------------------------------------------------------------------------------
+# EXECUÇÃO COM JANELA LIMITADA (threads ou processos)
+# --------------------------------------------------------------------------------
+
+def executar_em_janela(executor, funcao, itens, janela, *args):
+    """
+    Submete funcao(item, *args) ao executor mantendo no máximo `janela` tarefas
+    enfileiradas, e gera (item, resultado) na ordem de conclusão.
+    Funciona com ThreadPoolExecutor e ProcessPoolExecutor; a memória não cresce com
+    o número de itens, mesmo quando eles vêm de um gerador.
+    """
+    itens = iter(itens)
+    futuros = {}
+    for item in itertools.islice(itens, janela):
+        futuros[executor.submit(funcao, item, *args)] = item
+
+    while futuros:
+        concluidos, _ = wait(futuros, return_when=FIRST_COMPLETED)
+        for futuro in concluidos:
+            item = futuros.pop(futuro)
+            for proximo in itertools.islice(itens, 1):
+                futuros[executor.submit(funcao, proximo, *args)] = proximo
+            yield item, futuro.result()
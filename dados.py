@@ -0,0 +1,181 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from categorias_peso import ARQUIVO_CATEGORIAS, ler_particoes
+from historico import HISTORICO_PADRAO, HistoricoLutadores
+from indice_lutadores import ARQUIVO_INDICE, ler_indice
+from percentis import COLUNAS_PERCENTIS_MART
+from similaridade import ARQUIVO_MATRIZ, MotorSimilaridade, ler_matriz
+from transform import ARQUIVO_ARROW
+
+# --------------------------------------------------------------------------------
+# ACESSO COMPARTILHADO AO DATA MART (usado por todas as páginas do dashboard)
+# --------------------------------------------------------------------------------
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _carregar_mart(caminho, versao):
+    """
+    Carrega o mart UMA vez por processo, mapeando o arquivo Arrow em memória.
+    Colunas numéricas sem valores ausentes são visões diretas do arquivo (zero-copy);
+    só as colunas com NaN são copiadas para receberem o preenchimento com 0.
+    `versao` (mtime do arquivo) faz parte da chave do cache: quando o arquivo muda
+    no disco, a próxima chamada recarrega e a entrada antiga é descartada.
+    """
+    fonte = pa.memory_map(caminho, 'r')
+    tabela = pa.ipc.open_file(fonte).read_all()
+    df = tabela.to_pandas(split_blocks=True)
+
+    # Preenche valores NaN em colunas numéricas com 0 para evitar erros no display
+    # (percentis ausentes continuam ausentes: 0 significaria "pior do grupo")
+    for col in df.select_dtypes('number').columns.difference(COLUNAS_PERCENTIS_MART):
+        if df[col].hasnans:
+            df[col] = df[col].fillna(0)
+    return df
+
+
+def carregar_lutadores(colunas=None, caminho=ARQUIVO_ARROW):
+    """
+    Retorna uma visão somente leitura do mart com as `colunas` pedidas (ou todas).
+    A visão não copia os dados; alterações feitas pela página ficam na própria
+    visão (copy-on-write) e não afetam as outras sessões.
+    Se o arquivo não existir, mostra o erro na página e retorna um DataFrame vazio.
+    """
+    try:
+        versao = os.stat(caminho).st_mtime_ns
+    except FileNotFoundError:
+        st.error(f"Erro: O arquivo '{caminho}' não foi encontrado. Execute o webscraping.py e o transform.py.")
+        return pd.DataFrame()
+
+    df = _carregar_mart(caminho, versao)
+    return df[colunas] if colunas is not None else df.copy(deep=False)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _carregar_indice(caminho, versao):
+    """Índice de nomes (indice_lutadores.json), carregado uma vez por processo e por versão do arquivo."""
+    return ler_indice(caminho)
+
+
+def carregar_indice(caminho=ARQUIVO_INDICE):
+    """
+    Retorna o índice de nomes gerado pelo transform.py (veja indice_lutadores.construir_indice),
+    ou None se o arquivo não existir. As posições do índice são as linhas do mart.
+    """
+    try:
+        versao = os.stat(caminho).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _carregar_indice(caminho, versao)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _carregar_particoes(caminho, versao):
+    """Partições por categoria de peso (categorias_peso.json), uma vez por processo e por versão."""
+    return ler_particoes(caminho)
+
+
+def carregar_particoes(caminho=ARQUIVO_CATEGORIAS):
+    """
+    Partições pré-ordenadas e agregados por categoria de peso gerados pelo transform.py
+    (veja categorias_peso.construir_particoes), ou None se o arquivo não existir.
+    """
+    try:
+        versao = os.stat(caminho).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _carregar_particoes(caminho, versao)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _carregar_similaridade(caminho, versao):
+    """Matriz de similaridade mapeada em memória + normas pré-calculadas, uma vez por processo."""
+    return MotorSimilaridade(ler_matriz(caminho))
+
+
+def carregar_similaridade(caminho=ARQUIVO_MATRIZ):
+    """Motor de similaridade (veja similaridade.py) ou None se a matriz não existir."""
+    try:
+        versao = os.stat(caminho).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _carregar_similaridade(caminho, versao)
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _buscar_parecidos(caminho, versao, linha, n, coluna_grupo, caminho_mart, versao_mart):
+    grupos = _carregar_mart(caminho_mart, versao_mart)[coluna_grupo].to_numpy() if coluna_grupo else None
+    posicoes, distancias = _carregar_similaridade(caminho, versao).mais_parecidos(linha, n, grupos)
+    return posicoes.tolist(), distancias.tolist()
+
+
+def buscar_parecidos(linha, n=10, coluna_grupo=None, caminho=ARQUIVO_MATRIZ, caminho_mart=ARQUIVO_ARROW):
+    """
+    Posições (linhas do mart) e distâncias dos `n` lutadores mais parecidos com a `linha`,
+    opcionalmente só entre os que têm o mesmo valor em `coluna_grupo`. O resultado de cada
+    consulta fica em cache (por versão da matriz e do mart).
+    """
+    versao = os.stat(caminho).st_mtime_ns
+    versao_mart = os.stat(caminho_mart).st_mtime_ns
+    return _buscar_parecidos(caminho, versao, int(linha), n, coluna_grupo, caminho_mart, versao_mart)
+
+
+# Gráficos de comparação da página de análise: coluna do gráfico -> (coluna do mart, multiplicador)
+GRAFICOS_COMPARACAO = {
+    'agressividade': {'SLpM (Golpes/min)': ('SLpM', 1), 'TD Avg. (Quedas/luta)': ('TD Avg.', 1)},
+    'golpes': {'Str. Acc. (%)': ('Str. Acc.', 100), 'Str. Def (%)': ('Str. Def', 100)},
+    'quedas': {'TD Acc. (%)': ('TD Acc.', 100), 'TD Def. (%)': ('TD Def.', 100)},
+}
+# Pares de lutadores com os quadros de comparação mantidos em memória (os menos usados saem primeiro)
+LIMITE_COMPARACOES = 256
+
+
+@st.cache_resource(max_entries=LIMITE_COMPARACOES, show_spinner=False)
+def _quadros_comparacao(caminho, versao, linha_1, linha_2, rotulos):
+    linhas = _carregar_mart(caminho, versao).iloc[[linha_1, linha_2]]
+    indice = pd.Index(rotulos, name='Lutador')
+    return {
+        grafico: pd.DataFrame({titulo: linhas[coluna].to_numpy() * fator for titulo, (coluna, fator) in colunas.items()},
+                              index=indice)
+        for grafico, colunas in GRAFICOS_COMPARACAO.items()
+    }
+
+
+def quadros_comparacao(linha_1, linha_2, rotulos, caminho=ARQUIVO_ARROW):
+    """
+    Quadros prontos para os gráficos de comparação (GRAFICOS_COMPARACAO) do par de
+    lutadores nas linhas `linha_1` e `linha_2` do mart, com os `rotulos` como índice.
+    São montados uma vez por par (e versão do mart) e ficam em um cache LRU limitado
+    a LIMITE_COMPARACOES pares, compartilhado pelas sessões: os reruns causados por
+    outros widgets não refazem os DataFrames. Os quadros não devem ser alterados.
+    """
+    versao = os.stat(caminho).st_mtime_ns
+    return _quadros_comparacao(caminho, versao, linha_1, linha_2, tuple(rotulos))
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _abrir_historico(caminho):
+    """Conexão somente leitura com o histórico de versões, compartilhada pelas sessões."""
+    return HistoricoLutadores(caminho, somente_leitura=True)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _carregar_trajetoria(caminho, versao, id_, colunas):
+    return _abrir_historico(caminho).trajetoria(id_, list(colunas))
+
+
+def carregar_trajetoria(id_, colunas, caminho=HISTORICO_PADRAO):
+    """
+    Evolução das `colunas` limpas do lutador entre as coletas registradas no histórico
+    (uma linha por versão, índice = data da coleta). DataFrame vazio se não houver histórico.
+    """
+    try:
+        versao = os.stat(caminho).st_mtime_ns
+    except FileNotFoundError:
+        return pd.DataFrame()
+    # Com o journal WAL, as gravações recentes podem estar só no arquivo -wal
+    if os.path.exists(caminho + '-wal'):
+        versao = max(versao, os.stat(caminho + '-wal').st_mtime_ns)
+    return _carregar_trajetoria(caminho, versao, id_, tuple(colunas))
@@ -0,0 +1,245 @@
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from cache_http import calcular_hash
+from indice_lutadores import id_lutador
+
+# --- CONFIGURAÇÃO PADRÃO DO HISTÓRICO ---
+HISTORICO_PADRAO = "historico_lutadores.sqlite"
+TAMANHO_LOTE = 1000  # linhas do CSV bruto comparadas por vez com as versões atuais
+
+# Tipos de alteração gravados em cada versão
+NOVO, ALTERADO, REMOVIDO = 'novo', 'alterado', 'removido'
+
+# --------------------------------------------------------------------------------
+# HISTÓRICO DE VERSÕES DOS LUTADORES (captura de alterações entre coletas)
+# --------------------------------------------------------------------------------
+
+def _agora():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _limite(data):
+    """
+    Normaliza o "até quando" das consultas para o formato das datas gravadas (UTC, ISO).
+    Uma data sem horário ('2025-01-31') inclui todas as coletas daquele dia.
+    """
+    if data is None:
+        return '9999-12-31T23:59:59'
+    if isinstance(data, datetime):
+        if data.tzinfo is not None:
+            data = data.astimezone(timezone.utc)
+        return data.strftime('%Y-%m-%dT%H:%M:%S')
+    texto = str(data).strip()
+    return texto + 'T23:59:59' if len(texto) == 10 else texto.replace(' ', 'T')
+
+
+def hash_lutador(dados):
+    """
+    Hash do conteúdo de uma linha do CSV bruto. Independe da ordem das colunas e ignora
+    campos vazios, então uma coluna nova no scraper não marca o elenco inteiro como alterado.
+    """
+    preenchidos = {coluna: valor for coluna, valor in dados.items() if valor not in ('', None)}
+    return calcular_hash(json.dumps(preenchidos, sort_keys=True, ensure_ascii=False))
+
+
+def _id_da_linha(dados):
+    # Mesmo ID do mart (veja transform._calcular_ids): URL ou hash de Nome/DOB/Height
+    chave = '|'.join('' if dados.get(c) is None else str(dados.get(c)) for c in ('Nome', 'DOB', 'Height'))
+    return id_lutador(dados.get('URL'), chave)
+
+
+class HistoricoLutadores:
+    """
+    Armazena as versões de cada lutador ao longo das coletas (SCD tipo 2 em SQLite).
+
+    A cada coleta registrada, calcula o hash do conteúdo de cada lutador e compara com
+    o hash da versão atual: só as linhas novas ou alteradas ganham uma nova versão
+    (e os lutadores que sumiram do elenco ganham uma versão 'removido'). O espaço em
+    disco cresce com o que mudou entre as coletas, não com o tamanho do elenco.
+
+    Tabelas:
+    - coletas: uma linha por coleta registrada (data e contagens)
+    - versoes: (id, valido_desde) -> tipo, hash e a linha bruta em JSON
+    - atual: hash da versão mais recente de cada lutador (comparação sem varrer o histórico)
+    """
+
+    def __init__(self, caminho=HISTORICO_PADRAO, somente_leitura=False):
+        self.caminho = caminho
+        if somente_leitura:
+            self._conexao = sqlite3.connect(f"file:{os.path.abspath(caminho)}?mode=ro", uri=True,
+                                            check_same_thread=False)
+            return
+
+        diretorio = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(diretorio, exist_ok=True)
+        self._conexao = sqlite3.connect(caminho)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS coletas (
+                data TEXT PRIMARY KEY,
+                lutadores INTEGER NOT NULL,
+                novos INTEGER NOT NULL,
+                alterados INTEGER NOT NULL,
+                removidos INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS versoes (
+                id TEXT NOT NULL,
+                valido_desde TEXT NOT NULL,
+                tipo TEXT NOT NULL,
+                hash TEXT,
+                dados TEXT,
+                PRIMARY KEY (id, valido_desde)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS versoes_por_data ON versoes (valido_desde);
+            CREATE TABLE IF NOT EXISTS atual (
+                id TEXT PRIMARY KEY,
+                hash TEXT NOT NULL
+            ) WITHOUT ROWID;
+        """)
+        self._conexao.commit()
+
+    # --- Escrita (uma vez por coleta) ---
+
+    def registrar_coleta(self, lotes, data_coleta=None, marcar_removidos=True):
+        """
+        Registra uma coleta completa. `lotes` é um iterável de listas de dicionários
+        (linhas do CSV bruto). Com `marcar_removidos`, lutadores que estavam na versão
+        atual e não apareceram nesta coleta ganham uma versão 'removido'.
+        Retorna um resumo com a data da coleta e as contagens.
+        """
+        data_coleta = _limite(data_coleta) if data_coleta is not None else _agora()
+        ultima = self._conexao.execute("SELECT MAX(data) FROM coletas").fetchone()[0]
+        if ultima is not None and data_coleta <= ultima:
+            raise ValueError(f"A coleta de {data_coleta} não é posterior à última registrada ({ultima}).")
+
+        resumo = {'data': data_coleta, 'lutadores': 0, 'novos': 0, 'alterados': 0, 'removidos': 0}
+        with self._conexao:
+            self._conexao.execute("CREATE TEMP TABLE IF NOT EXISTS vistos (id TEXT PRIMARY KEY) WITHOUT ROWID")
+            self._conexao.execute("DELETE FROM vistos")
+
+            for lote in lotes:
+                linhas = {}
+                for dados in lote:
+                    linhas[_id_da_linha(dados)] = dados  # repetidos no mesmo lote: vale a última linha
+                if not linhas:
+                    continue
+
+                ids = list(linhas)
+                self._conexao.executemany("INSERT OR IGNORE INTO vistos (id) VALUES (?)", [(i,) for i in ids])
+                atuais = dict(self._conexao.execute(
+                    f"SELECT id, hash FROM atual WHERE id IN ({','.join('?' * len(ids))})", ids
+                ).fetchall())
+
+                versoes = []
+                for id_, dados in linhas.items():
+                    hash_conteudo = hash_lutador(dados)
+                    if atuais.get(id_) == hash_conteudo:
+                        continue
+                    tipo = ALTERADO if id_ in atuais else NOVO
+                    resumo['novos' if tipo == NOVO else 'alterados'] += 1
+                    versoes.append((id_, data_coleta, tipo, hash_conteudo,
+                                    json.dumps(dados, ensure_ascii=False)))
+
+                self._conexao.executemany(
+                    "INSERT OR REPLACE INTO versoes (id, valido_desde, tipo, hash, dados) VALUES (?, ?, ?, ?, ?)",
+                    versoes,
+                )
+                self._conexao.executemany(
+                    "INSERT OR REPLACE INTO atual (id, hash) VALUES (?, ?)",
+                    [(id_, hash_conteudo) for id_, _, _, hash_conteudo, _ in versoes],
+                )
+
+            resumo['lutadores'] = self._conexao.execute("SELECT COUNT(*) FROM vistos").fetchone()[0]
+
+            if marcar_removidos:
+                removidos = [linha[0] for linha in self._conexao.execute(
+                    "SELECT id FROM atual WHERE id NOT IN (SELECT id FROM vistos)"
+                )]
+                self._conexao.executemany(
+                    "INSERT OR REPLACE INTO versoes (id, valido_desde, tipo) VALUES (?, ?, ?)",
+                    [(id_, data_coleta, REMOVIDO) for id_ in removidos],
+                )
+                self._conexao.executemany("DELETE FROM atual WHERE id = ?", [(id_,) for id_ in removidos])
+                resumo['removidos'] = len(removidos)
+
+            self._conexao.execute(
+                "INSERT INTO coletas (data, lutadores, novos, alterados, removidos) VALUES (?, ?, ?, ?, ?)",
+                (data_coleta, resumo['lutadores'], resumo['novos'], resumo['alterados'], resumo['removidos']),
+            )
+        return resumo
+
+    def registrar_csv(self, caminho_csv, data_coleta=None, marcar_removidos=True, tamanho_lote=TAMANHO_LOTE):
+        """Registra o CSV bruto de uma coleta, lido em lotes (memória limitada)."""
+        lotes = (lote.to_dict('records') for lote in
+                 pd.read_csv(caminho_csv, dtype=str, keep_default_na=False, chunksize=tamanho_lote))
+        return self.registrar_coleta(lotes, data_coleta, marcar_removidos)
+
+    # --- Leitura ---
+
+    def coletas(self):
+        """DataFrame com as coletas registradas, da mais antiga para a mais recente."""
+        return pd.read_sql_query("SELECT * FROM coletas ORDER BY data", self._conexao)
+
+    def ler_em(self, data=None):
+        """
+        Elenco "como estava" em `data` (str ISO, date ou datetime; None = hoje): para cada
+        lutador, a última versão gravada até essa data, sem os removidos.
+        Retorna um DataFrame com as colunas do CSV bruto (todas como texto).
+        """
+        cursor = self._conexao.execute("""
+            SELECT v.dados FROM versoes v
+            JOIN (SELECT id, MAX(valido_desde) AS desde FROM versoes WHERE valido_desde <= ? GROUP BY id) u
+              ON v.id = u.id AND v.valido_desde = u.desde
+            WHERE v.tipo != ?
+            ORDER BY v.id
+        """, (_limite(data), REMOVIDO))
+        return pd.DataFrame([json.loads(dados) for dados, in cursor]).fillna('')
+
+    def alteracoes(self, desde=None, ate=None):
+        """
+        Feed de alterações (CDC): versões gravadas nas coletas depois de `desde` e até `ate`.
+        Retorna um DataFrame com 'ID', 'Data_Coleta', 'Tipo' e as colunas do CSV bruto.
+        """
+        inicio = _limite(desde) if desde is not None else ''
+        cursor = self._conexao.execute(
+            "SELECT id, valido_desde, tipo, dados FROM versoes WHERE valido_desde > ? AND valido_desde <= ? "
+            "ORDER BY valido_desde, id",
+            (inicio, _limite(ate)),
+        )
+        return pd.DataFrame([
+            {'ID': id_, 'Data_Coleta': desde_, 'Tipo': tipo, **(json.loads(dados) if dados else {})}
+            for id_, desde_, tipo, dados in cursor
+        ])
+
+    def versoes_do_lutador(self, id_):
+        """Versões brutas de um lutador, da mais antiga para a mais recente, com 'Data_Coleta' e 'Tipo'."""
+        cursor = self._conexao.execute(
+            "SELECT valido_desde, tipo, dados FROM versoes WHERE id = ? ORDER BY valido_desde", (id_,)
+        )
+        return pd.DataFrame([
+            {'Data_Coleta': desde, 'Tipo': tipo, **(json.loads(dados) if dados else {})}
+            for desde, tipo, dados in cursor
+        ])
+
+    def trajetoria(self, id_, colunas=None):
+        """
+        Evolução das estatísticas limpas de um lutador entre as coletas: uma linha por
+        versão (índice = data da coleta), já convertidas pelo transform.
+        """
+        from transform import transformar_dados_ufc
+
+        versoes = self.versoes_do_lutador(id_)
+        if versoes.empty:
+            return pd.DataFrame()
+        versoes = versoes[versoes['Tipo'] != REMOVIDO].reset_index(drop=True)
+        df_limpo = transformar_dados_ufc(versoes.drop(columns=['Data_Coleta', 'Tipo']))
+        df_limpo.index = pd.to_datetime(versoes['Data_Coleta']).rename('Data_Coleta')
+        return df_limpo[colunas] if colunas is not None else df_limpo
+
+    def fechar(self):
+        self._conexao.close()
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+
+# --- ARQUIVO DO ÍNDICE (gerado pelo transform.py junto com o mart) ---
+ARQUIVO_INDICE = 'indice_lutadores.json'
+
+# --------------------------------------------------------------------------------
+# NORMALIZAÇÃO E IDENTIFICADORES
+# --------------------------------------------------------------------------------
+
+def normalizar(texto):
+    """Minúsculas, sem acentos e só com letras/números separados por um espaço ('José Aldo' -> 'jose aldo')."""
+    sem_acento = unicodedata.normalize('NFKD', str(texto))
+    sem_acento = ''.join(c for c in sem_acento if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', sem_acento.lower()).split())
+
+
+def trigramas(texto_normalizado):
+    """Conjunto de trigramas do texto, com bordas (' jo', 'jos', ...) para valorizar o início das palavras."""
+    texto = f"  {texto_normalizado} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def id_lutador(url, *campos_reserva):
+    """
+    ID estável do lutador: o último segmento da URL de detalhes do UFCStats
+    (ex: .../fighter-details/93fe7332d16c6ad9 -> '93fe7332d16c6ad9').
+    Sem URL (snapshots antigos), usa um hash dos campos de reserva (nome, nascimento...).
+    """
+    if isinstance(url, str) and url.strip('/'):
+        return url.rstrip('/').rsplit('/', 1)[-1]
+    chave = '|'.join('' if c is None or c != c else str(c) for c in campos_reserva)
+    return 'h' + hashlib.sha1(chave.encode('utf-8')).hexdigest()[:15]
+
+# --------------------------------------------------------------------------------
+# CONSTRUÇÃO DO ÍNDICE (no transform)
+# --------------------------------------------------------------------------------
+
+def construir_indice(df_limpo):
+    """
+    Monta o índice de nomes a partir do mart (mesma ordem de linhas):
+    - rotulos: nome exibido de cada linha (nomes repetidos ganham o peso ou o ID entre parênteses)
+    - rotulos_ordenados: lista já ordenada para os seletores
+    - linha_por_rotulo / linha_por_id: posição da linha no mart (consulta O(1))
+    - trigramas: trigrama -> posições das linhas, para a busca tolerante a erros
+    """
+    nomes = df_limpo['Nome'].fillna('').astype(str).tolist()
+    ids = df_limpo['ID'].astype(str).tolist()
+    pesos = df_limpo['Weight'].tolist() if 'Weight' in df_limpo.columns else [None] * len(nomes)
+
+    repetidos = {nome for nome, total in Counter(nomes).items() if total > 1}
+    rotulos = []
+    for nome, id_, peso in zip(nomes, ids, pesos):
+        if nome in repetidos:
+            detalhe = f"{peso:.0f} lbs" if isinstance(peso, float) and peso == peso else id_[:8]
+            rotulo = f"{nome} ({detalhe})"
+            if rotulo in rotulos:
+                rotulo = f"{nome} ({id_[:8]})"
+            rotulos.append(rotulo)
+        else:
+            rotulos.append(nome)
+
+    nomes_normalizados = [normalizar(nome) for nome in nomes]
+    indice_trigramas = {}
+    quantidade_trigramas = []
+    for posicao, nome_normalizado in enumerate(nomes_normalizados):
+        tris = trigramas(nome_normalizado)
+        quantidade_trigramas.append(len(tris))
+        for tri in sorted(tris):  # ordem fixa: o JSON não muda entre execuções com os mesmos dados
+            indice_trigramas.setdefault(tri, []).append(posicao)
+
+    return {
+        'ids': ids,
+        'rotulos': rotulos,
+        'rotulos_ordenados': sorted(rotulos, key=lambda r: (normalizar(r), r)),
+        'linha_por_rotulo': {rotulo: posicao for posicao, rotulo in enumerate(rotulos)},
+        'linha_por_id': {id_: posicao for posicao, id_ in enumerate(ids)},
+        'nomes_normalizados': nomes_normalizados,
+        'quantidade_trigramas': quantidade_trigramas,
+        'trigramas': indice_trigramas,
+    }
+
+
+def salvar_indice(indice, caminho=ARQUIVO_INDICE):
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temporario, caminho)
+
+
+def ler_indice(caminho=ARQUIVO_INDICE):
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+# --------------------------------------------------------------------------------
+# BUSCA APROXIMADA (no dashboard)
+# --------------------------------------------------------------------------------
+
+def buscar(indice, consulta, limite=10):
+    """
+    Retorna os rótulos dos lutadores mais parecidos com a consulta, do melhor para o pior.
+    A pontuação é a similaridade de Jaccard entre os trigramas da consulta e do nome
+    (tolera erros de digitação e acentos); nomes que contêm a consulta vêm primeiro.
+    """
+    consulta_normalizada = normalizar(consulta)
+    if not consulta_normalizada:
+        return []
+
+    tris_consulta = trigramas(consulta_normalizada)
+    comuns = Counter()
+    for tri in tris_consulta:
+        comuns.update(indice['trigramas'].get(tri, ()))
+
+    pontuados = []
+    for posicao, em_comum in comuns.items():
+        jaccard = em_comum / (len(tris_consulta) + indice['quantidade_trigramas'][posicao] - em_comum)
+        contem = consulta_normalizada in indice['nomes_normalizados'][posicao]
+        pontuados.append((contem, jaccard, posicao))
+
+    pontuados.sort(key=lambda p: (-p[0], -p[1], indice['rotulos'][p[2]]))
+    return [indice['rotulos'][posicao] for _, _, posicao in pontuados[:limite]]
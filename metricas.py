@@ -0,0 +1,282 @@
+import bisect
+import contextlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# --- CONFIGURAÇÃO PADRÃO DAS MÉTRICAS ---
+RELATORIO_PADRAO = "relatorio_coleta.json"
+PREFIXO_PROMETHEUS = "ufc_scraper"
+
+# Limites (em segundos) dos baldes dos histogramas de latência, como no Prometheus
+BALDES_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Descrição de cada latência medida (a unidade é sempre segundos)
+LATENCIAS = {
+    'fila': "espera por um token/vaga do limitador de taxa",
+    'conexao': "abertura de conexão nova (DNS + TCP + TLS)",
+    'espera_servidor': "do envio da requisição até os cabeçalhos da resposta (sem a conexão)",
+    'download': "leitura do corpo da resposta",
+    'requisicao': "requisição completa (conexão + espera + download)",
+    'parse': "parsing do HTML de uma página",
+}
+
+# --------------------------------------------------------------------------------
+# HISTOGRAMA DE BALDES FIXOS (custo constante por observação)
+# --------------------------------------------------------------------------------
+
+class Histograma:
+    """Contagens por balde (limites fixos), soma, mínimo e máximo. Não guarda as observações."""
+
+    def __init__(self, baldes=BALDES_LATENCIA):
+        self.baldes = baldes
+        self.contagens = [0] * (len(baldes) + 1)  # o último balde é +Inf
+        self.total = 0
+        self.soma = 0.0
+        self.minimo = None
+        self.maximo = None
+
+    def observar(self, valor):
+        self.contagens[bisect.bisect_left(self.baldes, valor)] += 1
+        self.total += 1
+        self.soma += valor
+        self.minimo = valor if self.minimo is None else min(self.minimo, valor)
+        self.maximo = valor if self.maximo is None else max(self.maximo, valor)
+
+    def quantil(self, q):
+        """Estimativa do quantil por interpolação linear dentro do balde (como o histogram_quantile)."""
+        if not self.total:
+            return None
+        alvo = q * self.total
+        acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            if acumulado + contagem >= alvo and contagem:
+                inicio = self.baldes[indice - 1] if indice > 0 else 0.0
+                fim = self.baldes[indice] if indice < len(self.baldes) else self.maximo
+                estimativa = inicio + (fim - inicio) * (alvo - acumulado) / contagem
+                return min(max(estimativa, self.minimo), self.maximo)
+            acumulado += contagem
+        return self.maximo
+
+    def incorporar(self, resumo):
+        """Soma outro histograma com os mesmos baldes, a partir do resumo() dele."""
+        for indice, contagem in enumerate(resumo['baldes']):
+            self.contagens[indice] += contagem
+        self.total += resumo['contagem']
+        self.soma += resumo['soma']
+        for valor in (resumo['minimo'], resumo['maximo']):
+            if valor is not None:
+                self.minimo = valor if self.minimo is None else min(self.minimo, valor)
+                self.maximo = valor if self.maximo is None else max(self.maximo, valor)
+
+    def resumo(self):
+        return {
+            'contagem': self.total,
+            'soma': self.soma,
+            'media': self.soma / self.total if self.total else None,
+            'minimo': self.minimo,
+            'p50': self.quantil(0.5),
+            'p90': self.quantil(0.9),
+            'p99': self.quantil(0.99),
+            'maximo': self.maximo,
+            'baldes': list(self.contagens),  # para juntar relatórios de execuções paralelas
+        }
+
+# --------------------------------------------------------------------------------
+# MÉTRICAS DE UMA EXECUÇÃO DA COLETA (compartilhadas pelas threads)
+# --------------------------------------------------------------------------------
+
+# Campos do resumo de um histograma no relatório JSON (as demais chaves são o nome e os rótulos)
+CAMPOS_RESUMO = ('contagem', 'soma', 'media', 'minimo', 'p50', 'p90', 'p99', 'maximo', 'baldes')
+
+
+def _chave(nome, rotulos):
+    return nome, tuple(sorted(rotulos.items()))
+
+
+class MetricasColeta:
+    """
+    Instrumentação da coleta: histogramas de latência por etapa da requisição (veja
+    LATENCIAS), contadores com rótulos (páginas, bytes, falhas por tipo, campos ausentes)
+    e o tempo de parede de cada etapa do pipeline (links, detalhes, lutas).
+
+    Cada observação é uma busca binária + um incremento sob um lock, então pode ficar
+    ligada em produção. O ClienteHTTP carrega uma instância (cliente.metricas), de modo
+    que as funções de extração registram as métricas sem parâmetros extras.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histogramas = {}
+        self._contadores = {}
+        self._etapas = {}
+        self.inicio = time.time()
+
+    def observar(self, nome, segundos, **rotulos):
+        chave = _chave(nome, rotulos)
+        with self._lock:
+            histograma = self._histogramas.get(chave)
+            if histograma is None:
+                histograma = self._histogramas[chave] = Histograma()
+            histograma.observar(segundos)
+
+    def contar(self, nome, quantidade=1, **rotulos):
+        chave = _chave(nome, rotulos)
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + quantidade
+
+    @contextlib.contextmanager
+    def cronometro(self, nome, **rotulos):
+        """Observa a duração do bloco no histograma `nome`."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(nome, time.perf_counter() - inicio, **rotulos)
+
+    @contextlib.contextmanager
+    def etapa(self, nome):
+        """Tempo de parede de uma etapa do pipeline (a taxa de páginas/s usa o contador 'paginas' da etapa)."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._etapas[nome] = self._etapas.get(nome, 0.0) + time.perf_counter() - inicio
+
+    def contar_campos_ausentes(self, dados, campos, valores_ausentes=('', '--')):
+        """Conta os `campos` que a página não trouxe (ausentes ou com valor vazio)."""
+        for campo in campos:
+            valor = dados.get(campo)
+            if valor is None or valor in valores_ausentes:
+                self.contar('campos_ausentes', campo=campo)
+
+    def incorporar(self, relatorio):
+        """
+        Soma as métricas do relatório JSON de outra execução (ex: um shard que rodou em
+        paralelo): contadores e baldes dos histogramas são somados e o tempo de cada etapa
+        fica o da execução mais lenta, já que as execuções correram ao mesmo tempo.
+        """
+        inicio = datetime.fromisoformat(relatorio['inicio']).timestamp()
+        with self._lock:
+            self.inicio = min(self.inicio, inicio)
+            for entrada in relatorio.get('latencias', []):
+                rotulos = {chave: valor for chave, valor in entrada.items() if chave != 'nome' and chave not in CAMPOS_RESUMO}
+                chave = _chave(entrada['nome'], rotulos)
+                histograma = self._histogramas.get(chave)
+                if histograma is None:
+                    histograma = self._histogramas[chave] = Histograma()
+                histograma.incorporar(entrada)
+            for entrada in relatorio.get('contadores', []):
+                rotulos = {chave: valor for chave, valor in entrada.items() if chave not in ('nome', 'valor')}
+                chave = _chave(entrada['nome'], rotulos)
+                self._contadores[chave] = self._contadores.get(chave, 0) + entrada['valor']
+            for etapa, dados in relatorio.get('etapas', {}).items():
+                self._etapas[etapa] = max(self._etapas.get(etapa, 0.0), dados['segundos'])
+
+    # --- Relatório ---
+
+    def valor(self, nome, **rotulos):
+        with self._lock:
+            return self._contadores.get(_chave(nome, rotulos), 0)
+
+    def relatorio(self, extras=None):
+        """Dicionário serializável em JSON com todas as métricas da execução."""
+        with self._lock:
+            histogramas = {chave: histograma.resumo() for chave, histograma in self._histogramas.items()}
+            contadores = dict(self._contadores)
+            etapas = dict(self._etapas)
+
+        paginas_por_etapa = {}
+        for (nome, rotulos), valor in contadores.items():
+            if nome == 'paginas':
+                etapa = dict(rotulos).get('etapa')
+                paginas_por_etapa[etapa] = paginas_por_etapa.get(etapa, 0) + valor
+
+        fim = time.time()
+        duracao = fim - self.inicio
+        total_paginas = sum(paginas_por_etapa.values())
+        relatorio = {
+            'inicio': datetime.fromtimestamp(self.inicio, timezone.utc).isoformat(timespec='seconds'),
+            'fim': datetime.fromtimestamp(fim, timezone.utc).isoformat(timespec='seconds'),
+            'duracao_segundos': duracao,
+            'paginas': total_paginas,
+            'paginas_por_segundo': total_paginas / duracao if duracao else None,
+            'bytes': sum(valor for (nome, _), valor in contadores.items() if nome == 'bytes'),
+            'etapas': {
+                etapa: {
+                    'segundos': segundos,
+                    'paginas': paginas_por_etapa.get(etapa, 0),
+                    'paginas_por_segundo': paginas_por_etapa.get(etapa, 0) / segundos if segundos else None,
+                }
+                for etapa, segundos in etapas.items()
+            },
+            'latencias': [
+                {'nome': nome, **dict(rotulos), **resumo} for (nome, rotulos), resumo in sorted(histogramas.items())
+            ],
+            'contadores': [
+                {'nome': nome, **dict(rotulos), 'valor': valor} for (nome, rotulos), valor in sorted(contadores.items())
+            ],
+        }
+        if extras:
+            relatorio.update(extras)
+        return relatorio
+
+    def salvar_json(self, caminho=RELATORIO_PADRAO, extras=None):
+        _gravar_atomico(caminho, json.dumps(self.relatorio(extras), ensure_ascii=False, indent=2))
+
+    def salvar_prometheus(self, caminho, prefixo=PREFIXO_PROMETHEUS):
+        """
+        Grava as métricas no formato texto do Prometheus (para o textfile collector do
+        node_exporter). A troca do arquivo é atômica: o coletor nunca lê um arquivo pela metade.
+        """
+        with self._lock:
+            histogramas = {chave: (list(h.contagens), h.soma, h.total, h.baldes) for chave, h in self._histogramas.items()}
+            contadores = dict(self._contadores)
+            etapas = dict(self._etapas)
+
+        linhas = []
+        nome_latencia = f"{prefixo}_latencia_segundos"
+        linhas += [f"# HELP {nome_latencia} Latência de cada etapa das requisições e do parsing.",
+                   f"# TYPE {nome_latencia} histogram"]
+        for (nome, rotulos), (contagens, soma, total, baldes) in sorted(histogramas.items()):
+            # `medida` identifica a latência (veja LATENCIAS); `etapa` e os demais rótulos vêm da observação
+            base = (('medida', nome),) + rotulos
+            acumulado = 0
+            for limite, contagem in zip(list(baldes) + ['+Inf'], contagens):
+                acumulado += contagem
+                linhas.append(f"{nome_latencia}_bucket{_rotulos(base + (('le', str(limite)),))} {acumulado}")
+            linhas.append(f"{nome_latencia}_sum{_rotulos(base)} {soma}")
+            linhas.append(f"{nome_latencia}_count{_rotulos(base)} {total}")
+
+        for nome in sorted({nome for nome, _ in contadores}):
+            metrica = f"{prefixo}_{nome}_total"
+            linhas += [f"# TYPE {metrica} counter"]
+            linhas += [f"{metrica}{_rotulos(rotulos)} {valor}"
+                       for (nome_contador, rotulos), valor in sorted(contadores.items()) if nome_contador == nome]
+
+        nome_etapa = f"{prefixo}_etapa_segundos"
+        linhas += [f"# TYPE {nome_etapa} gauge"]
+        linhas += [f"{nome_etapa}{_rotulos((('etapa', etapa),))} {segundos}" for etapa, segundos in sorted(etapas.items())]
+        linhas.append(f"# TYPE {prefixo}_ultima_execucao_timestamp_segundos gauge")
+        linhas.append(f"{prefixo}_ultima_execucao_timestamp_segundos {time.time()}")
+        _gravar_atomico(caminho, '\n'.join(linhas) + '\n')
+
+
+def _rotulos(pares):
+    if not pares:
+        return ''
+    escapados = (f'{chave}="{str(valor).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                 for chave, valor in pares)
+    return '{' + ','.join(escapados) + '}'
+
+
+def _gravar_atomico(caminho, texto):
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    os.makedirs(diretorio, exist_ok=True)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        f.write(texto)
+    os.replace(temporario, caminho)
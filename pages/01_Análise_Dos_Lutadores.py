@@ -1,6 +1,17 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
+
+from painel_tempos import CronometroPagina
+
+cronometro = CronometroPagina('Análise dos Lutadores')
+
+# Módulos do mart (pandas e pyarrow) só são importados quando esta página é aberta
+with cronometro.etapa('Importações'):
+    import pandas as pd
+
+    from dados import (buscar_parecidos, carregar_indice, carregar_lutadores, carregar_similaridade,
+                       carregar_trajetoria, quadros_comparacao)
+    from indice_lutadores import buscar
+    from percentis import coluna_percentil, topo_percentual
 
 # --- Configuração da Página ---
 st.set_page_config(
@@ -8,55 +19,92 @@ st.set_page_config(
     layout="wide"
 )
 
-# Use o decorador de cache para carregar os dados apenas uma vez
-@st.cache_data
-def load_data(file_path):
-    """Carrega os dados limpos do CSV."""
-    try:
-        df = pd.read_csv(file_path)
-        # Preenche valores NaN em colunas numéricas com 0 para evitar erros no display
-        for col in df.columns:
-            if df[col].dtype in [np.float64, np.int64]:
-                df[col] = df[col].fillna(0)
-        return df
-    except FileNotFoundError:
-        # Se o arquivo ainda estiver sendo gerado pelo script, usamos uma mensagem de aviso
-        st.error(f"Erro: O arquivo '{file_path}' não foi encontrado. O script de coleta deve estar rodando/concluído.")
-        return pd.DataFrame()
-
-# Carrega o DataFrame limpo
-DATA_FILE = 'dados_ufc_limpos.csv' 
-df_lutadores = load_data(DATA_FILE)
+# Métricas com o comparativo de percentil (pré-calculado no transform.py, veja percentis.py)
+METRICAS_PERCENTIL = ['SLpM', 'Str. Acc.', 'TD Avg.']
+# Grupos de comparação exibidos na ajuda de cada métrica
+GRUPOS_PERCENTIL = {None: 'no elenco', 'Categoria_Peso': 'na categoria', 'STANCE': 'na base'}
+
+# Colunas do mart usadas nesta página
+COLUNAS = ['Nome', 'Wins', 'Losses', 'Draws', 'Height_in_inches', 'Weight', 'STANCE',
+           'SLpM', 'Str. Acc.', 'Str. Def', 'TD Avg.', 'TD Acc.', 'TD Def.'] + [
+    coluna_percentil(coluna, grupo) for coluna in METRICAS_PERCENTIL for grupo in GRUPOS_PERCENTIL
+]
+
+# Quantidade máxima de sugestões da busca aproximada
+LIMITE_BUSCA = 25
+
+# Quantidade máxima de lutadores parecidos exibidos
+LIMITE_PARECIDOS = 25
+
+# Métricas que podem ser acompanhadas entre as coletas (histórico de versões)
+METRICAS_TRAJETORIA = ['SLpM', 'Str. Acc.', 'SApM', 'Str. Def', 'TD Avg.', 'TD Acc.', 'TD Def.', 'Sub. Avg.', 'Wins', 'Losses']
+
+with cronometro.etapa('Carga do mart'):
+    # Carrega o DataFrame limpo (visão do mart compartilhado, veja dados.py)
+    df_lutadores = carregar_lutadores(COLUNAS)
+    # Índice de nomes pré-calculado no transform.py (posições = linhas do mart)
+    indice = carregar_indice()
+
+
+def seletor_lutador(rotulo, padrao, posicao_reserva, chave):
+    """
+    Caixa de busca aproximada (tolerante a erros e acentos) + seletor de lutador.
+    Sem busca, o seletor mostra a lista completa, já ordenada no transform.
+    """
+    busca = st.sidebar.text_input(f"🔎 Buscar {rotulo}", key=f"busca_{chave}", placeholder="Ex: charles olivera")
+    opcoes = indice['rotulos_ordenados']
+    if busca:
+        encontrados = buscar(indice, busca, limite=LIMITE_BUSCA)
+        if encontrados:
+            opcoes = encontrados
+        else:
+            st.sidebar.caption("Nenhum lutador parecido encontrado.")
+
+    posicao = opcoes.index(padrao) if not busca and padrao in indice['linha_por_rotulo'] else (0 if busca else posicao_reserva)
+    return st.sidebar.selectbox(f"{rotulo}:", opcoes, index=posicao, key=f"seletor_{chave}")
+
+def comparativo(dados_lutador, coluna, ajuda=None):
+    """
+    Argumentos do st.metric com o "Top X% da categoria" como delta (só consulta, sem
+    ordenar nada) e os percentis no elenco, na categoria e na base na ajuda.
+    """
+    topos = {grupo: topo_percentual(dados_lutador.get(coluna_percentil(coluna, grupo)), coluna)
+             for grupo in GRUPOS_PERCENTIL}
+    detalhes = [f"Top {topo}% {nome}" for grupo, nome in GRUPOS_PERCENTIL.items()
+                if (topo := topos[grupo]) is not None]
+    argumentos = {'help': '  \n'.join(([ajuda] if ajuda else []) + detalhes) or None}
+    topo_categoria = topos['Categoria_Peso']
+    if topo_categoria is not None:
+        argumentos['delta'] = f"Top {topo_categoria}% da categoria"
+        argumentos['delta_color'] = 'normal' if topo_categoria <= 50 else 'off'
+    return argumentos
 
 # --- Título Principal ---
 st.title("📊 Análise de Lutadores do UFC: Comparação")
 st.markdown("Use a barra lateral para selecionar dois lutadores para análise lado a lado.")
 
+# O índice precisa ter sido gerado junto com o mart carregado
+if not df_lutadores.empty and (indice is None or len(indice['ids']) != len(df_lutadores)):
+    st.error("Erro: o índice de nomes está ausente ou desatualizado. Execute o transform.py novamente.")
+    st.stop()
+
 # Verifica se os dados foram carregados
 if not df_lutadores.empty:
     
-    fighter_names = sorted(df_lutadores['Nome'].unique().tolist())
-    
     # --- 2. BARRA LATERAL PARA SELEÇÃO E COMPARAÇÃO ---
     st.sidebar.header("🥊 Seleção de Lutadores")
     
-    # Seletor 1
-    selected_fighter_1 = st.sidebar.selectbox(
-        'Lutador A (Para Pesquisar, Clique e Digite):',
-        fighter_names,
-        index=fighter_names.index('Arman Tsarukyan') if 'Arman Tsarukyan' in fighter_names else 0 # Sugestão de lutador 1
-    )
+    # Seletor 1 (Sugestão de lutador 1)
+    selected_fighter_1 = seletor_lutador('Lutador A', 'Arman Tsarukyan', 0, 'a')
     
-    # Seletor 2
-    selected_fighter_2 = st.sidebar.selectbox(
-        'Lutador B (Comparar com):',
-        fighter_names,
-        index=fighter_names.index('Charles Oliveira') if 'Charles Oliveira' in fighter_names else 1 # Sugestão de lutador 2
-    )
+    # Seletor 2 (Sugestão de lutador 2)
+    selected_fighter_2 = seletor_lutador('Lutador B (Comparar com)', 'Charles Oliveira', 1, 'b')
 
-    # Filtra os dados
-    fighter_data_1 = df_lutadores[df_lutadores['Nome'] == selected_fighter_1].iloc[0]
-    fighter_data_2 = df_lutadores[df_lutadores['Nome'] == selected_fighter_2].iloc[0]
+    # Busca O(1) da linha de cada lutador pelo índice (nomes repetidos têm rótulos distintos)
+    linha_1 = indice['linha_por_rotulo'][selected_fighter_1]
+    linha_2 = indice['linha_por_rotulo'][selected_fighter_2]
+    fighter_data_1 = df_lutadores.iloc[linha_1]
+    fighter_data_2 = df_lutadores.iloc[linha_2]
 
     # --- 3. LAYOUT DE COMPARAÇÃO (Main Content) ---
     
@@ -76,9 +124,10 @@ if not df_lutadores.empty:
 
         # Stats de Luta
         st.markdown("**Métricas de Luta**")
-        st.metric("Golpes Desferidos (SLpM)", f"{fighter_data_1['SLpM']:.2f}", help="Significant Strikes Landed per Minute")
-        st.metric("Precisão de Golpes (Str. Acc.)", f"{fighter_data_1['Str. Acc.'] * 100:.0f}%")
-        st.metric("Quedas Média (TD Avg.)", f"{fighter_data_1['TD Avg.']:.2f}")
+        st.metric("Golpes Desferidos (SLpM)", f"{fighter_data_1['SLpM']:.2f}",
+                  **comparativo(fighter_data_1, 'SLpM', "Significant Strikes Landed per Minute"))
+        st.metric("Precisão de Golpes (Str. Acc.)", f"{fighter_data_1['Str. Acc.'] * 100:.0f}%", **comparativo(fighter_data_1, 'Str. Acc.'))
+        st.metric("Quedas Média (TD Avg.)", f"{fighter_data_1['TD Avg.']:.2f}", **comparativo(fighter_data_1, 'TD Avg.'))
 
     # Coluna Central: VS
     with col_center:
@@ -96,12 +145,16 @@ if not df_lutadores.empty:
         
         # Stats de Luta
         st.markdown("**Métricas de Luta**")
-        st.metric("Golpes Desferidos (SLpM)", f"{fighter_data_2['SLpM']:.2f}")
-        st.metric("Precisão de Golpes (Str. Acc.)", f"{fighter_data_2['Str. Acc.'] * 100:.0f}%")
-        st.metric("Quedas Média (TD Avg.)", f"{fighter_data_2['TD Avg.']:.2f}")
+        st.metric("Golpes Desferidos (SLpM)", f"{fighter_data_2['SLpM']:.2f}",
+                  **comparativo(fighter_data_2, 'SLpM', "Significant Strikes Landed per Minute"))
+        st.metric("Precisão de Golpes (Str. Acc.)", f"{fighter_data_2['Str. Acc.'] * 100:.0f}%", **comparativo(fighter_data_2, 'Str. Acc.'))
+        st.metric("Quedas Média (TD Avg.)", f"{fighter_data_2['TD Avg.']:.2f}", **comparativo(fighter_data_2, 'TD Avg.'))
 
 else:
     st.warning("Aguardando o carregamento dos dados completos.")
+    # Sem lutadores selecionados, as seções abaixo (gráficos, parecidos e histórico) não rodam
+    cronometro.painel()
+    st.stop()
 
 # ... O código de comparação por st.metric (col_stats_1, col_center, col_stats_2) termina aqui ...
 
@@ -111,49 +164,59 @@ st.markdown("---")
     # --- 4. SEÇÃO DE GRÁFICOS DE COMPARAÇÃO ---
 st.header("Análise Gráfica de Performance")
     
-    # Métricas para Comparação em Gráfico
-metrics_to_compare = [
-    'SLpM',          # Golpes Desferidos por Minuto
-    'Str. Acc.',     # Precisão de Golpes
-    'TD Avg.',       # Quedas Desferidas Média
-    'TD Def.',       # Defesa de Quedas
-]
-    
-    # Cria um DataFrame para a visualização
-comparison_df = pd.DataFrame({
-    'Lutador': [selected_fighter_1, selected_fighter_2],
-    'SLpM (Golpes/min)': [fighter_data_1['SLpM'], fighter_data_2['SLpM']],
-    'Str. Acc. (%)': [fighter_data_1['Str. Acc.'] * 100, fighter_data_2['Str. Acc.'] * 100],
-    'Str. Def (%)': [fighter_data_1['Str. Def'] * 100, fighter_data_2['Str. Def'] * 100],
-    'TD Avg. (Quedas/luta)': [fighter_data_1['TD Avg.'], fighter_data_2['TD Avg.']],
-    'TD Def. (%)': [fighter_data_1['TD Def.'] * 100, fighter_data_2['TD Def.'] * 100],
-    'TD Acc. (%)': [fighter_data_1['TD Acc.'] * 100, fighter_data_2['TD Acc.'] * 100]
-})
-    
-    # Transpõe o DataFrame para que as métricas sejam as colunas e seja fácil plotar
-comparison_df_T = comparison_df.set_index('Lutador').T.reset_index()
-comparison_df_T = comparison_df_T.rename(columns={'index': 'Métrica'})
-    
-    # Cria o gráfico usando o Streamlit Bar Chart
-    # Usaremos colunas para separar as visualizações e melhorar o layout
-    
-st.subheader("Comparação de Média por Minuto (SLpM vs TD Avg)")
-    
-    # Gráfico 1: Agressividade
-chart_data = comparison_df[['Lutador', 'SLpM (Golpes/min)', 'TD Avg. (Quedas/luta)']].set_index('Lutador')
-st.bar_chart(chart_data)
+# Quadros dos gráficos já prontos para o par (cache LRU por par de lutadores, veja dados.py)
+with cronometro.etapa('Gráficos'):
+    comparison_charts = quadros_comparacao(linha_1, linha_2, (selected_fighter_1, selected_fighter_2))
 
-st.subheader("Comparação de Precisão e Defesa")
-    
-col_chart_1, col_chart_2 = st.columns(2)
-    
-with col_chart_1:
-    st.caption("Precisão de Golpes vs Defesa de Golpes")
-    chart_data_accuracy = comparison_df[['Lutador', 'Str. Acc. (%)', 'Str. Def (%)']].set_index('Lutador')
-    st.bar_chart(chart_data_accuracy)
-        
-with col_chart_2:
-    st.caption("Precisão de Quedas vs Defesa de Quedas")
-    chart_data_td = comparison_df[['Lutador', 'TD Acc. (%)', 'TD Def. (%)']].set_index('Lutador')
-    st.bar_chart(chart_data_td)
+    st.subheader("Comparação de Média por Minuto (SLpM vs TD Avg)")
 
+    # Gráfico 1: Agressividade
+    st.bar_chart(comparison_charts['agressividade'])
+
+    st.subheader("Comparação de Precisão e Defesa")
+
+    col_chart_1, col_chart_2 = st.columns(2)
+
+    with col_chart_1:
+        st.caption("Precisão de Golpes vs Defesa de Golpes")
+        st.bar_chart(comparison_charts['golpes'])
+
+    with col_chart_2:
+        st.caption("Precisão de Quedas vs Defesa de Quedas")
+        st.bar_chart(comparison_charts['quedas'])
+
+# --- 5. LUTADORES MAIS PARECIDOS (veja similaridade.py) ---
+with cronometro.etapa('Carga da similaridade'):
+    # Matriz de similaridade pré-calculada no transform.py (mesmas linhas do mart)
+    similaridade = carregar_similaridade()
+if similaridade is not None and len(similaridade) == len(df_lutadores):
+    st.header(f"Lutadores Mais Parecidos com {selected_fighter_1}")
+    st.caption("Distância entre as estatísticas padronizadas (golpes, quedas, finalizações, envergadura e altura).")
+    col_n, col_peso = st.columns([3, 1])
+    with col_n:
+        quantidade = st.slider("Quantidade:", 5, LIMITE_PARECIDOS, 10, key="quantidade_parecidos")
+    with col_peso:
+        mesma_categoria = st.checkbox("Só da mesma categoria", value=True, key="parecidos_mesma_categoria")
+
+    posicoes, distancias = buscar_parecidos(linha_1, quantidade, 'Categoria_Peso' if mesma_categoria else None)
+    parecidos = df_lutadores.iloc[posicoes][['Weight', 'Wins', 'Losses', 'Draws', 'SLpM', 'Str. Acc.', 'TD Avg.', 'TD Def.']]
+    parecidos.insert(0, 'Lutador', [indice['rotulos'][posicao] for posicao in posicoes])
+    parecidos.insert(1, 'Distância', distancias)
+    st.dataframe(parecidos, hide_index=True, use_container_width=True)
+
+# --- 6. EVOLUÇÃO ENTRE COLETAS (histórico de versões, veja historico.py) ---
+with cronometro.etapa('Histórico'):
+    trajetorias = {
+        rotulo: carregar_trajetoria(indice['ids'][linha], METRICAS_TRAJETORIA)
+        for rotulo, linha in ((selected_fighter_1, linha_1), (selected_fighter_2, linha_2))
+    }
+if any(len(trajetoria) > 1 for trajetoria in trajetorias.values()):
+    st.header("Evolução entre Coletas")
+    metrica = st.selectbox("Métrica:", METRICAS_TRAJETORIA, key="metrica_trajetoria")
+    evolucao = pd.concat(
+        {rotulo: trajetoria[metrica] for rotulo, trajetoria in trajetorias.items() if not trajetoria.empty}, axis=1
+    ).sort_index().ffill()
+    st.line_chart(evolucao)
+    st.caption("Cada ponto é uma coleta em que as estatísticas do lutador mudaram.")
+
+cronometro.painel()
@@ -1,6 +1,12 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
+
+from painel_tempos import CronometroPagina
+
+cronometro = CronometroPagina('Filtro por Peso')
+
+with cronometro.etapa('Importações'):
+    from categorias_peso import agregados_da_categoria
+    from dados import carregar_lutadores, carregar_particoes
 
 # --- Configuração da Página ---
 st.set_page_config(
@@ -8,68 +14,44 @@ st.set_page_config(
     layout="wide"
 )
 
-# Use o decorador de cache para carregar os dados apenas uma vez
-@st.cache_data
-def load_data(file_path):
-    """Carrega os dados limpos do CSV."""
-    try:
-        df = pd.read_csv(file_path)
-        # Preenche valores NaN em colunas numéricas com 0
-        for col in df.columns:
-            if df[col].dtype in [np.float64, np.int64]:
-                df[col] = df[col].fillna(0)
-        return df
-    except FileNotFoundError:
-        st.error(f"Erro: O arquivo '{file_path}' não foi encontrado. O script de coleta deve estar rodando/concluído.")
-        return pd.DataFrame()
+# Colunas do mart usadas nesta página
+COLUNAS = ['Nome', 'Wins', 'Losses', 'Weight', 'STANCE', 'SLpM', 'Str. Acc.', 'TD Avg.', 'TD Def.']
 
-# Mapeamento aproximado das categorias de peso do UFC (em lbs)
-PESO_MAP = {
-    'Todos': 0,
-    'Peso Pesado (265 lbs)': 265,
-    'Meio Pesado (205 lbs)': 205,
-    'Peso Médio (185 lbs)': 185,
-    'Meio Médio (170 lbs)': 170,
-    'Peso Leve (155 lbs)': 155,
-    'Peso Pena (145 lbs)': 145,
-    'Peso Galo (135 lbs)': 135,
-    'Peso Mosca (125 lbs)': 125,
-    'Peso Palha Feminino (115 lbs)': 115
-}
-
-# Carrega o DataFrame limpo
-DATA_FILE = 'dados_ufc_limpos.csv' 
-df_lutadores = load_data(DATA_FILE)
+with cronometro.etapa('Carga do mart'):
+    # Carrega o DataFrame limpo (visão do mart compartilhado, veja dados.py)
+    df_lutadores = carregar_lutadores(COLUNAS)
+    # Partições por categoria, já ordenadas por vitórias e SLpM no transform.py (posições = linhas do mart)
+    particoes = carregar_particoes()
 
 # --- Título Principal ---
 st.title("⚖️ Explorar e Filtrar Lutadores por Categoria de Peso")
 st.markdown("Use o filtro lateral para ver a lista de lutadores de uma categoria específica.")
 
+# As partições precisam ter sido geradas junto com o mart carregado
+if not df_lutadores.empty and (particoes is None or particoes['total'] != len(df_lutadores)):
+    st.error("Erro: as partições por categoria estão ausentes ou desatualizadas. Execute o transform.py novamente.")
+    st.stop()
+
 # Verifica se os dados foram carregados
 if not df_lutadores.empty:
     
     # --- 2. BARRA LATERAL PARA FILTRO ---
     st.sidebar.header("Filtro de Categoria")
     
-    # Seletor de Categoria
+    # Seletor de Categoria ('Todos' + categorias com lutadores, da mais leve para a mais pesada)
     selected_category = st.sidebar.selectbox(
         'Selecione a Categoria de Peso:',
-        list(PESO_MAP.keys())
+        list(particoes['categorias']),
+        format_func=lambda rotulo: f"{rotulo} · {particoes['categorias'][rotulo]['lutadores']}"
     )
     
     # -----------------------------------------------------------
     # Aplicação do Filtro
     # -----------------------------------------------------------
     
-    df_filtered = df_lutadores.copy()
-    
-    if selected_category != 'Todos':
-        weight_limit = PESO_MAP[selected_category]
-        # Filtra pelo peso exato (em libras)
-        df_filtered = df_filtered[df_filtered['Weight'] == weight_limit]
-
-    # Ordena por vitórias para ter um ranking mais lógico
-    df_filtered = df_filtered.sort_values(by=['Wins', 'SLpM'], ascending=[False, False])
+    # Fatia da partição já pronta: sem cópia do mart inteiro, filtro ou ordenação por interação
+    categoria = particoes['categorias'][selected_category]
+    df_filtered = df_lutadores.iloc[particoes['ordem'][categoria['inicio']:categoria['fim']]]
     
     
     # --- 3. EXIBIÇÃO DA TABELA PRINCIPAL ---
@@ -93,5 +75,12 @@ if not df_lutadores.empty:
         hide_index=True
     )
 
+    # --- 4. RESUMO DA CATEGORIA (agregados pré-calculados no transform.py) ---
+    st.subheader("Resumo da Categoria")
+    st.caption("Lutadores com a estatística informada, média e percentis (P50 = mediana).")
+    st.dataframe(agregados_da_categoria(particoes, selected_category), use_container_width=True)
+
 else:
-    st.warning("Aguardando o carregamento dos dados completos.")
\ No newline at end of file
+    st.warning("Aguardando o carregamento dos dados completos.")
+
+cronometro.painel()
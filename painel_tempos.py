@@ -0,0 +1,62 @@
+import contextlib
+import statistics
+import time
+from collections import deque
+
+import streamlit as st
+
+# --------------------------------------------------------------------------------
+# TEMPOS DE PARTIDA E DE CADA RERUN (painel na barra lateral do dashboard)
+# --------------------------------------------------------------------------------
+
+# Primeira importação deste módulo: a primeira página servida pelo processo do Streamlit
+INICIO_PROCESSO = time.perf_counter()
+# Reruns guardados por página no histórico de cada sessão
+HISTORICO_RERUNS = 50
+
+# Primeira execução de cada página no processo (a frio), compartilhada pelas sessões
+_execucoes_a_frio = {}
+
+
+def _ms(segundos):
+    return f"{segundos * 1000:,.0f} ms".replace(',', '.')
+
+
+class CronometroPagina:
+    """
+    Mede a execução do script da página (um rerun), separada em etapas, e mostra os
+    tempos em um painel recolhido na barra lateral: o rerun atual, a mediana e o máximo
+    dos reruns da sessão, e a primeira execução da página no processo (a frio, com as
+    importações e a carga dos dados ainda sem cache). Só mede o servidor: o tempo de
+    desenho no navegador não entra.
+    Crie o cronômetro no topo da página e chame painel() no final.
+    """
+
+    def __init__(self, pagina):
+        self.pagina = pagina
+        self.inicio = time.perf_counter()
+        self.etapas = {}
+
+    @contextlib.contextmanager
+    def etapa(self, nome):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.etapas[nome] = self.etapas.get(nome, 0.0) + time.perf_counter() - inicio
+
+    def painel(self):
+        total = time.perf_counter() - self.inicio
+        a_frio = _execucoes_a_frio.setdefault(self.pagina, {'total': total, 'etapas': dict(self.etapas)})
+        reruns = st.session_state.setdefault('_tempos_reruns', {}).setdefault(self.pagina, deque(maxlen=HISTORICO_RERUNS))
+        reruns.append(total)
+
+        with st.sidebar.expander("⏱️ Tempos de execução"):
+            linhas = [f"**Este rerun:** {_ms(total)}"]
+            linhas += [f"- {nome}: {_ms(segundos)}" for nome, segundos in self.etapas.items()]
+            linhas.append(f"**Sessão:** {len(reruns)} reruns · mediana {_ms(statistics.median(reruns))} "
+                          f"· máximo {_ms(max(reruns))}")
+            linhas.append(f"**A frio** (1ª execução da página no processo): {_ms(a_frio['total'])}")
+            linhas += [f"- {nome}: {_ms(segundos)}" for nome, segundos in a_frio['etapas'].items()]
+            linhas.append(f"Processo ativo há {time.perf_counter() - INICIO_PROCESSO:,.0f} s".replace(',', '.'))
+            st.markdown('\n'.join(linhas))
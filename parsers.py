@@ -0,0 +1,319 @@
+import functools
+import os
+import threading
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:  # lxml é opcional: sem ele, o backend BeautifulSoup é usado
+    lxml = None
+
+# --- CLASSES CSS DAS PÁGINAS DO UFCSTATS ---
+CLASSE_NOME = 'b-content__title-highlight'
+CLASSE_RECORDE = 'b-content__title-record'
+CLASSE_STAT = 'b-list__box-list-item'
+
+# Tabela de lutas (página do lutador) e página de detalhes da luta
+CLASSE_LINHA_LUTA = 'b-fight-details__table-row'
+CLASSE_CORPO_TABELA = 'b-fight-details__table-body'
+CLASSE_TITULO_LUTA = 'b-fight-details__fight-title'
+CLASSE_ITEM_LUTA = 'b-fight-details__text-item'  # também casa com '..._first'
+
+NOME_NAO_ENCONTRADO = "Nome não encontrado"
+RECORDE_NAO_ENCONTRADO = "Recorde não encontrado"
+
+# Campos esperados da página do lutador (colunas de dados_ufc_brutos.csv) e os valores
+# que o UFCStats/parsers usam quando o campo está vazio (contados nas métricas da coleta)
+CAMPOS_LUTADOR = ['Height', 'Weight', 'Reach', 'STANCE', 'DOB', 'SLpM', 'Str. Acc.', 'SApM', 'Str. Def',
+                  'TD Avg.', 'TD Acc.', 'TD Def.', 'Sub. Avg.', 'Nome', 'Recorde']
+VALORES_AUSENTES = ('', '--', NOME_NAO_ENCONTRADO, RECORDE_NAO_ENCONTRADO)
+
+# Chave (no dicionário do lutador) com as lutas extraídas no modo por luta
+CHAVE_LUTAS = 'Lutas'
+# Rótulos da página de detalhes da luta que vão para a tabela de lutas
+ITENS_DETALHE_LUTA = {'Time format': 'Formato', 'Referee': 'Arbitro'}
+
+
+def _montar_stats(nome_texto, recorde_texto, itens_texto):
+    """
+    Regra comum a todos os backends: recebe o texto bruto dos nós de nome, recorde e
+    estatísticas e monta o dicionário no formato de dados_ufc_brutos.csv.
+    """
+    nome_lutador = nome_texto.strip() if nome_texto is not None else NOME_NAO_ENCONTRADO
+    recorde_texto = recorde_texto.strip() if recorde_texto is not None else RECORDE_NAO_ENCONTRADO
+    recorde = recorde_texto.replace('Record:', '').strip()
+
+    stats_dict = {}
+    for texto in itens_texto:
+        partes = texto.split(':')
+        if len(partes) == 2:
+            chave = partes[0].strip()
+            valor = partes[1].strip()
+            stats_dict[chave] = valor
+
+    stats_dict['Nome'] = nome_lutador
+    stats_dict['Recorde'] = recorde
+    return stats_dict
+
+
+def _ultimo_segmento(url):
+    """ID do UFCStats: último segmento da URL (mesma regra de indice_lutadores.id_lutador)."""
+    return url.rstrip('/').rsplit('/', 1)[-1] if url else ''
+
+
+def _lados(celula):
+    """Textos dos dois lados (lutador da página / adversário) de uma célula da tabela."""
+    textos = [texto for texto, _ in celula]
+    return (textos + ['', ''])[:2]
+
+
+def _montar_lutas(linhas):
+    """
+    Regra comum a todos os backends para a tabela de lutas da página do lutador.
+    `linhas` são pares (link da luta, células), com cada célula sendo a lista de
+    (texto, href) dos seus parágrafos. Cada luta sai em orientação canônica (lado 1 =
+    lutador de menor ID), então a mesma luta vista nas páginas dos dois adversários
+    gera o mesmo dicionário e é deduplicada pelo 'ID_Luta'.
+    Lutas futuras ('next') são ignoradas.
+    """
+    lutas = []
+    for link, celulas in linhas:
+        if 'fight-details' not in link or len(celulas) < 10 or not celulas[0] or len(celulas[1]) < 2:
+            continue
+        resultado = celulas[0][0][0].lower()
+        if resultado not in ('win', 'loss', 'draw', 'nc'):
+            continue
+
+        lutadores = [(nome, _ultimo_segmento(href)) for nome, href in celulas[1][:2]]
+        lados = {coluna: _lados(celula) for coluna, celula in zip(['KD', 'Str', 'Td', 'Sub'], celulas[2:6])}
+        if lutadores[0][1] > lutadores[1][1]:
+            lutadores.reverse()
+            lados = {coluna: valores[::-1] for coluna, valores in lados.items()}
+            resultado = {'win': 'loss', 'loss': 'win'}.get(resultado, resultado)
+
+        evento = celulas[6] + [('', None)] * 2
+        metodo = _lados(celulas[7])
+        luta = {
+            'ID_Luta': _ultimo_segmento(link),
+            'URL_Luta': link,
+            'Evento': evento[0][0],
+            'URL_Evento': evento[0][1] or '',
+            'Data': evento[1][0],
+            'Lutador_1': lutadores[0][0],
+            'ID_1': lutadores[0][1],
+            'Lutador_2': lutadores[1][0],
+            'ID_2': lutadores[1][1],
+            'Resultado_1': resultado,
+            'Metodo': metodo[0],
+            'Detalhe_Metodo': metodo[1],
+            'Round': _lados(celulas[8])[0],
+            'Tempo': _lados(celulas[9])[0],
+        }
+        for coluna, (lado_1, lado_2) in lados.items():
+            luta[f'{coluna}_1'] = lado_1
+            luta[f'{coluna}_2'] = lado_2
+        lutas.append(luta)
+    return lutas
+
+
+def _montar_detalhes_luta(titulo_texto, itens_texto, totais):
+    """
+    Regra comum a todos os backends para a página de detalhes da luta: categoria,
+    formato, árbitro e os totais de cada lutador (células da primeira linha da tabela
+    'Totals'), na mesma orientação canônica de _montar_lutas.
+    """
+    detalhes = {'Categoria': ' '.join(titulo_texto.split()) if titulo_texto else ''}
+    for texto in itens_texto:
+        chave, separador, valor = texto.partition(':')
+        if separador and chave.strip() in ITENS_DETALHE_LUTA:
+            detalhes[ITENS_DETALHE_LUTA[chave.strip()]] = ' '.join(valor.split())
+
+    # Colunas da tabela 'Totals': Fighter, KD, Sig. str., Sig. str. %, Total str., Td, Td %, Sub. att, Rev., Ctrl
+    if len(totais) >= 10 and len(totais[0]) >= 2:
+        ids = [_ultimo_segmento(href) for _, href in totais[0][:2]]
+        ordem = [1, 0] if ids[0] > ids[1] else [0, 1]
+        for coluna, indice in [('Sig_Str', 2), ('Total_Str', 4), ('Rev', 8), ('Ctrl', 9)]:
+            valores = _lados(totais[indice])
+            detalhes[f'{coluna}_1'] = valores[ordem[0]]
+            detalhes[f'{coluna}_2'] = valores[ordem[1]]
+    return detalhes
+
+# --------------------------------------------------------------------------------
+# BACKEND 1: BeautifulSoup (html.parser) — referência
+# --------------------------------------------------------------------------------
+
+class ParserBeautifulSoup:
+    """Backend original: constrói a árvore completa com BeautifulSoup + html.parser."""
+
+    nome = 'bs4'
+
+    def parse_lutador(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+
+        nome_element = soup.find('span', class_=CLASSE_NOME)
+        recorde_element = soup.find('span', class_=CLASSE_RECORDE)
+        stats_list = soup.find_all('li', class_=CLASSE_STAT)
+
+        return _montar_stats(
+            nome_element.text if nome_element else None,
+            recorde_element.text if recorde_element else None,
+            (item.text for item in stats_list),
+        )
+
+    def parse_links(self, html, base_detail_url):
+        soup = BeautifulSoup(html, 'html.parser')
+        return {link['href'] for link in soup.find_all('a', href=True) if base_detail_url in link['href']}
+
+    @staticmethod
+    def _celulas(linha):
+        celulas = []
+        for coluna in linha.find_all('td', recursive=False):
+            paragrafos = []
+            for p in coluna.find_all('p'):
+                link = p.find('a', href=True)
+                paragrafos.append((p.get_text().strip(), link['href'] if link else None))
+            celulas.append(paragrafos)
+        return celulas
+
+    def parse_lutas(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        linhas = soup.find_all('tr', class_=CLASSE_LINHA_LUTA, attrs={'data-link': True})
+        return _montar_lutas((linha['data-link'].strip(), self._celulas(linha)) for linha in linhas)
+
+    def parse_detalhes_luta(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        titulo = soup.find('i', class_=CLASSE_TITULO_LUTA)
+        itens = soup.find_all('i', class_=lambda classe: classe is not None and classe.startswith(CLASSE_ITEM_LUTA))
+        corpo = soup.find('tbody', class_=CLASSE_CORPO_TABELA)
+        linha = corpo.find('tr') if corpo else None
+        return _montar_detalhes_luta(
+            titulo.get_text() if titulo else None,
+            (item.get_text() for item in itens),
+            self._celulas(linha) if linha else [],
+        )
+
+# --------------------------------------------------------------------------------
+# BACKEND 2: lxml (libxml2 em C + XPath direcionado)
+# --------------------------------------------------------------------------------
+
+def _xpath_classe(tag, classe):
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {classe} ')]"
+
+
+class ParserLxml:
+    """
+    Backend rápido: o parser do libxml2 é escrito em C e as consultas XPath compiladas
+    vão direto aos nós de título, recorde e estatísticas (e aos href dos links).
+    Produz exatamente os mesmos dicionários do ParserBeautifulSoup.
+    """
+
+    nome = 'lxml'
+
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("O backend 'lxml' requer o pacote lxml (pip install lxml).")
+        # Objetos XPath do lxml não devem ser compartilhados entre threads: um conjunto por thread
+        self._local = threading.local()
+
+    def _consultas(self):
+        consultas = getattr(self._local, 'consultas', None)
+        if consultas is None:
+            consultas = self._local.consultas = {
+                'nome': lxml.etree.XPath(_xpath_classe('span', CLASSE_NOME) + '[1]'),
+                'recorde': lxml.etree.XPath(_xpath_classe('span', CLASSE_RECORDE) + '[1]'),
+                'stats': lxml.etree.XPath(_xpath_classe('li', CLASSE_STAT)),
+                'links': lxml.etree.XPath("//a[contains(@href, $base)]/@href"),
+                'linhas_lutas': lxml.etree.XPath(_xpath_classe('tr', CLASSE_LINHA_LUTA) + '[@data-link]'),
+                'titulo_luta': lxml.etree.XPath(_xpath_classe('i', CLASSE_TITULO_LUTA) + '[1]'),
+                'itens_luta': lxml.etree.XPath(f"//i[contains(concat(' ', normalize-space(@class)), ' {CLASSE_ITEM_LUTA}')]"),
+                'totais': lxml.etree.XPath(f"({_xpath_classe('tbody', CLASSE_CORPO_TABELA)})[1]/tr[1]"),
+            }
+        return consultas
+
+    def _documento(self, html):
+        if not html or not html.strip():
+            return None
+        return lxml.html.document_fromstring(html)
+
+    def parse_lutador(self, html):
+        documento = self._documento(html)
+        if documento is None:
+            return _montar_stats(None, None, [])
+
+        consultas = self._consultas()
+        nome = consultas['nome'](documento)
+        recorde = consultas['recorde'](documento)
+        return _montar_stats(
+            nome[0].text_content() if nome else None,
+            recorde[0].text_content() if recorde else None,
+            (item.text_content() for item in consultas['stats'](documento)),
+        )
+
+    def parse_links(self, html, base_detail_url):
+        documento = self._documento(html)
+        if documento is None:
+            return set()
+        return {str(href) for href in self._consultas()['links'](documento, base=base_detail_url)}
+
+    @staticmethod
+    def _celulas(linha):
+        celulas = []
+        for coluna in linha.iterchildren('td'):
+            paragrafos = []
+            for p in coluna.iter('p'):
+                hrefs = p.xpath('.//a/@href')
+                paragrafos.append((p.text_content().strip(), str(hrefs[0]) if hrefs else None))
+            celulas.append(paragrafos)
+        return celulas
+
+    def parse_lutas(self, html):
+        documento = self._documento(html)
+        if documento is None:
+            return []
+        linhas = self._consultas()['linhas_lutas'](documento)
+        return _montar_lutas((linha.get('data-link').strip(), self._celulas(linha)) for linha in linhas)
+
+    def parse_detalhes_luta(self, html):
+        documento = self._documento(html)
+        if documento is None:
+            return _montar_detalhes_luta(None, [], [])
+
+        consultas = self._consultas()
+        titulo = consultas['titulo_luta'](documento)
+        linha = consultas['totais'](documento)
+        return _montar_detalhes_luta(
+            titulo[0].text_content() if titulo else None,
+            (item.text_content() for item in consultas['itens_luta'](documento)),
+            self._celulas(linha[0]) if linha else [],
+        )
+
+# --------------------------------------------------------------------------------
+# REGISTRO DE BACKENDS
+# --------------------------------------------------------------------------------
+
+BACKENDS = {
+    ParserBeautifulSoup.nome: ParserBeautifulSoup,
+    ParserLxml.nome: ParserLxml,
+}
+
+
+def backends_disponiveis():
+    """Nomes dos backends que podem ser usados neste ambiente."""
+    return [nome for nome in BACKENDS if nome != 'lxml' or lxml is not None]
+
+
+def obter_parser(nome=None):
+    """
+    Retorna a instância (compartilhada) do backend pedido. Sem nome, usa a variável de
+    ambiente UFC_PARSER ou, na falta dela, o backend mais rápido disponível.
+    """
+    nome = nome or os.environ.get("UFC_PARSER") or ('lxml' if lxml is not None else 'bs4')
+    if nome not in BACKENDS:
+        raise ValueError(f"Backend de parser desconhecido: '{nome}'. Opções: {', '.join(BACKENDS)}")
+    return _instanciar(nome)
+
+
+@functools.lru_cache(maxsize=None)
+def _instanciar(nome):
+    return BACKENDS[nome]()
@@ -0,0 +1,57 @@
+import pandas as pd
+
+# --------------------------------------------------------------------------------
+# PERCENTIS DAS ESTATÍSTICAS (calculados no transform, guardados no mart)
+# --------------------------------------------------------------------------------
+
+# Estatísticas com percentil no mart
+COLUNAS_PERCENTIL = ['SLpM', 'Str. Acc.', 'SApM', 'Str. Def', 'TD Avg.', 'TD Acc.', 'TD Def.', 'Sub. Avg.']
+# Estatísticas em que um valor menor é melhor (golpes sofridos por minuto)
+MENOR_E_MELHOR = {'SApM'}
+
+# Grupo de comparação -> sufixo da coluna ('SLpM_Pct', 'SLpM_Pct_Categoria', 'SLpM_Pct_Base')
+GRUPOS_PERCENTIL = {
+    None: '_Pct',
+    'Categoria_Peso': '_Pct_Categoria',
+    'STANCE': '_Pct_Base',
+}
+
+# Todas as colunas de percentil do mart
+COLUNAS_PERCENTIS_MART = [f"{coluna}{sufixo}" for sufixo in GRUPOS_PERCENTIL.values() for coluna in COLUNAS_PERCENTIL]
+
+
+def coluna_percentil(coluna, grupo=None):
+    return f"{coluna}{GRUPOS_PERCENTIL[grupo]}"
+
+
+def calcular_percentis(df_limpo):
+    """
+    Percentil (0-100) de cada estatística no elenco inteiro, na categoria de peso e na
+    base (STANCE) do lutador: a parcela do grupo com valor menor ou igual, com empates
+    na média. Vetorizado (um rank por grupo via groupby) e guardado como UInt8 (1 byte
+    por valor). Lutadores sem a estatística, ou sem categoria/base, ficam sem percentil.
+    """
+    percentis = {}
+    for grupo, sufixo in GRUPOS_PERCENTIL.items():
+        colunas = [coluna for coluna in COLUNAS_PERCENTIL if coluna in df_limpo.columns]
+        if grupo is None:
+            ranks = df_limpo[colunas].rank(pct=True)
+        elif grupo in df_limpo.columns:
+            ranks = df_limpo[colunas].groupby(df_limpo[grupo], observed=True, dropna=True).rank(pct=True)
+            ranks = ranks.reindex(df_limpo.index)
+        else:
+            continue
+        for coluna in colunas:
+            percentis[f"{coluna}{sufixo}"] = (ranks[coluna] * 100).round().astype('UInt8')
+    return pd.DataFrame(percentis, index=df_limpo.index)
+
+
+def topo_percentual(percentil, coluna):
+    """
+    "Top X%" do lutador na estatística a partir do percentil (considera MENOR_E_MELHOR).
+    Ex: percentil 92 em SLpM -> 8 (top 8%). Retorna None sem percentil.
+    """
+    if pd.isna(percentil):
+        return None
+    melhor_que = 100 - int(percentil) if coluna in MENOR_E_MELHOR else int(percentil)
+    return max(1, 100 - melhor_que)
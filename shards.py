@@ -0,0 +1,141 @@
+import glob
+import hashlib
+import os
+import re
+
+import pandas as pd
+
+from checkpoint import TAMANHO_LOTE, CheckpointColeta
+from indice_lutadores import id_lutador
+
+# --- CONFIGURAÇÃO PADRÃO DA COLETA PARTICIONADA ---
+DIR_SHARDS = "shards"
+PARTICOES = ('letra', 'hash')
+TOTAL_LETRAS = 26  # na partição por letra, cada shard precisa de pelo menos uma letra
+
+# --------------------------------------------------------------------------------
+# ATRIBUIÇÃO DE TRABALHO (o "coordenador" é determinístico: não há comunicação entre workers)
+# --------------------------------------------------------------------------------
+
+class Shard:
+    """
+    Fatia `indice` de `total` da coleta, para rodar em vários processos ou máquinas.
+
+    - particao 'letra': o shard recebe as letras ALFABETO[indice::total] e só baixa
+      as páginas de índice dessas letras (cada lutador aparece em uma única letra).
+    - particao 'hash': todos os shards leem as 26 páginas de índice, mas cada um fica
+      só com os lutadores cujo hash do ID cai na sua faixa (divisão mais equilibrada:
+      as letras têm tamanhos muito diferentes).
+    """
+
+    def __init__(self, indice, total, particao='letra'):
+        if total < 1 or not 0 <= indice < total:
+            raise ValueError(f"Shard inválido: {indice}/{total} (use I/N com 0 <= I < N).")
+        if particao not in PARTICOES:
+            raise ValueError(f"Partição desconhecida: '{particao}'. Opções: {', '.join(PARTICOES)}")
+        if particao == 'letra' and total > TOTAL_LETRAS:
+            raise ValueError(f"A partição por letra aceita no máximo {TOTAL_LETRAS} shards; use a partição 'hash'.")
+        self.indice = indice
+        self.total = total
+        self.particao = particao
+
+    @classmethod
+    def de_texto(cls, texto, particao='letra'):
+        """Interpreta 'I/N' (ex: '0/4')."""
+        encontrado = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', texto)
+        if not encontrado:
+            raise ValueError(f"Shard inválido: '{texto}' (use I/N, ex: 0/4).")
+        return cls(int(encontrado.group(1)), int(encontrado.group(2)), particao)
+
+    def __repr__(self):
+        return f"Shard({self.indice}/{self.total}, particao={self.particao!r})"
+
+    @property
+    def sufixo(self):
+        return f"shard-{self.indice}-de-{self.total}"
+
+    def letras(self, alfabeto):
+        """Letras cujas páginas de índice este shard baixa."""
+        return list(alfabeto[self.indice::self.total]) if self.particao == 'letra' else list(alfabeto)
+
+    def contem(self, url):
+        """True se o lutador da URL pertence a este shard."""
+        if self.particao == 'letra':
+            return True
+        # Faixa do hash: os 32 primeiros bits do SHA-1 do ID, divididos em `total` faixas iguais
+        valor = int(hashlib.sha1(id_lutador(url).encode('utf-8')).hexdigest()[:8], 16)
+        return valor * self.total >> 32 == self.indice
+
+    def caminho(self, diretorio, nome_arquivo):
+        """Arquivo de saída do shard: 'dados_ufc_brutos.csv' -> '<dir>/dados_ufc_brutos.shard-0-de-4.csv'."""
+        base, extensao = os.path.splitext(os.path.basename(nome_arquivo))
+        return os.path.join(diretorio, f"{base}.{self.sufixo}{extensao}")
+
+# --------------------------------------------------------------------------------
+# MESCLA DAS SAÍDAS PARCIAIS
+# --------------------------------------------------------------------------------
+
+def arquivos_de_shards(diretorio, nome_arquivo, total=None):
+    """
+    Saídas parciais de `nome_arquivo` em `diretorio`, ordenadas pelo índice do shard.
+    Com `total`, só as saídas de uma coleta em `total` shards são consideradas (as de
+    coletas anteriores com outro número de shards são ignoradas); sem ele, saídas de
+    coletas com números de shards diferentes geram ValueError.
+    Retorna (arquivos, total de shards, índices faltantes).
+    """
+    base, extensao = os.path.splitext(os.path.basename(nome_arquivo))
+    padrao = re.compile(re.escape(base) + r'\.shard-(\d+)-de-(\d+)' + re.escape(extensao) + '$')
+    encontrados = {}
+    for caminho in glob.glob(os.path.join(diretorio, f"{base}.shard-*{extensao}")):
+        casamento = padrao.search(os.path.basename(caminho))
+        if casamento and (total is None or int(casamento.group(2)) == total):
+            encontrados[(int(casamento.group(2)), int(casamento.group(1)))] = caminho
+
+    totais = {total for total, _ in encontrados}
+    if len(totais) > 1:
+        raise ValueError(f"Saídas de coletas com números de shards diferentes em '{diretorio}': {sorted(totais)}")
+    if not totais:
+        return [], 0, []
+    total = totais.pop()
+    faltantes = [indice for indice in range(total) if (total, indice) not in encontrados]
+    return [encontrados[chave] for chave in sorted(encontrados)], total, faltantes
+
+
+def _ler_em_lotes(arquivos):
+    for caminho in arquivos:
+        for lote in pd.read_csv(caminho, dtype=str, keep_default_na=False, chunksize=TAMANHO_LOTE):
+            yield lote
+
+
+def mesclar_shards(arquivos_lutadores, caminho_saida, arquivos_lutas=(), caminho_lutas=None):
+    """
+    Junta as saídas parciais dos shards, deduplicando os lutadores pela 'URL' e as lutas
+    pelo 'ID_Luta' (a versão com os detalhes da página da luta tem preferência).
+    A deduplicação passa por um checkpoint SQLite temporário, então nada é carregado
+    inteiro na memória. Retorna (lutadores, lutas) escritos.
+    """
+    caminho_temporario = caminho_saida + '.mescla.sqlite'
+    if os.path.exists(caminho_temporario):
+        os.remove(caminho_temporario)
+    checkpoint = CheckpointColeta(caminho_temporario)
+    try:
+        for lote in _ler_em_lotes(arquivos_lutadores):
+            for dados in lote.to_dict('records'):
+                if dados.get('URL'):
+                    checkpoint.salvar_lutador(dados['URL'], dados)
+
+        # Lutas detalhadas primeiro: a primeira versão gravada de cada 'ID_Luta' é mantida
+        for detalhadas in (True, False):
+            for lote in _ler_em_lotes(arquivos_lutas):
+                tem_detalhes = lote['Categoria'] != '' if 'Categoria' in lote.columns else pd.Series(False, index=lote.index)
+                checkpoint.salvar_lutas(lote[tem_detalhes == detalhadas].to_dict('records'))
+
+        total_lutadores = checkpoint.exportar_csv(caminho_saida + '.tmp')
+        os.replace(caminho_saida + '.tmp', caminho_saida)
+        total_lutas = 0
+        if caminho_lutas and arquivos_lutas:
+            total_lutas = checkpoint.exportar_lutas_csv(caminho_lutas + '.tmp')
+            os.replace(caminho_lutas + '.tmp', caminho_lutas)
+    finally:
+        checkpoint.descartar()
+    return total_lutadores, total_lutas
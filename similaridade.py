@@ -0,0 +1,147 @@
+import os
+
+import numpy as np
+
+# --- MATRIZ DE SIMILARIDADE (gerada pelo transform.py junto com o mart) ---
+ARQUIVO_MATRIZ = 'matriz_similaridade.npy'
+
+# Estatísticas que descrevem o estilo do lutador (colunas do mart)
+COLUNAS_SIMILARIDADE = ['SLpM', 'Str. Acc.', 'SApM', 'Str. Def', 'TD Avg.', 'TD Acc.', 'TD Def.', 'Sub. Avg.',
+                        'Reach', 'Height_in_inches']
+
+# --------------------------------------------------------------------------------
+# CONSTRUÇÃO DA MATRIZ (no transform)
+# --------------------------------------------------------------------------------
+
+def construir_matriz(df_limpo, colunas=COLUNAS_SIMILARIDADE):
+    """
+    Matriz float32 (linhas = linhas do mart, colunas = `colunas`) com cada estatística
+    padronizada (z-score), para que nenhuma domine a distância só pela escala.
+    Valores ausentes (ex: envergadura não informada) ficam em 0, a média da coluna,
+    e não aproximam nem afastam o lutador dos outros nessa dimensão.
+    """
+    valores = df_limpo[colunas].astype('float64').to_numpy()
+    media = np.nanmean(valores, axis=0)
+    desvio = np.nanstd(valores, axis=0)
+    media = np.where(np.isnan(media), 0.0, media)
+    desvio = np.where(np.isnan(desvio) | (desvio == 0), 1.0, desvio)
+    padronizada = (valores - media) / desvio
+    return np.nan_to_num(padronizada, nan=0.0).astype(np.float32)
+
+
+def construir_matriz_do_mart(caminho_mart, caminho=ARQUIVO_MATRIZ, colunas=COLUNAS_SIMILARIDADE, tamanho_lote=50_000):
+    """
+    Mesma matriz de construir_matriz, montada direto do Parquet do mart em duas passadas
+    por lotes: a média e o desvio de cada coluna são combinados lote a lote e depois as
+    linhas padronizadas são gravadas em um .npy mapeado em memória. Só um lote fica em
+    memória (a matriz vai direto para o disco). Retorna o número de linhas.
+    """
+    import pyarrow.parquet as pq
+
+    arquivo = pq.ParquetFile(caminho_mart)
+
+    def lotes():
+        for lote in arquivo.iter_batches(batch_size=tamanho_lote, columns=colunas):
+            yield lote.to_pandas()[colunas].astype('float64').to_numpy()
+
+    # 1ª passada: contagem, média e soma dos quadrados dos desvios (combinação de Chan)
+    contagem = np.zeros(len(colunas))
+    media = np.zeros(len(colunas))
+    m2 = np.zeros(len(colunas))
+    for valores in lotes():
+        presentes = ~np.isnan(valores)
+        n_lote = presentes.sum(axis=0)
+        soma_lote = np.where(presentes, valores, 0.0).sum(axis=0)
+        media_lote = np.divide(soma_lote, n_lote, out=np.zeros(len(colunas)), where=n_lote > 0)
+        m2_lote = (np.where(presentes, valores - media_lote, 0.0) ** 2).sum(axis=0)
+        total = contagem + n_lote
+        delta = media_lote - media
+        peso = np.divide(n_lote, total, out=np.zeros(len(colunas)), where=total > 0)
+        m2 = m2 + m2_lote + delta ** 2 * contagem * peso
+        media = media + delta * peso
+        contagem = total
+
+    desvio = np.sqrt(np.divide(m2, contagem, out=np.zeros(len(colunas)), where=contagem > 0))
+    desvio = np.where(desvio == 0, 1.0, desvio)
+
+    # 2ª passada: linhas padronizadas gravadas direto no arquivo
+    temporario = caminho + '.tmp'
+    matriz = np.lib.format.open_memmap(temporario, mode='w+', dtype=np.float32,
+                                       shape=(arquivo.metadata.num_rows, len(colunas)))
+    inicio = 0
+    for valores in lotes():
+        matriz[inicio:inicio + len(valores)] = np.nan_to_num((valores - media) / desvio, nan=0.0)
+        inicio += len(valores)
+    matriz.flush()
+    del matriz
+    os.replace(temporario, caminho)
+    return inicio
+
+
+def salvar_matriz(matriz, caminho=ARQUIVO_MATRIZ):
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as f:
+        np.save(f, matriz)
+    os.replace(temporario, caminho)
+
+
+def ler_matriz(caminho=ARQUIVO_MATRIZ):
+    """Matriz mapeada em memória (somente leitura; não é copiada para cada sessão)."""
+    return np.load(caminho, mmap_mode='r')
+
+# --------------------------------------------------------------------------------
+# CONSULTA DOS MAIS PARECIDOS (no dashboard)
+# --------------------------------------------------------------------------------
+
+# Candidatos extras re-ranqueados com a distância exata em cada consulta
+FOLGA_CANDIDATOS = 32
+
+class MotorSimilaridade:
+    """
+    Busca dos N lutadores mais próximos (distância euclidiana nas estatísticas padronizadas).
+
+    A norma de cada linha é calculada uma vez; cada consulta é um único produto
+    matriz-vetor (||x||² + ||v||² - 2·x·v) seguido de `argpartition`, sem ordenar o
+    elenco inteiro (só os melhores candidatos são re-ranqueados): O(linhas x colunas),
+    poucos milissegundos mesmo com centenas de milhares de lutadores, então não é
+    preciso um índice de vizinhos aproximado.
+    """
+
+    def __init__(self, matriz):
+        self.matriz = matriz
+        self.normas = np.einsum('ij,ij->i', matriz, matriz)
+
+    def __len__(self):
+        return len(self.matriz)
+
+    def distancias(self, linha):
+        """Distância da `linha` para todas as linhas do mart."""
+        vetor = self.matriz[linha]
+        quadrados = self.normas + self.normas[linha] - 2.0 * (self.matriz @ vetor)
+        return np.sqrt(np.maximum(quadrados, 0.0))
+
+    def mais_parecidos(self, linha, n=10, grupos=None):
+        """
+        Posições e distâncias dos `n` lutadores mais próximos da `linha` (ela mesma fica
+        de fora), do mais parecido para o menos. Com `grupos` (um valor por linha do mart,
+        ex: a categoria de peso), só entram os lutadores do mesmo grupo da `linha`.
+        """
+        distancias = self.distancias(linha)
+        distancias[linha] = np.inf
+        if grupos is not None:
+            grupos = np.asarray(grupos)
+            distancias[grupos != grupos[linha]] = np.inf
+
+        candidatos = int(np.isfinite(distancias).sum())
+        n = min(n, candidatos)
+        if n <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=distancias.dtype)
+
+        # A fórmula das normas perde precisão em float32 para vizinhos muito próximos:
+        # pré-seleciona alguns candidatos a mais e recalcula a distância exata só deles
+        pre_selecionados = min(candidatos, n + FOLGA_CANDIDATOS)
+        melhores = np.argpartition(distancias, pre_selecionados - 1)[:pre_selecionados]
+        diferencas = self.matriz[melhores] - self.matriz[linha]
+        exatas = np.sqrt(np.einsum('ij,ij->i', diferencas, diferencas))
+        ordem = np.lexsort((melhores, exatas))[:n]
+        return melhores[ordem], exatas[ordem]
@@ -0,0 +1,77 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+
+from parsers import CHAVE_LUTAS, obter_parser
+
+# --- CONFIGURAÇÃO PADRÃO DO SPOOL ---
+SPOOL_PADRAO = "spool_html"
+EXTENSAO = ".json.gz"
+# Chave (no dicionário do lutador) com o tempo de parsing medido no processo de parsing
+CHAVE_SEGUNDOS_PARSE = '_segundos_parse'
+
+# --------------------------------------------------------------------------------
+# SPOOL DE HTML BRUTO (saída da etapa de download, entrada da etapa de parsing)
+# --------------------------------------------------------------------------------
+
+class SpoolHTML:
+    """
+    Diretório com o HTML bruto de cada página de lutador, um arquivo por URL
+    (JSON comprimido com 'url' e 'html'). Desacopla o download (I/O, threads)
+    do parsing (CPU, processos) e permite re-derivar o dataset sem acessar a rede.
+    """
+
+    def __init__(self, diretorio=SPOOL_PADRAO):
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+
+    def caminho_para(self, url):
+        return os.path.join(self.diretorio, hashlib.sha1(url.encode('utf-8')).hexdigest() + EXTENSAO)
+
+    def salvar(self, url, html):
+        """Grava a página de forma atômica (arquivo temporário + rename) e retorna o caminho."""
+        caminho = self.caminho_para(url)
+        temporario = caminho + '.tmp'
+        with gzip.open(temporario, 'wt', encoding='utf-8', compresslevel=1) as f:
+            json.dump({'url': url, 'html': html}, f, ensure_ascii=False)
+        os.replace(temporario, caminho)
+        return caminho
+
+    def arquivos(self):
+        """Caminhos de todas as páginas do spool, em ordem estável."""
+        return sorted(
+            os.path.join(self.diretorio, nome) for nome in os.listdir(self.diretorio) if nome.endswith(EXTENSAO)
+        )
+
+
+def ler_pagina(caminho):
+    """Retorna (url, html) de um arquivo do spool."""
+    with gzip.open(caminho, 'rt', encoding='utf-8') as f:
+        pagina = json.load(f)
+    return pagina['url'], pagina['html']
+
+
+def parse_arquivo_spool(caminho, nome_parser=None, com_lutas=False):
+    """
+    Tarefa da etapa de parsing (executada em outro processo): lê uma página do spool
+    e devolve (url, stats_dict) no mesmo formato de extrair_stats_do_lutador_v2,
+    ou (url, None) se a página não pôde ser processada.
+    Com `com_lutas`, a tabela de lutas da página vai em stats_dict[CHAVE_LUTAS].
+    """
+    url = None
+    try:
+        url, html = ler_pagina(caminho)
+        parser = obter_parser(nome_parser)
+        inicio = time.perf_counter()
+        stats_dict = parser.parse_lutador(html)
+        stats_dict['URL'] = url
+        if com_lutas:
+            stats_dict[CHAVE_LUTAS] = parser.parse_lutas(html)
+        # Tempo de parsing para as métricas do processo principal (removido antes de gravar)
+        stats_dict[CHAVE_SEGUNDOS_PARSE] = time.perf_counter() - inicio
+        return url, stats_dict
+    except Exception as e:
+        print(f"Erro ao processar a página do spool {caminho}: {e}")
+        return url, None
@@ -0,0 +1,152 @@
+import hashlib
+import http.server
+import os
+import sys
+import threading
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from cache_http import CacheHTTP
+from checkpoint import CheckpointColeta
+from parsers import obter_parser
+from transporte import ClienteHTTP
+from webscraping import coletar_detalhes_concorrente
+
+DIR_LUTADORES = os.path.join(RAIZ, 'benchmarks', 'fixtures', 'lutador')
+
+
+class _Manipulador(http.server.BaseHTTPRequestHandler):
+    """Serve as páginas de `server.paginas` com ETag e responde 304 a requisições condicionais."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        corpo = self.server.paginas[self.path].encode('utf-8')
+        etag = '"' + hashlib.sha1(corpo).hexdigest() + '"'
+        self.server.requisicoes.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+
+@pytest.fixture
+def servidor():
+    servidor = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Manipulador)
+    servidor.paginas = {}
+    servidor.requisicoes = []
+    servidor.url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+class _ParserInstavel:
+    """Backend real que falha no parse_lutador enquanto `falhar` for True."""
+
+    def __init__(self):
+        self.base = obter_parser()
+        self.nome = self.base.nome
+        self.falhar = False
+        self.chamadas = 0
+
+    def parse_lutador(self, html):
+        self.chamadas += 1
+        if self.falhar:
+            raise ValueError("layout inesperado")
+        return self.base.parse_lutador(html)
+
+
+def _pagina_lutador():
+    nome = sorted(os.listdir(DIR_LUTADORES))[0]
+    with open(os.path.join(DIR_LUTADORES, nome), encoding='utf-8') as f:
+        return f.read()
+
+
+def _coletar(url, cache, caminho_checkpoint, parser, anterior=None):
+    """Uma execução da etapa de detalhes; retorna (linha do lutador no resultado, URLs com falha)."""
+    checkpoint = CheckpointColeta(caminho_checkpoint)
+    try:
+        if anterior is not None:
+            checkpoint.carregar_anteriores([anterior])
+        with ClienteHTTP(cache=cache) as cliente:
+            falhas = coletar_detalhes_concorrente([url], cliente, checkpoint, max_workers=1, parser=parser)
+            if not checkpoint.em_disco:
+                cliente.confirmar()
+        linhas = list(checkpoint.iterar_resultado())
+    finally:
+        checkpoint.descartar()
+    return (linhas[0] if linhas else None), falhas
+
+
+@pytest.mark.parametrize('em_disco', [True, False], ids=['checkpoint_em_disco', 'checkpoint_em_memoria'])
+def test_pagina_alterada_com_parse_falho_e_reprocessada(servidor, tmp_path, em_disco):
+    url = servidor.url + '/fighter-details/abc'
+    pagina = _pagina_lutador()
+    caminho_checkpoint = str(tmp_path / 'checkpoint.sqlite') if em_disco else ':memory:'
+    cache = CacheHTTP(str(tmp_path / 'cache.sqlite'))
+    parser = _ParserInstavel()
+
+    # 1ª execução: página nova, parse ok (vira o snapshot anterior)
+    servidor.paginas['/fighter-details/abc'] = pagina
+    anterior, falhas = _coletar(url, cache, caminho_checkpoint, parser)
+    assert falhas == [] and anterior['Nome']
+
+    # 2ª execução: a página mudou e o parse falha
+    servidor.paginas['/fighter-details/abc'] = pagina.replace(anterior['Nome'], 'Nome Alterado')
+    parser.falhar = True
+    linha, falhas = _coletar(url, cache, caminho_checkpoint, parser, anterior)
+    # O lutador que falhou continua com a linha anterior no resultado
+    assert falhas == [url] and linha['Nome'] == anterior['Nome']
+
+    # 3ª execução: a página precisa ser processada de novo, não devolvida do snapshot anterior
+    parser.falhar = False
+    chamadas = parser.chamadas
+    linha, falhas = _coletar(url, cache, caminho_checkpoint, parser, anterior)
+    assert falhas == []
+    assert parser.chamadas == chamadas + 1
+    assert linha['Nome'] == 'Nome Alterado'
+
+    # 4ª execução: agora sim a página conta como inalterada
+    linha, _ = _coletar(url, cache, caminho_checkpoint, parser, linha)
+    assert parser.chamadas == chamadas + 1
+    assert linha['Nome'] == 'Nome Alterado'
+    cache.fechar()
+
+
+def test_resposta_304_devolve_corpo_do_cache(servidor, tmp_path):
+    servidor.paginas['/p'] = '<html>pagina</html>'
+    cache = CacheHTTP(str(tmp_path / 'cache.sqlite'))
+    with ClienteHTTP(cache=cache) as cliente:
+        assert cliente.baixar(servidor.url + '/p') == ('<html>pagina</html>', True)
+        assert cliente.baixar(servidor.url + '/p') == ('<html>pagina</html>', False)
+        assert cliente.estatisticas()['cache_304'] == 1
+    assert servidor.requisicoes[0] is None and servidor.requisicoes[1] is not None
+    cache.fechar()
+
+
+def test_pagina_nao_confirmada_nao_usa_frescor_nem_requisicao_condicional(servidor, tmp_path):
+    servidor.paginas['/p'] = '<html>pagina</html>'
+    cache = CacheHTTP(str(tmp_path / 'cache.sqlite'))
+    with ClienteHTTP(cache=cache, frescor=3600) as cliente:
+        assert cliente.baixar(servidor.url + '/p', confirmar=False)[1] is True
+        cliente.descartar(servidor.url + '/p')
+        # Sem confirmação: nova requisição, sem If-None-Match, e a página ainda conta como alterada
+        assert cliente.baixar(servidor.url + '/p', confirmar=False)[1] is True
+        cliente.confirmar(servidor.url + '/p')
+        assert cliente.baixar(servidor.url + '/p') == ('<html>pagina</html>', False)
+        assert cliente.estatisticas()['cache_fresco'] == 1
+    assert servidor.requisicoes == [None, None]
+    cache.fechar()
@@ -0,0 +1,75 @@
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metricas import Histograma, MetricasColeta
+
+# Uma amostra do formato texto do Prometheus: nome{rotulo="valor",...} valor
+REGEX_AMOSTRA = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+REGEX_ROTULO = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"(?:,|$)')
+
+
+def _ler_amostras(texto):
+    amostras = []
+    for linha in texto.splitlines():
+        if not linha or linha.startswith('#'):
+            continue
+        encontrado = REGEX_AMOSTRA.match(linha)
+        assert encontrado, f"Linha fora do formato: {linha!r}"
+        nome, rotulos, valor = encontrado.groups()
+        pares = REGEX_ROTULO.findall(rotulos or '')
+        assert ','.join(f'{chave}="{texto}"' for chave, texto in pares) == (rotulos or ''), f"Rótulos inválidos: {linha!r}"
+        chaves = [chave for chave, _ in pares]
+        assert len(chaves) == len(set(chaves)), f"Rótulo repetido: {linha!r}"
+        float(valor)
+        amostras.append((nome, dict(pares), valor))
+    return amostras
+
+
+def test_prometheus_sem_rotulos_repetidos(tmp_path):
+    metricas = MetricasColeta()
+    metricas.observar('requisicao', 0.2)
+    metricas.observar('parse', 0.01, etapa='lutador')
+    metricas.contar('paginas', etapa='lutador')
+    metricas.contar('falhas', etapa='luta', tipo='parse "vazio"')
+    with metricas.etapa('lutador'):
+        pass
+
+    caminho = tmp_path / 'metricas.prom'
+    metricas.salvar_prometheus(str(caminho))
+    amostras = _ler_amostras(caminho.read_text(encoding='utf-8'))
+
+    soma_parse = [rotulos for nome, rotulos, _ in amostras
+                  if nome == 'ufc_scraper_latencia_segundos_sum' and rotulos.get('medida') == 'parse']
+    assert soma_parse == [{'medida': 'parse', 'etapa': 'lutador'}]
+    assert ('ufc_scraper_falhas_total', {'etapa': 'luta', 'tipo': 'parse \\"vazio\\"'}, '1') in amostras
+
+
+def test_quantil_interpola_dentro_do_balde():
+    histograma = Histograma(baldes=(1.0, 2.0, 4.0))
+    for valor in (0.5, 1.5, 1.5, 3.0):
+        histograma.observar(valor)
+    assert histograma.quantil(0.5) == pytest.approx(1.5)
+    assert histograma.quantil(0.25) == pytest.approx(1.0)
+    # Limitado pelo mínimo e pelo máximo observados
+    assert histograma.quantil(0.0) == 0.5
+    assert histograma.quantil(1.0) == 3.0
+    assert Histograma().quantil(0.5) is None
+
+
+def test_incorporar_soma_histogramas_dos_shards():
+    partes = [Histograma(baldes=(1.0, 2.0)) for _ in range(2)]
+    inteiro = Histograma(baldes=(1.0, 2.0))
+    for indice, valor in enumerate((0.2, 1.5, 3.0, 0.7, 1.1)):
+        partes[indice % 2].observar(valor)
+        inteiro.observar(valor)
+
+    mesclado = Histograma(baldes=(1.0, 2.0))
+    for parte in partes:
+        mesclado.incorporar(parte.resumo())
+    mesclado.incorporar(Histograma(baldes=(1.0, 2.0)).resumo())  # shard sem observações
+    assert mesclado.resumo() == pytest.approx(inteiro.resumo())
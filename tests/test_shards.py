@@ -0,0 +1,85 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint import CheckpointColeta
+from shards import Shard, arquivos_de_shards, mesclar_shards
+
+
+def _gravar(caminho, registros):
+    pd.DataFrame(registros).to_csv(caminho, index=False)
+    return str(caminho)
+
+
+def _luta(id_luta, categoria=''):
+    return {'ID_Luta': id_luta, 'URL_Luta': f'http://ufcstats.com/fight-details/{id_luta}', 'ID_1': 'a', 'ID_2': 'b',
+            'Resultado_1': 'win', 'Categoria': categoria}
+
+
+def test_mesclar_shards_deduplica_lutadores_e_prefere_luta_detalhada(tmp_path):
+    lutadores = [
+        _gravar(tmp_path / 'lutadores.shard-0-de-2.csv', [
+            {'URL': 'http://ufcstats.com/fighter-details/a', 'Nome': 'Lutador A'},
+            {'URL': 'http://ufcstats.com/fighter-details/b', 'Nome': 'Lutador B'},
+        ]),
+        _gravar(tmp_path / 'lutadores.shard-1-de-2.csv', [
+            {'URL': 'http://ufcstats.com/fighter-details/b', 'Nome': 'Lutador B'},
+            {'URL': 'http://ufcstats.com/fighter-details/c', 'Nome': 'Lutador C'},
+        ]),
+    ]
+    # A luta 'x' chega sem detalhes no shard 0 e detalhada no shard 1 (a ordem não importa)
+    lutas = [
+        _gravar(tmp_path / 'lutas.shard-0-de-2.csv', [_luta('x'), _luta('y', 'Lightweight Bout')]),
+        _gravar(tmp_path / 'lutas.shard-1-de-2.csv', [_luta('x', 'Welterweight Bout'), _luta('y')]),
+    ]
+
+    caminho_saida, caminho_lutas = str(tmp_path / 'saida.csv'), str(tmp_path / 'saida_lutas.csv')
+    assert mesclar_shards(lutadores, caminho_saida, lutas, caminho_lutas) == (3, 2)
+
+    saida = pd.read_csv(caminho_saida, dtype=str)
+    assert sorted(saida['Nome']) == ['Lutador A', 'Lutador B', 'Lutador C']
+    categorias = pd.read_csv(caminho_lutas, dtype=str).set_index('ID_Luta')['Categoria'].to_dict()
+    assert categorias == {'x': 'Welterweight Bout', 'y': 'Lightweight Bout'}
+    assert not os.path.exists(caminho_saida + '.mescla.sqlite')
+
+
+def test_arquivos_de_shards_filtra_pelo_total(tmp_path):
+    for nome in ('dados.shard-0-de-2.csv', 'dados.shard-1-de-2.csv', 'dados.shard-0-de-3.csv', 'outro.shard-0-de-2.csv'):
+        (tmp_path / nome).write_text('URL\n', encoding='utf-8')
+
+    arquivos, total, faltantes = arquivos_de_shards(str(tmp_path), 'dados.csv', total=2)
+    assert [os.path.basename(caminho) for caminho in arquivos] == ['dados.shard-0-de-2.csv', 'dados.shard-1-de-2.csv']
+    assert (total, faltantes) == (2, [])
+    assert arquivos_de_shards(str(tmp_path), 'dados.csv', total=3)[1:] == (3, [1, 2])
+    with pytest.raises(ValueError):
+        arquivos_de_shards(str(tmp_path), 'dados.csv')
+
+
+def test_particao_hash_divide_os_lutadores_sem_sobreposicao():
+    urls = [f'http://ufcstats.com/fighter-details/{indice:016x}' for indice in range(200)]
+    shards = [Shard(indice, 3, 'hash') for indice in range(3)]
+    donos = [[shard.indice for shard in shards if shard.contem(url)] for url in urls]
+    assert all(len(dono) == 1 for dono in donos)
+    assert {dono[0] for dono in donos} == {0, 1, 2}
+
+
+def test_checkpoint_retoma_so_os_pendentes(tmp_path):
+    caminho = str(tmp_path / 'checkpoint.sqlite')
+    checkpoint = CheckpointColeta(caminho)
+    checkpoint.registrar_fronteira(['u1', 'u2', 'u3'])
+    checkpoint.salvar_lutador('u1', {'URL': 'u1', 'Nome': 'Um'})
+    checkpoint.registrar_falha('u2')
+    checkpoint.fechar()
+
+    # Execução seguinte (ex: depois de uma queda): a fronteira não é refeita
+    checkpoint = CheckpointColeta(caminho)
+    assert checkpoint.fronteira_completa()
+    assert checkpoint.pendentes() == ['u2', 'u3']
+    assert checkpoint.urls_com_falha() == ['u2']
+    assert [linha['Nome'] for linha in checkpoint.iterar_resultado()] == ['Um']
+    checkpoint.descartar()
+    assert not os.path.exists(caminho)
@@ -0,0 +1,45 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import transform
+from categorias_peso import ARQUIVO_CATEGORIAS
+from indice_lutadores import ARQUIVO_INDICE
+from similaridade import ARQUIVO_MATRIZ, COLUNAS_SIMILARIDADE, construir_matriz
+
+# Lutadores do CSV bruto usados no teste (o suficiente para vários lotes pequenos)
+AMOSTRA = 400
+
+
+def _transformar(diretorio, fonte, tamanho_lote, monkeypatch):
+    """Roda a transformação completa em `diretorio` e devolve os artefatos gerados."""
+    diretorio.mkdir()
+    monkeypatch.chdir(diretorio)
+    total = transform.executar_transformacao(fonte, tamanho_lote)
+    with open(ARQUIVO_INDICE, encoding='utf-8') as f:
+        indice = json.load(f)
+    with open(ARQUIVO_CATEGORIAS, encoding='utf-8') as f:
+        particoes = json.load(f)
+    return total, transform.ler_mart(), indice, np.load(ARQUIVO_MATRIZ), particoes
+
+
+def test_transformacao_em_lotes_pequenos_igual_a_um_lote(tmp_path, monkeypatch):
+    fonte = str(tmp_path / 'brutos.csv')
+    pd.read_csv(os.path.join(RAIZ, 'dados_ufc_brutos.csv'), nrows=AMOSTRA).to_csv(fonte, index=False)
+
+    em_lotes = _transformar(tmp_path / 'lotes', fonte, 37, monkeypatch)
+    inteiro = _transformar(tmp_path / 'inteiro', fonte, transform.TAMANHO_LOTE, monkeypatch)
+
+    assert em_lotes[0] == inteiro[0] == AMOSTRA
+    pd.testing.assert_frame_equal(em_lotes[1], inteiro[1])
+    assert em_lotes[2] == inteiro[2]
+    np.testing.assert_allclose(em_lotes[3], inteiro[3], atol=1e-5)
+    assert em_lotes[4] == inteiro[4]
+    # A matriz montada por lotes é a mesma da versão em memória
+    np.testing.assert_allclose(em_lotes[3], construir_matriz(inteiro[1][COLUNAS_SIMILARIDADE]), atol=1e-5)
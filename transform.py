@@ -1,70 +1,489 @@
+import argparse
+import itertools
+import os
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from categorias_peso import ARQUIVO_CATEGORIAS, COLUNAS_AGREGADAS, ORDENACAO, categoria_de_peso, construir_particoes, salvar_particoes
+from indice_lutadores import ARQUIVO_INDICE, construir_indice, id_lutador, salvar_indice
+from percentis import COLUNAS_PERCENTIL, COLUNAS_PERCENTIS_MART, GRUPOS_PERCENTIL, calcular_percentis
+from similaridade import ARQUIVO_MATRIZ, construir_matriz_do_mart
+
+# --- PADRÕES DE EXTRAÇÃO (aplicados de uma vez à coluna inteira, sem loop por linha) ---
+# Número (inteiro ou decimal) dentro de textos como '50%', '155 lbs.' ou '74"'
+REGEX_NUMERO = r'(\d+(?:\.\d+)?)'
+# Altura em pés e polegadas, ex: 5' 7"
+REGEX_ALTURA = r"(?P<pes>\d+)'\s*(?P<polegadas>\d+(?:\.\d+)?)"
+# Recorde W-L-D com No Contests opcionais, ex: 17-2-0 (1 NC)
+REGEX_RECORDE = r'^\s*(?P<Wins>\d+)-(?P<Losses>\d+)-(?P<Draws>\d+)(?:\s*\((?P<NC>\d+)\s*NC\))?'
+# Data de nascimento, ex: May 25, 1977 (também usada nas datas das lutas, ex: Apr. 13, 2024, sem o ponto)
+FORMATO_DOB = '%b %d, %Y'
+# Tempo no formato M:SS, ex: 3:27 (tempo da luta e tempo de controle)
+REGEX_TEMPO = r'^\s*(?P<minutos>\d+):(?P<segundos>\d{2})'
+# Golpes acertados / tentados, ex: 45 of 98
+REGEX_TENTATIVAS = r'(?P<acertos>\d+)\s+of\s+(?P<tentativas>\d+)'
+
+PERCENTUAL_COLS = ['Str. Acc.', 'Str. Def', 'TD Acc.', 'TD Def.']
+NUMERIC_COLS = ['SLpM', 'SApM', 'TD Avg.', 'Sub. Avg.']
+
+# Colunas por lado (_1 / _2) da tabela de lutas
+CONTAGEM_LUTA_COLS = ['KD', 'Str', 'Td', 'Sub', 'Rev']
+TENTATIVAS_LUTA_COLS = ['Sig_Str', 'Total_Str']
+
+# --- DATA MART (Parquet) ---
+ARQUIVO_MART = 'dados_ufc_limpos.parquet'
+# Cópia Arrow IPC (Feather v2) sem compressão, mapeada em memória pelo dashboard (dados.py)
+ARQUIVO_ARROW = 'dados_ufc_limpos.arrow'
+
+# Esquema explícito do mart: categorias com dicionário, estatísticas em float32,
+# contagens do recorde em int16 e percentis em uint8 (colunas ausentes no DataFrame são ignoradas)
+ESQUEMA_MART = pa.schema([
+    ('Nome', pa.string()),
+    ('URL', pa.string()),
+    ('ID', pa.string()),
+    ('Weight', pa.float32()),
+    ('Categoria_Peso', pa.dictionary(pa.int8(), pa.string())),
+    ('Reach', pa.float32()),
+    ('Height_in_inches', pa.float32()),
+    ('STANCE', pa.dictionary(pa.int8(), pa.string())),
+    ('DOB', pa.timestamp('s')),
+    ('SLpM', pa.float32()),
+    ('Str. Acc.', pa.float32()),
+    ('SApM', pa.float32()),
+    ('Str. Def', pa.float32()),
+    ('TD Avg.', pa.float32()),
+    ('TD Acc.', pa.float32()),
+    ('TD Def.', pa.float32()),
+    ('Sub. Avg.', pa.float32()),
+    ('Wins', pa.int16()),
+    ('Losses', pa.int16()),
+    ('Draws', pa.int16()),
+    ('NC', pa.int16()),
+] + [(coluna, pa.uint8()) for coluna in COLUNAS_PERCENTIS_MART])
+
+# --- TABELA DE LUTAS (uma linha por luta, chave 'ID_Luta'; lado 1 = lutador de menor ID) ---
+ARQUIVO_MART_LUTAS = 'dados_ufc_lutas.parquet'
+
+ESQUEMA_LUTAS = pa.schema(
+    [
+        ('ID_Luta', pa.string()),
+        ('URL_Luta', pa.string()),
+        ('Data', pa.timestamp('s')),
+        ('Evento', pa.string()),
+        ('URL_Evento', pa.string()),
+        ('Lutador_1', pa.string()),
+        ('ID_1', pa.string()),
+        ('Lutador_2', pa.string()),
+        ('ID_2', pa.string()),
+        ('Resultado_1', pa.dictionary(pa.int8(), pa.string())),
+        ('Vencedor_ID', pa.string()),
+        ('Metodo', pa.dictionary(pa.int8(), pa.string())),
+        ('Detalhe_Metodo', pa.string()),
+        ('Categoria', pa.dictionary(pa.int16(), pa.string())),
+        ('Formato', pa.dictionary(pa.int16(), pa.string())),
+        ('Arbitro', pa.string()),
+        ('Round', pa.int8()),
+        ('Tempo_Segundos', pa.int16()),
+    ]
+    + [(f'{col}_{lado}', pa.int16()) for col in CONTAGEM_LUTA_COLS for lado in (1, 2)]
+    + [(f'{col}{sufixo}_{lado}', pa.int16()) for col in TENTATIVAS_LUTA_COLS for sufixo in ('', '_Tentativas') for lado in (1, 2)]
+    + [(f'Ctrl_Segundos_{lado}', pa.int16()) for lado in (1, 2)]
+)
+
+
+def _converter_distintos(serie, conversor):
+    """
+    Aplica o conversor (vetorizado) só aos valores distintos da coluna e espalha o
+    resultado de volta pelos códigos do pd.factorize. As colunas do UFCStats têm
+    poucos valores distintos (alturas, pesos, recordes...), então cada texto é
+    interpretado uma única vez, não importa quantas linhas o repitam.
+    """
+    codigos, distintos = pd.factorize(serie)
+    convertido = conversor(pd.Series(distintos, dtype='string'))
+    # Código -1 (valor ausente) não existe no índice e vira NaN no reindex
+    resultado = convertido.reindex(codigos)
+    resultado.index = serie.index
+    return resultado
+
+
+def _extrair_numero(serie):
+    """Extrai o primeiro número de cada texto da coluna (valores como '--' viram NaN)."""
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype('float64')
+    return _converter_distintos(
+        serie, lambda distintos: pd.to_numeric(distintos.str.extract(REGEX_NUMERO, expand=False), errors='coerce')
+    ).astype('float64')
+
+
+def _converter_altura(distintos):
+    altura = distintos.str.extract(REGEX_ALTURA)
+    return pd.to_numeric(altura['pes'], errors='coerce') * 12 + pd.to_numeric(altura['polegadas'], errors='coerce')
+
+
+def _converter_recorde(distintos):
+    recorde = distintos.str.extract(REGEX_RECORDE)
+    # Recordes válidos sem '(N NC)' têm 0 No Contests
+    recorde['NC'] = recorde['NC'].mask(recorde['Wins'].notna() & recorde['NC'].isna(), '0')
+    return recorde.apply(pd.to_numeric, errors='coerce')
+
 
 def transformar_dados_ufc(df):
     """
     Limpa e transforma colunas do DataFrame para formatos numéricos utilizáveis.
+    Todas as conversões são vetorizadas: uma operação str.extract por coluna,
+    aplicada aos valores distintos (veja _converter_distintos).
     """
-    df_clean = df.copy()
+    df_clean = df.drop(columns=['Height', 'Recorde'])
 
     # --- 1. Limpeza de Percentuais (Str. Acc., Str. Def, TD Acc., TD Def.) ---
-    percentual_cols = ['Str. Acc.', 'Str. Def', 'TD Acc.', 'TD Def.']
-    for col in percentual_cols:
-        # Remove o símbolo de % e converte para float (ex: '50%' -> 0.50)
-        df_clean[col] = df_clean[col].astype(str).str.replace('%', '', regex=False).str.strip()
-        df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce') / 100.0
-
-    # --- 2. Limpeza de Peso (Weight) ---
-    # Remove ' lbs.' e converte para float. Você pode converter para KG aqui também,
-    # mas manteremos em libras por enquanto para simplicidade.
-    df_clean['Weight'] = df_clean['Weight'].astype(str).str.replace(' lbs.', '', regex=False).str.strip()
-    df_clean['Weight'] = pd.to_numeric(df_clean['Weight'], errors='coerce')
-
-    # --- 3. Limpeza de Alcance (Reach) ---
-    # Remove aspas (") e converte para numérico
-    df_clean['Reach'] = df_clean['Reach'].astype(str).str.replace('"', '', regex=False).str.strip()
-    df_clean['Reach'] = pd.to_numeric(df_clean['Reach'], errors='coerce')
-
-    # --- 4. Limpeza e Conversão de Altura (Height) ---
-    # Conversão de pés e polegadas (ex: 5' 7") para polegadas totais.
-    def converter_altura(altura_str):
-        if pd.isna(altura_str) or 'N/A' in altura_str or 'None' in altura_str:
-            return None
-        
-        try:
-            # Separa os pés (') e as polegadas (")
-            partes = altura_str.replace('"', '').split("'")
-            feet = float(partes[0].strip())
-            inches = float(partes[1].strip())
-            # 1 pé = 12 polegadas
-            total_inches = (feet * 12) + inches
-            return total_inches
-        except:
-            return None
-
-    df_clean['Height_in_inches'] = df_clean['Height'].apply(converter_altura)
-    # Remove a coluna original 'Height' após a conversão
-    df_clean = df_clean.drop(columns=['Height'])
-
-    # --- 5. Conversão de Recorde (Recorde) ---
-    # Cria colunas separadas para vitórias, derrotas e empates
-    df_clean[['Wins', 'Losses', 'Draws']] = df_clean['Recorde'].str.split('-', expand=True).fillna(0)
-    df_clean['Wins'] = pd.to_numeric(df_clean['Wins'], errors='coerce')
-    df_clean['Losses'] = pd.to_numeric(df_clean['Losses'], errors='coerce')
-    df_clean['Draws'] = pd.to_numeric(df_clean['Draws'], errors='coerce')
-    df_clean = df_clean.drop(columns=['Recorde']) # Remove a coluna original
-
-    # Converte outras colunas SLpM, SApM, TD Avg., Sub. Avg. para numérico
-    numeric_cols_to_convert = ['SLpM', 'SApM', 'TD Avg.', 'Sub. Avg.']
-    for col in numeric_cols_to_convert:
-        df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+    # Converte para fração (ex: '50%' -> 0.50)
+    for col in PERCENTUAL_COLS:
+        df_clean[col] = _extrair_numero(df[col]) / 100.0
+
+    # --- 2. Limpeza de Peso (Weight) e Alcance (Reach) ---
+    # '155 lbs.' -> 155.0 (libras) e '74"' -> 74.0 (polegadas)
+    df_clean['Weight'] = _extrair_numero(df['Weight'])
+    df_clean['Reach'] = _extrair_numero(df['Reach'])
+
+    # --- 3. Data de Nascimento (DOB) ---
+    df_clean['DOB'] = _converter_distintos(
+        df['DOB'], lambda distintos: pd.to_datetime(distintos, format=FORMATO_DOB, errors='coerce')
+    )
+
+    # --- 4. Outras colunas numéricas (SLpM, SApM, TD Avg., Sub. Avg.) ---
+    for col in NUMERIC_COLS:
+        df_clean[col] = pd.to_numeric(df[col], errors='coerce')
+
+    # --- 5. Conversão de Altura (Height) ---
+    # Pés e polegadas (ex: 5' 7") para polegadas totais (1 pé = 12 polegadas)
+    df_clean['Height_in_inches'] = _converter_distintos(df['Height'], _converter_altura).astype('float64')
+
+    # --- 6. Conversão de Recorde (Recorde) ---
+    # Vitórias, derrotas, empates e No Contests (NC) em colunas separadas
+    # Inteiros com suporte a ausentes: o tipo não depende de o lote ter recordes inválidos
+    recorde = _converter_distintos(df['Recorde'], _converter_recorde)
+    for col in ['Wins', 'Losses', 'Draws', 'NC']:
+        df_clean[col] = recorde[col].astype('Int64')
+
+    # --- 7. ID estável do lutador (último segmento da URL de detalhes) ---
+    df_clean['ID'] = _calcular_ids(df)
+
+    # --- 8. Categoria de peso (faixa: a mais leve cujo limite comporta o peso) ---
+    df_clean['Categoria_Peso'] = categoria_de_peso(df_clean['Weight'])
+
+    return df_clean
+
+
+def _converter_tempo(distintos):
+    tempo = distintos.str.extract(REGEX_TEMPO)
+    return pd.to_numeric(tempo['minutos'], errors='coerce') * 60 + pd.to_numeric(tempo['segundos'], errors='coerce')
+
+
+def _converter_tentativas(distintos):
+    return distintos.str.extract(REGEX_TENTATIVAS).apply(pd.to_numeric, errors='coerce')
+
+
+def transformar_lutas(df):
+    """
+    Limpa a tabela de lutas bruta (dados_ufc_lutas_brutos.csv) com as mesmas conversões
+    vetorizadas dos lutadores: datas, tempos em segundos, contagens inteiras e golpes
+    'X of Y' separados em acertos e tentativas. Colunas da página de detalhes da luta
+    (Categoria, Sig_Str, Ctrl...) são opcionais.
+    """
+    df_clean = df.drop(columns=[col for col in ['Tempo'] + [f'Ctrl_{lado}' for lado in (1, 2)] if col in df.columns])
+
+    # --- 1. Data da luta ('Apr. 13, 2024') ---
+    df_clean['Data'] = _converter_distintos(
+        df['Data'], lambda distintos: pd.to_datetime(distintos.str.replace('.', '', regex=False), format=FORMATO_DOB, errors='coerce')
+    )
+
+    # --- 2. Round e tempo de encerramento (M:SS -> segundos) ---
+    df_clean['Round'] = pd.to_numeric(df['Round'], errors='coerce').astype('Int8')
+    df_clean['Tempo_Segundos'] = _converter_distintos(df['Tempo'], _converter_tempo).astype('Int16')
+
+    # --- 3. Estatísticas de cada lado ---
+    for lado in (1, 2):
+        for col in CONTAGEM_LUTA_COLS:
+            if f'{col}_{lado}' in df.columns:
+                df_clean[f'{col}_{lado}'] = pd.to_numeric(df[f'{col}_{lado}'], errors='coerce').astype('Int16')
+        for col in TENTATIVAS_LUTA_COLS:
+            if f'{col}_{lado}' in df.columns:
+                golpes = _converter_distintos(df[f'{col}_{lado}'], _converter_tentativas)
+                df_clean[f'{col}_{lado}'] = golpes['acertos'].astype('Int16')
+                df_clean[f'{col}_Tentativas_{lado}'] = golpes['tentativas'].astype('Int16')
+        if f'Ctrl_{lado}' in df.columns:
+            df_clean[f'Ctrl_Segundos_{lado}'] = _converter_distintos(df[f'Ctrl_{lado}'], _converter_tempo).astype('Int16')
+
+    # --- 4. Vencedor (empates e No Contests ficam sem vencedor) ---
+    resultado = df['Resultado_1'].str.lower()
+    df_clean['Vencedor_ID'] = df['ID_1'].where(resultado == 'win', df['ID_2'].where(resultado == 'loss'))
 
     return df_clean
 
+
+def _calcular_ids(df):
+    """IDs a partir da coluna URL; linhas sem URL (snapshots antigos) usam um hash de Nome/DOB/Height."""
+    if 'URL' in df.columns:
+        ids = df['URL'].astype('string').str.rstrip('/').str.rsplit('/', n=1).str[-1].astype(object)
+    else:
+        ids = pd.Series(None, index=df.index, dtype=object)
+
+    sem_url = ids.isna() | (ids == '')
+    if sem_url.any():
+        campos = df.loc[sem_url, ['Nome', 'DOB', 'Height']].fillna('').astype(str)
+        chaves = campos['Nome'] + '|' + campos['DOB'] + '|' + campos['Height']
+        ids.loc[sem_url] = _converter_distintos(chaves, lambda distintos: distintos.map(lambda chave: id_lutador(None, chave)))
+    return ids.astype(str)
+
+
+def _tabela_mart(df_limpo, esquema_mart=ESQUEMA_MART):
+    """Converte o DataFrame limpo em uma tabela Arrow com o esquema do mart (ESQUEMA_MART por padrão)."""
+    campos = [campo for campo in esquema_mart if campo.name in df_limpo.columns]
+    extras = [col for col in df_limpo.columns if col not in esquema_mart.names]
+    esquema = pa.schema(campos + [pa.field(col, _tipo_extra(df_limpo[col])) for col in extras])
+    return pa.Table.from_pandas(df_limpo[esquema.names], schema=esquema, preserve_index=False)
+
+
+def _tipo_extra(serie):
+    # Coluna toda vazia (comum em um lote pequeno) vira texto, para os próximos lotes caberem no mesmo esquema
+    tipo = pa.Array.from_pandas(serie).type
+    return pa.string() if pa.types.is_null(tipo) else tipo
+
+# --------------------------------------------------------------------------------
+# PROCESSAMENTO EM LOTES (memória limitada, qualquer tamanho de entrada)
+# --------------------------------------------------------------------------------
+
+# Linhas por lote. O elenco atual (~4,5 mil lutadores) cabe em um lote, então o Arrow
+# do dashboard continua com um único bloco por coluna (mapeado sem cópia, veja dados.py);
+# os lotes só se dividem em entradas maiores ou com --tamanho-lote menor.
+TAMANHO_LOTE = 50_000
+
+# Colunas do CSV bruto usadas pelo transformar_dados_ufc (ausentes em um lote viram NaN)
+COLUNAS_BRUTAS = ['Nome', 'Height', 'Weight', 'Reach', 'STANCE', 'DOB', 'Recorde'] + PERCENTUAL_COLS + NUMERIC_COLS
+COLUNAS_LUTAS_BRUTAS = ['ID_1', 'ID_2', 'Resultado_1', 'Data', 'Round', 'Tempo']
+TIPOS_LUTAS_BRUTAS = {'ID_Luta': str, 'ID_1': str, 'ID_2': str}
+
+
+def ler_em_lotes(fonte, tamanho_lote=TAMANHO_LOTE, colunas=COLUNAS_BRUTAS, tipos=None):
+    """
+    Gera DataFrames brutos de até `tamanho_lote` linhas a partir de:
+    - o caminho de um CSV (lido em pedaços, sem carregar o arquivo inteiro);
+    - um DataFrame;
+    - um iterável de dicionários, ex: CheckpointColeta.iterar_resultado() direto do scraper.
+    """
+    if isinstance(fonte, (str, os.PathLike)):
+        lotes = pd.read_csv(fonte, chunksize=tamanho_lote, dtype=tipos)
+    elif isinstance(fonte, pd.DataFrame):
+        lotes = (fonte.iloc[inicio:inicio + tamanho_lote] for inicio in range(0, len(fonte), tamanho_lote))
+    else:
+        registros = iter(fonte)
+        lotes = (pd.DataFrame(lote) for lote in iter(lambda: list(itertools.islice(registros, tamanho_lote)), []))
+
+    for lote in lotes:
+        faltantes = [col for col in colunas if col not in lote.columns]
+        yield lote.assign(**dict.fromkeys(faltantes, None)) if faltantes else lote
+
+
+def transformar_em_lotes(fonte, transformar=transformar_dados_ufc, tamanho_lote=TAMANHO_LOTE, colunas=COLUNAS_BRUTAS,
+                         tipos=None):
+    """Estágio de streaming: aplica `transformar` a cada lote de ler_em_lotes e gera os lotes limpos."""
+    for lote in ler_em_lotes(fonte, tamanho_lote, colunas, tipos):
+        yield transformar(lote)
+
+
+class EscritorMart:
+    """
+    Grava o mart lote a lote, sem manter o dataset inteiro na memória:
+    - Parquet comprimido (zstd), um row group por lote;
+    - Arrow IPC sem compressão (mapeável em memória), um record batch por lote;
+    - CSV legível (opcional).
+    O esquema é fixado no primeiro lote (esquema_mart + colunas extras); os lotes seguintes
+    são ajustados a ele. As categorias (colunas com dicionário) só crescem, então o Arrow
+    grava apenas os valores novos de cada lote (dictionary deltas).
+    Os arquivos finais só substituem os antigos em fechar() (troca atômica); se der erro
+    no meio, os antigos ficam intactos.
+    """
+
+    def __init__(self, caminho_parquet=None, caminho_arrow=None, caminho_csv=None, esquema_mart=ESQUEMA_MART):
+        self.caminhos = [caminho for caminho in (caminho_parquet, caminho_arrow, caminho_csv) if caminho]
+        self.caminho_parquet = caminho_parquet
+        self.caminho_arrow = caminho_arrow
+        self.caminho_csv = caminho_csv
+        self.esquema_mart = esquema_mart
+        self.esquema = None
+        self.linhas = 0
+        self._colunas = None
+        self._categorias = {}
+        self._parquet = self._arrow = self._csv = None
+
+    def _abrir(self, esquema):
+        self.esquema = esquema
+        if self.caminho_parquet:
+            self._parquet = pq.ParquetWriter(self.caminho_parquet + '.tmp', esquema, compression='zstd')
+        if self.caminho_arrow:
+            opcoes = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._arrow = pa.ipc.new_file(self.caminho_arrow + '.tmp', esquema, options=opcoes)
+        if self.caminho_csv:
+            self._csv = open(self.caminho_csv + '.tmp', 'w', encoding='utf-8', newline='')
+
+    def _categorizar(self, df_limpo):
+        """Converte as colunas com dicionário em categorias acumuladas (a ordem das já vistas não muda)."""
+        ajustes = {}
+        for campo in self.esquema_mart:
+            if pa.types.is_dictionary(campo.type) and campo.name in df_limpo.columns:
+                categorias = self._categorias.setdefault(campo.name, {})
+                valores = df_limpo[campo.name].astype(object)
+                categorias.update(dict.fromkeys(v for v in valores.dropna().unique() if v not in categorias))
+                ajustes[campo.name] = pd.Categorical(valores, categories=list(categorias))
+        return df_limpo.assign(**ajustes) if ajustes else df_limpo
+
+    def escrever(self, df_limpo):
+        """Acrescenta um lote limpo aos arquivos do mart."""
+        if self.esquema is not None:
+            df_limpo = df_limpo.reindex(columns=self._colunas)
+        tabela = _tabela_mart(self._categorizar(df_limpo), self.esquema or self.esquema_mart)
+        if self.esquema is None:
+            self._colunas = list(df_limpo.columns)
+            self._abrir(tabela.schema)
+
+        # Metadados do pandas do primeiro lote valem para todos (os tipos são os mesmos)
+        tabela = tabela.replace_schema_metadata(self.esquema.metadata)
+        if self._parquet is not None:
+            self._parquet.write_table(tabela)
+        if self._arrow is not None:
+            self._arrow.write_table(tabela)
+        if self._csv is not None:
+            df_limpo.to_csv(self._csv, index=False, header=self.linhas == 0)
+        self.linhas += len(df_limpo)
+
+    def _fechar_arquivos(self):
+        for escritor in (self._parquet, self._arrow, self._csv):
+            if escritor is not None:
+                escritor.close()
+
+    def fechar(self):
+        """Finaliza os arquivos e troca os antigos pelos novos. Retorna o número de linhas gravadas."""
+        if self.esquema is None:
+            # Entrada vazia: grava os arquivos só com o cabeçalho/esquema
+            self._abrir(self.esquema_mart)
+            if self._csv is not None:
+                self._csv.write(','.join(self.esquema_mart.names) + '\n')
+        self._fechar_arquivos()
+        for caminho in self.caminhos:
+            os.replace(caminho + '.tmp', caminho)
+        return self.linhas
+
+    def descartar(self):
+        """Fecha e apaga os arquivos temporários, mantendo os arquivos anteriores."""
+        self._fechar_arquivos()
+        for caminho in self.caminhos:
+            if os.path.exists(caminho + '.tmp'):
+                os.remove(caminho + '.tmp')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, *_):
+        if tipo_erro is None:
+            self.fechar()
+        else:
+            self.descartar()
+
+
+def salvar_mart(df_limpo, caminho=ARQUIVO_MART, esquema_mart=ESQUEMA_MART):
+    """
+    Grava o DataFrame limpo como Parquet comprimido (zstd) com o esquema do mart
+    (ESQUEMA_MART, ou ESQUEMA_LUTAS para a tabela de lutas).
+    Colunas fora do esquema mantêm o tipo inferido pelo pyarrow.
+    """
+    with EscritorMart(caminho_parquet=caminho, esquema_mart=esquema_mart) as escritor:
+        escritor.escrever(df_limpo)
+
+
+def salvar_mart_arrow(df_limpo, caminho=ARQUIVO_ARROW):
+    """
+    Grava o mesmo mart em Arrow IPC sem compressão, formato que pode ser mapeado em
+    memória (zero-copy). A troca é atômica: quem já mapeou o arquivo antigo continua
+    lendo a versão anterior até recarregar.
+    """
+    with EscritorMart(caminho_arrow=caminho) as escritor:
+        escritor.escrever(df_limpo)
+
+
+def ler_mart(caminho=ARQUIVO_MART, colunas=None):
+    """Lê o mart (apenas as `colunas` pedidas, se informadas) como DataFrame."""
+    return pq.read_table(caminho, columns=colunas).to_pandas()
+
+
+def executar_transformacao(fonte='dados_ufc_brutos.csv', tamanho_lote=TAMANHO_LOTE, caminho_csv='dados_ufc_limpos.csv'):
+    """
+    Transformação completa em streaming: `fonte` (CSV bruto, DataFrame ou iterável de
+    dicionários) é lida e transformada lote a lote e cada lote é acrescentado ao Parquet,
+    ao Arrow e ao CSV limpo. A leitura e a limpeza usam memória limitada por `tamanho_lote`.
+
+    Os percentis dependem do elenco inteiro, então são duas passadas: os lotes limpos vão
+    para um Parquet de etapa, os percentis são calculados lendo só as colunas necessárias
+    e a segunda passada relê a etapa lote a lote, acrescentando as colunas de percentil.
+    A matriz de similaridade também é montada em duas passadas por lotes, direto para
+    um .npy mapeado em memória (veja similaridade.py).
+
+    Não são limitados por `tamanho_lote`: os percentis (exatos, precisam das colunas
+    ranqueadas inteiras), o índice de nomes e as partições por categoria de peso, cujas
+    saídas já têm uma entrada por lutador. Essas etapas leem só as poucas colunas de que
+    precisam, então a memória cresce com o número de lutadores, não com a largura do mart.
+    Retorna o número de lutadores gravados.
+    """
+    caminho_etapa = ARQUIVO_MART + '.etapa'
+    try:
+        with EscritorMart(caminho_etapa) as escritor:
+            for lote_limpo in transformar_em_lotes(fonte, tamanho_lote=tamanho_lote):
+                escritor.escrever(lote_limpo)
+        percentis = calcular_percentis(ler_mart(caminho_etapa, _colunas_existentes(
+            caminho_etapa, COLUNAS_PERCENTIL + [grupo for grupo in GRUPOS_PERCENTIL if grupo])))
+
+        with EscritorMart(ARQUIVO_MART, ARQUIVO_ARROW, caminho_csv) as escritor:
+            for lote in pq.ParquetFile(caminho_etapa).iter_batches(batch_size=tamanho_lote):
+                lote_limpo = lote.to_pandas()
+                inicio = escritor.linhas
+                escritor.escrever(lote_limpo.join(percentis.iloc[inicio:inicio + len(lote_limpo)].set_axis(lote_limpo.index)))
+    finally:
+        if os.path.exists(caminho_etapa):
+            os.remove(caminho_etapa)
+
+    salvar_indice(construir_indice(ler_mart(ARQUIVO_MART, ['Nome', 'ID', 'Weight'])), ARQUIVO_INDICE)
+    construir_matriz_do_mart(ARQUIVO_MART, ARQUIVO_MATRIZ, tamanho_lote=tamanho_lote)
+    colunas_particoes = list(dict.fromkeys(['Categoria_Peso'] + ORDENACAO + COLUNAS_AGREGADAS))
+    salvar_particoes(construir_particoes(ler_mart(ARQUIVO_MART, colunas_particoes)), ARQUIVO_CATEGORIAS)
+    return escritor.linhas
+
+
+def _colunas_existentes(caminho, colunas):
+    nomes = set(pq.read_schema(caminho).names)
+    return [coluna for coluna in colunas if coluna in nomes]
+
+
+def executar_transformacao_lutas(fonte='dados_ufc_lutas_brutos.csv', tamanho_lote=TAMANHO_LOTE):
+    """Mesma transformação em streaming para a tabela de lutas. Retorna o número de lutas gravadas."""
+    with EscritorMart(ARQUIVO_MART_LUTAS, esquema_mart=ESQUEMA_LUTAS) as escritor:
+        for lote_limpo in transformar_em_lotes(fonte, transformar_lutas, tamanho_lote, COLUNAS_LUTAS_BRUTAS, TIPOS_LUTAS_BRUTAS):
+            escritor.escrever(lote_limpo)
+    return escritor.linhas
+
 # --- Execução da Transformação ---
-# Assumindo que você carregou o CSV
-df_bruto = pd.read_csv('dados_ufc_brutos.csv') 
-df_limpo = transformar_dados_ufc(df_bruto)
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Limpa os dados brutos e gera o data mart.")
+    argumentos.add_argument("--tamanho-lote", type=int, default=TAMANHO_LOTE, help="Linhas processadas por lote.")
+    args = argumentos.parse_args()
+
+    # Salva a versão limpa (Data Mart tipado + CSV legível), lote a lote
+    total = executar_transformacao('dados_ufc_brutos.csv', args.tamanho_lote)
+    print(f"Dados limpos e transformados ({total} lutadores) salvos em '{ARQUIVO_MART}', '{ARQUIVO_ARROW}' e 'dados_ufc_limpos.csv'.")
+    print(f"Índice de nomes salvo em '{ARQUIVO_INDICE}' e matriz de similaridade em '{ARQUIVO_MATRIZ}'.")
+    print(f"Partições por categoria de peso salvas em '{ARQUIVO_CATEGORIAS}'.")
 
-# Salva a versão limpa (Data Mart)
-df_limpo.to_csv('dados_ufc_limpos.csv', index=False)
-print("Dados limpos e transformados salvos em 'dados_ufc_limpos.csv'.")
\ No newline at end of file
+    # Tabela de lutas (gerada pelo webscraping.py --lutas)
+    if os.path.exists('dados_ufc_lutas_brutos.csv'):
+        total_lutas = executar_transformacao_lutas('dados_ufc_lutas_brutos.csv', args.tamanho_lote)
+        print(f"Tabela de lutas ({total_lutas} lutas) salva em '{ARQUIVO_MART_LUTAS}'.")
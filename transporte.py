@@ -0,0 +1,373 @@
+import contextlib
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from cache_http import calcular_hash
+from metricas import MetricasColeta
+
+# --- CONFIGURAÇÃO PADRÃO DO TRANSPORTE ---
+TIMEOUT_CONEXAO = 5      # segundos para abrir a conexão TCP
+TIMEOUT_LEITURA = 30     # segundos esperando a resposta do servidor
+MAX_TENTATIVAS = 4       # 1 tentativa + 3 retentativas
+BACKOFF_BASE = 1.0       # segundos (dobra a cada retentativa)
+BACKOFF_MAX = 60.0       # teto da espera entre tentativas
+STATUS_RETENTAVEIS = {429, 500, 502, 503, 504}
+USER_AGENT = "UFC-Webscraping/1.0 (+https://github.com/HugoDias05/UFC-Webscraping)"
+
+# --------------------------------------------------------------------------------
+# LIMITADOR DE TAXA (Token Bucket + limite de requisições simultâneas)
+# --------------------------------------------------------------------------------
+
+class LimitadorDeTaxa:
+    """
+    Limitador global de educação (politeness) compartilhado por todas as threads de coleta.
+
+    Combina um token bucket (requisições por segundo, com rajada máxima) com um
+    semáforo que limita quantas requisições podem estar em andamento ao mesmo tempo.
+    Uso:
+        with limitador:
+            requests.get(url)
+    """
+
+    def __init__(self, requisicoes_por_segundo=0.5, max_em_voo=4, rajada=1):
+        if requisicoes_por_segundo <= 0:
+            raise ValueError("requisicoes_por_segundo deve ser maior que zero.")
+        if max_em_voo < 1:
+            raise ValueError("max_em_voo deve ser pelo menos 1.")
+
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.max_em_voo = max_em_voo
+        self.capacidade = max(1, rajada)
+
+        self._tokens = float(self.capacidade)
+        self._ultima_recarga = time.monotonic()
+        self._lock = threading.Lock()
+        self._em_voo = threading.BoundedSemaphore(max_em_voo)
+
+    def _recarregar(self):
+        # Chamado sempre com o lock adquirido
+        agora = time.monotonic()
+        decorrido = agora - self._ultima_recarga
+        self._ultima_recarga = agora
+        self._tokens = min(self.capacidade, self._tokens + decorrido * self.requisicoes_por_segundo)
+
+    def adquirir(self):
+        """Bloqueia até existir uma vaga de requisição simultânea E um token disponível."""
+        self._em_voo.acquire()
+        try:
+            while True:
+                with self._lock:
+                    self._recarregar()
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    espera = (1 - self._tokens) / self.requisicoes_por_segundo
+                time.sleep(espera)
+        except BaseException:
+            self._em_voo.release()
+            raise
+
+    def liberar(self):
+        """Libera a vaga de requisição simultânea (o token consumido não é devolvido)."""
+        self._em_voo.release()
+
+    def __enter__(self):
+        self.adquirir()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.liberar()
+        return False
+
+# --------------------------------------------------------------------------------
+# CONEXÕES CRONOMETRADAS (tempo de DNS + TCP + TLS de cada conexão nova)
+# --------------------------------------------------------------------------------
+
+# A conexão é aberta na mesma thread da requisição: o tempo fica aqui até o ClienteHTTP lê-lo
+_medicao = threading.local()
+
+
+class _ConexaoCronometrada(HTTPConnection):
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _medicao.conexao = getattr(_medicao, 'conexao', 0.0) + time.perf_counter() - inicio
+
+
+class _ConexaoSeguraCronometrada(HTTPSConnection):
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _medicao.conexao = getattr(_medicao, 'conexao', 0.0) + time.perf_counter() - inicio
+
+
+class _PoolCronometrado(HTTPConnectionPool):
+    ConnectionCls = _ConexaoCronometrada
+
+
+class _PoolSeguroCronometrado(HTTPSConnectionPool):
+    ConnectionCls = _ConexaoSeguraCronometrada
+
+
+class _AdaptadorCronometrado(HTTPAdapter):
+    """HTTPAdapter cujos pools abrem conexões cronometradas (o restante não muda)."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _PoolCronometrado, 'https': _PoolSeguroCronometrado}
+
+# --------------------------------------------------------------------------------
+# CLIENTE HTTP COMPARTILHADO (Pool de conexões + timeouts + retry com backoff)
+# --------------------------------------------------------------------------------
+
+class ClienteHTTP:
+    """
+    Camada de transporte usada por todas as requisições do scraper.
+
+    - Reaproveita conexões (keep-alive) através de uma requests.Session com pool.
+    - Aplica timeouts explícitos de conexão e leitura.
+    - Negocia compressão (gzip/deflate).
+    - Refaz a requisição com backoff exponencial + jitter em erros de rede, 429 e 5xx,
+      respeitando o cabeçalho Retry-After quando enviado pelo servidor.
+    - Conta tentativas, retentativas e falhas da execução (veja estatisticas()).
+    - Opcionalmente usa um CacheHTTP para requisições condicionais (veja baixar()).
+    - Mede a latência de cada requisição por etapa (fila do limitador, conexão, espera
+      do servidor, download) e os bytes recebidos em `metricas` (veja metricas.py).
+    """
+
+    def __init__(self, limitador=None, timeout=(TIMEOUT_CONEXAO, TIMEOUT_LEITURA), max_tentativas=MAX_TENTATIVAS,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX, tamanho_pool=10, cache=None, frescor=None,
+                 metricas=None):
+        self.limitador = limitador
+        self.metricas = metricas if metricas is not None else MetricasColeta()
+        self.cache = cache
+        # Entradas do cache mais novas que `frescor` segundos são usadas sem nenhuma requisição
+        self.frescor = frescor
+        self.timeout = timeout
+        self.max_tentativas = max(1, max_tentativas)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.sessao = requests.Session()
+        # max_retries=0: os retries são feitos aqui, para passarem pelo limitador e pelos contadores
+        adaptador = _AdaptadorCronometrado(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool, max_retries=0)
+        self.sessao.mount("http://", adaptador)
+        self.sessao.mount("https://", adaptador)
+        self.sessao.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+            "User-Agent": USER_AGENT,
+        })
+
+        self._contadores = Counter()
+        self._lock = threading.Lock()
+        # Páginas baixadas com confirmar=False à espera de confirmar(): url -> (hash, ETag, Last-Modified)
+        self._pendentes = {}
+
+    def _contar(self, chave, quantidade=1):
+        with self._lock:
+            self._contadores[chave] += quantidade
+
+    def _medir(self, inicio, inicio_requisicao, fim, response):
+        """Divide o tempo da requisição nas etapas de LATENCIAS (metricas.py)."""
+        conexao = getattr(_medicao, 'conexao', 0.0)
+        # `elapsed` (requests) vai do envio até os cabeçalhos, incluindo a conexão nova
+        ate_cabecalhos = response.elapsed.total_seconds()
+        self.metricas.observar('fila', inicio_requisicao - inicio)
+        if conexao:
+            self.metricas.observar('conexao', conexao)
+        self.metricas.observar('espera_servidor', max(0.0, ate_cabecalhos - conexao))
+        self.metricas.observar('download', max(0.0, fim - inicio_requisicao - ate_cabecalhos))
+        self.metricas.observar('requisicao', fim - inicio_requisicao)
+        self.metricas.contar('bytes', _bytes_transferidos(response))
+        self.metricas.contar('respostas', status=response.status_code)
+
+    def estatisticas(self):
+        """Retorna uma cópia dos contadores da execução (tentativas, retentativas, falhas, ...)."""
+        with self._lock:
+            return dict(self._contadores)
+
+    def _calcular_espera(self, tentativa, retry_after=None):
+        # Full jitter: espera aleatória entre 0 e base * 2^(tentativa-1), limitada ao teto
+        espera = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (tentativa - 1)))
+        espera_servidor = _interpretar_retry_after(retry_after)
+        if espera_servidor is not None:
+            espera = max(espera, espera_servidor)
+        return min(espera, self.backoff_max)
+
+    def get(self, url, **kwargs):
+        """
+        Faz um GET com retry. Retorna a última resposta recebida (o chamador decide
+        se chama raise_for_status) ou relança o último erro de rede.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+
+        for tentativa in range(1, self.max_tentativas + 1):
+            self._contar("tentativas")
+            ultima = tentativa == self.max_tentativas
+
+            inicio = time.perf_counter()
+            try:
+                with self.limitador or contextlib.nullcontext():
+                    inicio_requisicao = time.perf_counter()
+                    _medicao.conexao = 0.0
+                    response = self.sessao.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._contar(f"erro_{type(e).__name__}")
+                self.metricas.contar('erros_transporte', tipo=type(e).__name__)
+                if ultima:
+                    self._contar("falhas")
+                    self.metricas.contar('falhas_transporte', tipo=type(e).__name__)
+                    raise
+                self._contar("retentativas")
+                self.metricas.contar('retentativas', motivo=type(e).__name__)
+                time.sleep(self._calcular_espera(tentativa))
+                continue
+
+            self._medir(inicio, inicio_requisicao, time.perf_counter(), response)
+            if response.status_code in STATUS_RETENTAVEIS:
+                self._contar(f"status_{response.status_code}")
+                if not ultima:
+                    self._contar("retentativas")
+                    self.metricas.contar('retentativas', motivo=f"status_{response.status_code}")
+                    time.sleep(self._calcular_espera(tentativa, response.headers.get("Retry-After")))
+                    continue
+
+            if response.status_code >= 400:
+                self._contar("falhas")
+                self.metricas.contar('falhas_http', status=response.status_code)
+            else:
+                self._contar("sucessos")
+            return response
+
+    def baixar(self, url, confirmar=True):
+        """
+        Baixa a página e retorna (texto, alterado).
+
+        Com cache, envia If-None-Match / If-Modified-Since: um 304 devolve o corpo salvo
+        com alterado=False. Um 200 com o mesmo hash de conteúdo também conta como
+        inalterado (o UFCStats nem sempre envia ETag). Erros HTTP geram HTTPError.
+
+        Com `confirmar=False`, uma página nova ou alterada só passa a contar como
+        conhecida no cache depois de confirmar(url), que o chamador faz quando o
+        resultado da página já está salvo: se o parsing falhar ou a coleta cair antes
+        disso, a próxima execução ainda vê a página como alterada e a processa de novo.
+        """
+        entrada = self.cache.obter(url) if self.cache else None
+
+        # Entradas não confirmadas (hash vazio) nunca são usadas sem requisição
+        if entrada and entrada['hash'] and self.frescor is not None and time.time() - entrada['buscado_em'] < self.frescor:
+            self._contar("cache_fresco")
+            return entrada['texto'], False
+
+        headers = {}
+        if entrada:
+            if entrada['etag']:
+                headers["If-None-Match"] = entrada['etag']
+            if entrada['last_modified']:
+                headers["If-Modified-Since"] = entrada['last_modified']
+
+        response = self.get(url, headers=headers)
+
+        if entrada and response.status_code == 304:
+            self._contar("cache_304")
+            self.cache.renovar(url)
+            return entrada['texto'], False
+
+        response.raise_for_status()
+        texto = response.text
+
+        if self.cache is None:
+            return texto, True
+
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        hash_novo = calcular_hash(texto)
+        alterado = entrada is None or entrada['hash'] != hash_novo
+        self._contar("paginas_alteradas" if alterado else "paginas_inalteradas")
+        if alterado and not confirmar:
+            self.cache.salvar(url, texto, confirmado=False)
+            with self._lock:
+                self._pendentes[url] = (hash_novo, etag, last_modified)
+        else:
+            self.cache.salvar(url, texto, etag, last_modified)
+        return texto, alterado
+
+    def confirmar(self, url=None):
+        """
+        Confirma no cache as páginas baixadas com baixar(url, confirmar=False): só `url`
+        ou, sem ela, todas as pendentes. Chame depois de salvar o resultado da página.
+        """
+        with self._lock:
+            if url is None:
+                pendentes, self._pendentes = self._pendentes, {}
+            else:
+                pendentes = {url: self._pendentes.pop(url)} if url in self._pendentes else {}
+        for url_pendente, (hash_conteudo, etag, last_modified) in pendentes.items():
+            self.cache.confirmar(url_pendente, hash_conteudo, etag, last_modified)
+
+    def descartar(self, url):
+        """Esquece a confirmação pendente da `url` (o resultado dela não foi salvo)."""
+        with self._lock:
+            self._pendentes.pop(url, None)
+
+    def fechar(self):
+        self.sessao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fechar()
+        return False
+
+
+def _bytes_transferidos(response):
+    """Bytes do corpo como vieram pela rede (comprimidos, com gzip), não os do corpo já descomprimido."""
+    tamanho = response.headers.get('Content-Length', '')
+    if tamanho.isdigit():
+        return int(tamanho)
+    # Sem Content-Length (chunked ou fechamento da conexão): o urllib3 conta o que leu do socket
+    try:
+        return response.raw.tell()
+    except (AttributeError, OSError):
+        return len(response.content)
+
+
+def _interpretar_retry_after(valor):
+    """Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos de espera."""
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, data.timestamp() - time.time())
+
+
+_cliente_padrao = None
+_lock_cliente_padrao = threading.Lock()
+
+
+def obter_cliente_padrao():
+    """Cliente compartilhado (sem limitador) para chamadas avulsas das funções de extração."""
+    global _cliente_padrao
+    with _lock_cliente_padrao:
+        if _cliente_padrao is None:
+            _cliente_padrao = ClienteHTTP()
+        return _cliente_padrao
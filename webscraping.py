@@ -1,42 +1,69 @@
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
+import argparse
+import functools
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from cache_http import CACHE_PADRAO, CacheHTTP
+from checkpoint import CHECKPOINT_PADRAO, CheckpointColeta
+from concorrencia import executar_em_janela
+from historico import HISTORICO_PADRAO, HistoricoLutadores
+from indice_lutadores import id_lutador
+from metricas import RELATORIO_PADRAO, MetricasColeta
+from parsers import BACKENDS, CAMPOS_LUTADOR, CHAVE_LUTAS, VALORES_AUSENTES, obter_parser
+from shards import DIR_SHARDS, PARTICOES, Shard, arquivos_de_shards, mesclar_shards
+from spool import CHAVE_SEGUNDOS_PARSE, SPOOL_PADRAO, SpoolHTML, parse_arquivo_spool
+from transporte import ClienteHTTP, LimitadorDeTaxa, obter_cliente_padrao
 
 # --- CONSTANTES GLOBAIS ---
-BASE_INDEX_URL = "http://ufcstats.com/statistics/fighters" 
+# UFCSTATS_BASE_URL permite apontar o scraper para um servidor local (stub) com páginas salvas
+BASE_URL = os.environ.get("UFCSTATS_BASE_URL", "http://ufcstats.com").rstrip('/')
+BASE_INDEX_URL = f"{BASE_URL}/statistics/fighters"
 ALFABETO = [chr(i) for i in range(ord('A'), ord('Z') + 1)] # Lista de A a Z
-BASE_DETAIL_URL = "http://ufcstats.com/fighter-details/"
+BASE_DETAIL_URL = f"{BASE_URL}/fighter-details/"
+
+# --- CONFIGURAÇÃO PADRÃO DE EDUCAÇÃO (POLITENESS) ---
+# 0.5 req/s equivale ao antigo time.sleep(2) entre páginas de detalhe
+REQUISICOES_POR_SEGUNDO = 0.5
+MAX_EM_VOO = 4
+MAX_WORKERS = 4
+
+ARQUIVO_BRUTO = 'dados_ufc_brutos.csv'
+# Tabela de lutas bruta (modo por luta), uma linha por 'ID_Luta'
+ARQUIVO_LUTAS_BRUTO = 'dados_ufc_lutas_brutos.csv'
+# URLs dos lutadores que falharam na última coleta (para recoletar)
+ARQUIVO_FALHAS = 'lutadores_com_falha.txt'
 
 # --------------------------------------------------------------------------------
 # 1. FUNÇÃO DE EXTRAÇÃO DE LINKS (por letra)
 # --------------------------------------------------------------------------------
 
-def extrair_links_por_letra(letra):
+def extrair_links_por_letra(letra, cliente=None, parser=None):
     """
     Baixa a página de índice para uma letra específica, forçando o parâmetro 'page=all'.
+    A requisição passa pelo ClienteHTTP informado (ou pelo cliente padrão compartilhado)
+    e o HTML é lido pelo backend de parser informado (veja parsers.py).
     """
     # CORREÇÃO CRUCIAL: Constrói a URL completa com char=X e page=all
     url_por_letra = f"{BASE_INDEX_URL}?char={letra}&page=all" 
-    fighter_urls = set()
+    cliente = cliente or obter_cliente_padrao()
 
     try:
-        response = requests.get(url_por_letra)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        html, _ = cliente.baixar(url_por_letra)
+        cliente.metricas.contar('paginas', etapa='indice')
 
-        links = soup.find_all('a', href=True)
-        
-        for link in links:
-            href = link['href']
-            # Garante que é um link de detalhes de lutador
-            if BASE_DETAIL_URL in href: 
-                fighter_urls.add(href)
+        # Garante que são links de detalhes de lutador
+        with cliente.metricas.cronometro('parse', etapa='indice'):
+            fighter_urls = (parser or obter_parser()).parse_links(html, BASE_DETAIL_URL)
 
         print(f"✅ Letra {letra}: {len(fighter_urls)} links encontrados.")
         return list(fighter_urls)
 
     except Exception as e:
+        cliente.metricas.contar('falhas', etapa='indice', tipo=type(e).__name__)
         print(f"❌ Erro ao extrair links para a letra {letra}: {e}")
         return []
 
@@ -44,112 +71,773 @@ def extrair_links_por_letra(letra):
 # 2. FUNÇÃO DE EXTRAÇÃO DE DETALHES (por lutador)
 # --------------------------------------------------------------------------------
 
-def extrair_stats_do_lutador_v2(url):
+def extrair_stats_do_lutador_v2(url, cliente=None, anterior=None, parser=None, com_lutas=False, confirmar=True):
     """
     Baixa a página de detalhes do lutador e extrai as estatísticas e o Recorde.
+    A requisição passa pelo ClienteHTTP informado (ou pelo cliente padrão compartilhado)
+    e o HTML é lido pelo backend de parser informado (veja parsers.py).
+    Se `anterior` (a linha do snapshot anterior) for informado e a página não mudou
+    desde a última coleta, ela é devolvida sem re-processar o HTML.
+    Com `com_lutas`, a tabela de lutas da mesma página vai em stats_dict[CHAVE_LUTAS]
+    (sem nenhuma requisição extra).
+    Com `confirmar=False`, a página só é confirmada no cache quando o chamador salvar
+    o resultado (veja ClienteHTTP.baixar).
     """
+    cliente = cliente or obter_cliente_padrao()
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # --- 1. Extração do Nome do Lutador ---
-        nome_element = soup.find('span', class_='b-content__title-highlight')
-        nome_lutador = nome_element.text.strip() if nome_element else "Nome não encontrado"
-        
-        # --- 2. Extração do Recorde (Wins-Losses-Draws) ---
-        recorde_element = soup.find('span', class_='b-content__title-record')
-        recorde_texto = recorde_element.text.strip() if recorde_element else "Recorde não encontrado"
-        
-        recorde = recorde_texto.replace('Record:', '').strip()
-        
-        # --- 3. Extração das Estatísticas Principais ---
-        stats_list = soup.find_all('li', class_='b-list__box-list-item')
-        
-        stats_dict = {}
-        for item in stats_list:
-            partes = item.text.split(':')
-            if len(partes) == 2:
-                chave = partes[0].strip()
-                valor = partes[1].strip()
-                stats_dict[chave] = valor
-                
-        # --- 4. Consolidação dos Dados ---
-        stats_dict['Nome'] = nome_lutador
-        stats_dict['Recorde'] = recorde 
+        html, alterado = cliente.baixar(url, confirmar=confirmar)
+        cliente.metricas.contar('paginas', etapa='lutador')
+        if anterior is not None and not alterado:
+            cliente.metricas.contar('paginas_inalteradas', etapa='lutador')
+            return anterior
+
+        # --- Extração de Nome, Recorde e Estatísticas Principais ---
+        parser = parser or obter_parser()
+        with cliente.metricas.cronometro('parse', etapa='lutador'):
+            stats_dict = parser.parse_lutador(html)
+
+            # --- Consolidação dos Dados ---
+            stats_dict['URL'] = url  # Chave estável do lutador (usada no merge incremental)
+
+            # --- Histórico de Lutas (modo por luta) ---
+            if com_lutas:
+                stats_dict[CHAVE_LUTAS] = parser.parse_lutas(html)
+        cliente.metricas.contar_campos_ausentes(stats_dict, CAMPOS_LUTADOR, VALORES_AUSENTES)
         
         return stats_dict
 
     except Exception as e:
+        cliente.metricas.contar('falhas', etapa='lutador', tipo=type(e).__name__)
         print(f"Erro ao extrair dados da URL {url}: {e}")
         return None
 
+
+def extrair_detalhes_da_luta(url, cliente=None, parser=None):
+    """
+    Baixa a página de detalhes de uma luta e extrai categoria, formato, árbitro e
+    os totais de cada lutador (veja parsers._montar_detalhes_luta). Retorna None em caso de erro.
+    """
+    cliente = cliente or obter_cliente_padrao()
+    try:
+        html, _ = cliente.baixar(url)
+        cliente.metricas.contar('paginas', etapa='luta')
+        with cliente.metricas.cronometro('parse', etapa='luta'):
+            return (parser or obter_parser()).parse_detalhes_luta(html)
+
+    except Exception as e:
+        cliente.metricas.contar('falhas', etapa='luta', tipo=type(e).__name__)
+        print(f"Erro ao extrair dados da luta {url}: {e}")
+        return None
+
 # --------------------------------------------------------------------------------
-# 3. FUNÇÃO PIPELINE PRINCIPAL (Coordena a coleta total)
+# 3. COLETA CONCORRENTE (Pool de threads + limitador global)
 # --------------------------------------------------------------------------------
 
-def pipeline_coleta_completa():
-    
-    todos_os_dados = []
-    urls_lutadores_completos = set() 
-    
-    # --- ETAPA 1: COLETAR TODOS OS LINKS POR ALFABETO ---
-    print("Iniciando coleta de links em TODAS as páginas do alfabeto (A-Z)...")
-    
-    for letra in ALFABETO:
-        # CORREÇÃO: Chama a função extrair_links_por_letra com o argumento 'letra'
-        links_da_letra = extrair_links_por_letra(letra) 
-        
-        urls_lutadores_completos.update(links_da_letra)
-        
-        # 🛑 DELAY ENTRE AS PÁGINAS DE ÍNDICE
-        time.sleep(1) 
-        
-    urls_lista = list(urls_lutadores_completos)
-    print(f"\n✅ Coleta de links finalizada. Total de lutadores únicos encontrados: {len(urls_lista)}")
-    print("----------------------------------------------------------------------")
-    
-    
-    # --- ETAPA 2: COLETAR OS DETALHES DE CADA LUTADOR ---
-    print("Iniciando coleta de detalhes...")
-    
-    for i, url in enumerate(urls_lista): 
-        # ATENÇÃO: É vital manter o time.sleep(2) para não sobrecarregar o site!
-        print(f"Coletando dados do lutador {i+1}/{len(urls_lista)}: {url}")
-        
-        dados_lutador = extrair_stats_do_lutador_v2(url)
-        
+def coletar_concorrente(funcao, itens, cliente, max_workers=MAX_WORKERS):
+    """
+    Executa funcao(item, cliente) para cada item em um pool de threads limitado.
+    O cliente (e o seu limitador) é compartilhado, então a taxa total de requisições continua
+    a mesma independentemente do número de workers. Gera (item, resultado) na ordem de conclusão.
+    No máximo 2 * max_workers tarefas ficam enfileiradas, então a memória não cresce com
+    o número de itens, e um Ctrl-C cancela o que ainda não começou.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        yield from executar_em_janela(executor, funcao, itens, 2 * max_workers, cliente)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _salvar_lutador(checkpoint, url, dados_lutador, cliente=None):
+    """
+    Grava o lutador no checkpoint, separando as lutas (modo por luta) para a tabela de lutas.
+    Com o checkpoint em disco, a página já pode ser confirmada no cache do `cliente`; com o
+    checkpoint em memória, a confirmação fica para o fim da coleta (veja _executar_coleta).
+    """
+    lutas = dados_lutador.pop(CHAVE_LUTAS, None)
+    dados_lutador.pop(CHAVE_SEGUNDOS_PARSE, None)
+    checkpoint.salvar_lutador(url, dados_lutador, lutas)
+    if cliente is not None and checkpoint.em_disco:
+        cliente.confirmar(url)
+
+
+def coletar_detalhes_concorrente(urls, cliente, checkpoint, max_workers=MAX_WORKERS, parser=None, com_lutas=False):
+    """
+    Coleta as páginas de detalhe dos lutadores em paralelo e grava cada resultado
+    no checkpoint assim que fica pronto (nada é acumulado em memória).
+    No modo incremental, lutadores cujas páginas não mudaram reaproveitam a linha
+    do snapshot anterior guardada no checkpoint.
+    Com `com_lutas`, as lutas de cada página também são gravadas (deduplicadas por 'ID_Luta').
+    Retorna as URLs dos lutadores que não puderam ser coletados mesmo após as retentativas.
+    """
+    urls_com_falha = []
+    total = len(urls)
+
+    def extrair(url, cliente):
+        return extrair_stats_do_lutador_v2(url, cliente, checkpoint.obter_anterior(url), parser, com_lutas,
+                                           confirmar=False)
+
+    for i, (url, dados_lutador) in enumerate(coletar_concorrente(extrair, urls, cliente, max_workers)):
+        print(f"Coletando dados do lutador {i+1}/{total}: {url}")
         if dados_lutador:
-            todos_os_dados.append(dados_lutador)
-            
-        # 🛑 DELAY ENTRE PÁGINAS DE DETALHE
-        time.sleep(2)
-        
-    # --- FINALIZAÇÃO E RETORNO CORRIGIDO ---
-    if todos_os_dados:
-        df_final = pd.DataFrame(todos_os_dados)
-        print("\n✅ Pipeline de Coleta FINALIZADO.")
+            _salvar_lutador(checkpoint, url, dados_lutador, cliente)
+        else:
+            cliente.descartar(url)
+            checkpoint.registrar_falha(url)
+            urls_com_falha.append(url)
+
+    return urls_com_falha
+
+
+def coletar_detalhes_em_estagios(urls, cliente, checkpoint, spool, max_workers=MAX_WORKERS, processos_parse=2, parser=None,
+                                 com_lutas=False):
+    """
+    Variante em estágios de coletar_detalhes_concorrente:
+      1. Download (threads + limitador): grava o HTML bruto de cada lutador no spool.
+      2. Parsing (ProcessPoolExecutor): transforma as páginas do spool nos dicionários de estatísticas.
+    O parsing (CPU) roda em outros processos e não bloqueia as próximas requisições.
+    Páginas inalteradas com linha no snapshot anterior não passam pelo parsing.
+    Retorna as URLs dos lutadores que não puderam ser coletados.
+    """
+    urls_com_falha = []
+    total = len(urls)
+    nome_parser = parser.nome if parser is not None else None
+
+    def baixar(url, cliente):
+        try:
+            html, alterado = cliente.baixar(url, confirmar=False)
+        except Exception as e:
+            cliente.metricas.contar('falhas', etapa='lutador', tipo=type(e).__name__)
+            print(f"Erro ao baixar a URL {url}: {e}")
+            return None
+        cliente.metricas.contar('paginas', etapa='lutador')
+        caminho = spool.salvar(url, html)
+        anterior = checkpoint.obter_anterior(url)
+        if anterior is not None and not alterado:
+            cliente.metricas.contar('paginas_inalteradas', etapa='lutador')
+            return anterior
+        return caminho
+
+    def registrar(url, dados_lutador, parseado=False):
+        if dados_lutador:
+            if parseado:
+                # O parsing rodou em outro processo: o tempo volta junto com o resultado
+                cliente.metricas.observar('parse', dados_lutador.pop(CHAVE_SEGUNDOS_PARSE), etapa='lutador')
+                cliente.metricas.contar_campos_ausentes(dados_lutador, CAMPOS_LUTADOR, VALORES_AUSENTES)
+            _salvar_lutador(checkpoint, url, dados_lutador, cliente)
+        else:
+            if parseado:
+                cliente.metricas.contar('falhas', etapa='lutador', tipo='parse')
+            cliente.descartar(url)
+            checkpoint.registrar_falha(url)
+            urls_com_falha.append(url)
+
+    def registrar_concluidos(futuros, bloquear):
+        concluidos, _ = wait(futuros, return_when=FIRST_COMPLETED) if bloquear else (
+            {futuro for futuro in futuros if futuro.done()}, None)
+        for futuro in concluidos:
+            url = futuros.pop(futuro)
+            registrar(url, futuro.result()[1], parseado=True)
+
+    with ProcessPoolExecutor(max_workers=processos_parse) as pool:
+        futuros_parse = {}
+        for i, (url, resultado) in enumerate(coletar_concorrente(baixar, urls, cliente, max_workers)):
+            print(f"Coletando dados do lutador {i+1}/{total}: {url}")
+            if resultado is None or isinstance(resultado, dict):
+                registrar(url, resultado)
+                continue
+
+            futuros_parse[pool.submit(parse_arquivo_spool, resultado, nome_parser, com_lutas)] = url
+            # Contrapressão: se o parsing ficar para trás, espera antes de baixar mais
+            registrar_concluidos(futuros_parse, bloquear=len(futuros_parse) >= 4 * processos_parse)
+
+        while futuros_parse:
+            registrar_concluidos(futuros_parse, bloquear=True)
+
+    return urls_com_falha
+
+
+def coletar_detalhes_lutas(cliente, checkpoint, max_workers=MAX_WORKERS, parser=None, ids_lutador=None):
+    """
+    Baixa a página de detalhes de cada luta do checkpoint que ainda não foi detalhada.
+    Cada luta aparece nas páginas dos dois adversários, mas já foi deduplicada por
+    'ID_Luta', então cada página de luta é buscada uma única vez; as lutas que vieram
+    detalhadas do snapshot anterior não são buscadas de novo.
+    Com `ids_lutador` (coleta particionada), só busca as lutas cujo lado 1 é um desses
+    lutadores: cada lutador pertence a um único shard, então cada luta tem no máximo um
+    dono. As lutas cujo lado 1 nenhum shard coletou ficam para completar_lutas_dos_shards.
+    Retorna os IDs das lutas que falharam (ficam pendentes para a próxima execução).
+    """
+    urls_por_id = dict(checkpoint.lutas_sem_detalhes(ids_lutador))
+    ids_com_falha = []
+    total = len(urls_por_id)
+    print(f"Iniciando coleta das páginas de luta... ({total} lutas sem detalhes)")
+
+    def extrair(id_luta, cliente):
+        return extrair_detalhes_da_luta(urls_por_id[id_luta], cliente, parser)
+
+    for i, (id_luta, detalhes) in enumerate(coletar_concorrente(extrair, list(urls_por_id), cliente, max_workers)):
+        print(f"Coletando detalhes da luta {i+1}/{total}: {urls_por_id[id_luta]}")
+        if detalhes:
+            checkpoint.salvar_detalhes_luta(id_luta, detalhes)
+        else:
+            ids_com_falha.append(id_luta)
+
+    return ids_com_falha
+
+
+def reprocessar_spool(diretorio_spool=SPOOL_PADRAO, caminho_saida=ARQUIVO_BRUTO, processos_parse=2, parser=None,
+                      com_lutas=False, caminho_lutas=ARQUIVO_LUTAS_BRUTO):
+    """
+    Etapa de parsing offline: re-deriva o CSV bruto a partir de um spool existente,
+    sem nenhuma requisição à rede. Retorna o número de lutadores escritos.
+    Com `com_lutas`, também re-deriva a tabela de lutas (só com os dados das páginas
+    dos lutadores: as páginas de luta não ficam no spool).
+    """
+    spool = SpoolHTML(diretorio_spool)
+    arquivos = spool.arquivos()
+    print(f"Processando {len(arquivos)} páginas do spool '{diretorio_spool}' com {processos_parse} processos...")
+
+    caminho_checkpoint = caminho_saida + '.spool.sqlite'
+    checkpoint = CheckpointColeta(caminho_checkpoint)
+    nome_parser = obter_parser(parser).nome
+    with ProcessPoolExecutor(max_workers=processos_parse) as pool:
+        for _, (url, dados_lutador) in executar_em_janela(
+                pool, parse_arquivo_spool, arquivos, 4 * processos_parse, nome_parser, com_lutas):
+            if dados_lutador:
+                _salvar_lutador(checkpoint, url, dados_lutador)
+
+    caminho_temporario = caminho_saida + '.tmp'
+    total = checkpoint.exportar_csv(caminho_temporario)
+    os.replace(caminho_temporario, caminho_saida)
+    if com_lutas:
+        _exportar_lutas(checkpoint, caminho_lutas)
+    checkpoint.descartar()
+    print(f"✅ {total} lutadores salvos em '{caminho_saida}' a partir do spool.")
+    return total
+
+
+def _exportar_lutas(checkpoint, caminho_lutas):
+    """Escreve a tabela de lutas do checkpoint (troca atômica do CSV). Retorna o número de lutas."""
+    caminho_temporario = caminho_lutas + '.tmp'
+    total = checkpoint.exportar_lutas_csv(caminho_temporario)
+    os.replace(caminho_temporario, caminho_lutas)
+    print(f"🥊 {total} lutas salvas em '{caminho_lutas}'.")
+    return total
+
+# --------------------------------------------------------------------------------
+# 4. FUNÇÕES PIPELINE PRINCIPAIS (Coordenam a coleta total)
+# --------------------------------------------------------------------------------
+
+def pipeline_coleta_completa(max_workers=MAX_WORKERS, requisicoes_por_segundo=REQUISICOES_POR_SEGUNDO, max_em_voo=MAX_EM_VOO,
+                             cache=None, frescor=None, snapshot_anterior=None, parser=None,
+                             processos_parse=0, spool_dir=SPOOL_PADRAO, com_lutas=False, detalhes_lutas=True,
+                             snapshot_lutas=None, shard=None, metricas=None):
+    """
+    Coleta todos os links do alfabeto e depois os detalhes de cada lutador, retornando um DataFrame.
+    As requisições são feitas em paralelo, mas um único LimitadorDeTaxa controla
+    a taxa total (requisições/segundo) e o número de requisições simultâneas.
+
+    Modo incremental: com um CacheHTTP as requisições são condicionais e, com o
+    `snapshot_anterior` (DataFrame bruto com a coluna 'URL'), páginas inalteradas
+    reaproveitam a linha anterior; só lutadores novos ou alterados são re-processados.
+
+    Os lutadores que falharam ficam em df_final.attrs['urls_com_falha'] e os
+    contadores do transporte em df_final.attrs['estatisticas_http'].
+    `parser` escolhe o backend de parsing ('bs4', 'lxml'; padrão: o mais rápido disponível).
+    Com `processos_parse` > 0 a coleta roda em estágios: o HTML vai para o spool em
+    `spool_dir` e o parsing é feito por um pool de processos.
+    Com `com_lutas` (modo por luta), a tabela de lutas das páginas dos lutadores é
+    deduplicada por 'ID_Luta' e fica em df_final.attrs['lutas']; com `detalhes_lutas`,
+    a página de cada luta é buscada uma vez. `snapshot_lutas` (tabela de lutas anterior)
+    evita buscar de novo as lutas já detalhadas.
+    `shard` (shards.Shard) limita a coleta à fatia de lutadores desse shard.
+    `metricas` (metricas.MetricasColeta) recebe latências, bytes, páginas, falhas e campos
+    ausentes da execução; o relatório fica em df_final.attrs['metricas'].
+    Para coletas longas prefira pipeline_coleta_resumivel (checkpoint em disco).
+    """
+    checkpoint = CheckpointColeta(':memory:')
+    try:
+        if snapshot_anterior is not None and 'URL' in snapshot_anterior.columns:
+            checkpoint.carregar_anteriores(snapshot_anterior.to_dict('records'))
+        if com_lutas and snapshot_lutas is not None:
+            checkpoint.carregar_lutas(snapshot_lutas.to_dict('records'))
+
+        resumo = _executar_coleta(checkpoint, max_workers, requisicoes_por_segundo, max_em_voo, cache, frescor, parser,
+                                  processos_parse, spool_dir, com_lutas, detalhes_lutas, shard, metricas)
+        df_final = pd.DataFrame(list(checkpoint.iterar_resultado()))
+        if com_lutas:
+            df_final.attrs['lutas'] = pd.DataFrame(list(checkpoint.iterar_lutas()))
+    finally:
+        checkpoint.fechar()
+
+    if not df_final.empty:
         print(f"DataFrame com {len(df_final)} lutadores criado com sucesso.")
-        return df_final
     else:
-        print("\n❌ Nenhum dado de lutador foi coletado. Retornando DataFrame vazio.")
-        return pd.DataFrame()
+        print("Retornando DataFrame vazio.")
+
+    df_final.attrs['urls_com_falha'] = resumo['urls_com_falha']
+    df_final.attrs['estatisticas_http'] = resumo['estatisticas_http']
+    df_final.attrs['metricas'] = resumo['metricas'].relatorio()
+    return df_final
+
+
+def pipeline_coleta_resumivel(caminho_saida=ARQUIVO_BRUTO, caminho_checkpoint=CHECKPOINT_PADRAO, max_workers=MAX_WORKERS,
+                              requisicoes_por_segundo=REQUISICOES_POR_SEGUNDO, max_em_voo=MAX_EM_VOO,
+                              cache=None, frescor=None, snapshot_csv=None, parser=None,
+                              processos_parse=0, spool_dir=SPOOL_PADRAO, com_lutas=False, detalhes_lutas=True,
+                              caminho_lutas=ARQUIVO_LUTAS_BRUTO, snapshot_lutas_csv=None, shard=None, metricas=None):
+    """
+    Mesma coleta de pipeline_coleta_completa, mas cada lutador é gravado no checkpoint
+    em disco assim que é coletado, junto com a fronteira de URLs pendentes.
+    Se a execução for interrompida, rodar de novo continua exatamente de onde parou.
+    Ao final o CSV bruto é escrito em lotes a partir do checkpoint, que então é apagado.
+    `snapshot_csv` (CSV bruto anterior com a coluna 'URL') ativa o modo incremental.
+    `processos_parse` > 0 ativa a coleta em estágios (veja pipeline_coleta_completa).
+    `com_lutas` ativa o modo por luta: a tabela de lutas vai para `caminho_lutas` e
+    `snapshot_lutas_csv` (tabela de lutas anterior) acompanha o `snapshot_csv`.
+    `shard` (shards.Shard) limita a coleta à fatia de lutadores desse shard; a saída
+    parcial é depois juntada por mesclar_saidas_dos_shards.
+    Retorna o resumo da execução (lutadores, urls_com_falha, estatisticas_http, metricas e, no modo por luta, lutas).
+    """
+    checkpoint = CheckpointColeta(caminho_checkpoint)
+    if checkpoint.total_fronteira():
+        print(f"♻️ Checkpoint encontrado em '{caminho_checkpoint}': retomando a coleta anterior.")
+
+    if snapshot_csv is not None:
+        checkpoint.carregar_anteriores_csv(snapshot_csv)
+    if com_lutas and snapshot_lutas_csv is not None:
+        checkpoint.carregar_lutas_csv(snapshot_lutas_csv)
+
+    resumo = _executar_coleta(checkpoint, max_workers, requisicoes_por_segundo, max_em_voo, cache, frescor, parser,
+                              processos_parse, spool_dir, com_lutas, detalhes_lutas, shard, metricas)
+
+    # Escreve em um arquivo temporário e troca no final: o CSV antigo nunca fica pela metade
+    caminho_temporario = caminho_saida + '.tmp'
+    resumo['lutadores'] = checkpoint.exportar_csv(caminho_temporario)
+    if resumo['lutadores']:
+        os.replace(caminho_temporario, caminho_saida)
+        print(f"\nOs dados brutos foram salvos em '{caminho_saida}'.")
+        if com_lutas:
+            resumo['lutas'] = _exportar_lutas(checkpoint, caminho_lutas)
+        checkpoint.descartar()
+    else:
+        os.remove(caminho_temporario)
+        print("\nNão foi possível salvar os dados brutos, pois nenhum lutador foi coletado.")
+        checkpoint.fechar()
+
+    return resumo
+
+
+def _executar_coleta(checkpoint, max_workers, requisicoes_por_segundo, max_em_voo, cache, frescor, parser,
+                     processos_parse, spool_dir, com_lutas=False, detalhes_lutas=True, shard=None, metricas=None):
+    parser = obter_parser(parser)
+    metricas = metricas if metricas is not None else MetricasColeta()
+    print(f"🧩 Backend de parsing: {parser.nome}")
+    letras = shard.letras(ALFABETO) if shard is not None else ALFABETO
+    if shard is not None:
+        print(f"🧱 {shard}: letras {''.join(letras)}")
+
+    # 🛑 LIMITADOR GLOBAL: substitui os antigos time.sleep(1) / time.sleep(2)
+    limitador = LimitadorDeTaxa(requisicoes_por_segundo=requisicoes_por_segundo, max_em_voo=max_em_voo)
+    with ClienteHTTP(limitador=limitador, tamanho_pool=max(max_workers, max_em_voo), cache=cache, frescor=frescor,
+                     metricas=metricas) as cliente:
+
+        # --- ETAPA 1: COLETAR TODOS OS LINKS POR ALFABETO (pulada se a fronteira já foi salva) ---
+        if not checkpoint.fronteira_completa():
+            print("Iniciando coleta de links em TODAS as páginas do alfabeto (A-Z)...")
+            urls_lutadores_completos = set()
+
+            with metricas.etapa('indice'):
+                for letra, links_da_letra in coletar_concorrente(
+                        functools.partial(extrair_links_por_letra, parser=parser), letras, cliente, max_workers):
+                    urls_lutadores_completos.update(url for url in links_da_letra if shard is None or shard.contem(url))
+
+            checkpoint.registrar_fronteira(sorted(urls_lutadores_completos))
+            print(f"\n✅ Coleta de links finalizada. Total de lutadores únicos encontrados: {len(urls_lutadores_completos)}")
+            print("----------------------------------------------------------------------")
+
+        # --- ETAPA 2: COLETAR OS DETALHES DE CADA LUTADOR PENDENTE ---
+        urls_pendentes = checkpoint.pendentes()
+        ja_coletados = checkpoint.total_fronteira() - len(urls_pendentes)
+        print(f"Iniciando coleta de detalhes... ({len(urls_pendentes)} pendentes, {ja_coletados} já coletados)")
+
+        with metricas.etapa('lutador'):
+            if processos_parse > 0:
+                print(f"🏭 Coleta em estágios: {max_workers} threads de download, {processos_parse} processos de parsing.")
+                urls_com_falha = coletar_detalhes_em_estagios(
+                    urls_pendentes, cliente, checkpoint, SpoolHTML(spool_dir), max_workers, processos_parse, parser, com_lutas)
+            else:
+                urls_com_falha = coletar_detalhes_concorrente(urls_pendentes, cliente, checkpoint, max_workers, parser, com_lutas)
+
+        # --- ETAPA 3 (modo por luta): UMA REQUISIÇÃO POR LUTA ÚNICA, NÃO POR LUTADOR ---
+        lutas_com_falha = []
+        if com_lutas and detalhes_lutas:
+            print("----------------------------------------------------------------------")
+            ids_lutador = {id_lutador(url) for url in checkpoint.urls_fronteira()} if shard is not None else None
+            with metricas.etapa('luta'):
+                lutas_com_falha = coletar_detalhes_lutas(cliente, checkpoint, max_workers, parser, ids_lutador)
+
+        # Checkpoint em memória: as páginas só são confirmadas no cache com a coleta concluída
+        if not checkpoint.em_disco:
+            cliente.confirmar()
+
+        # --- RESUMO DO TRANSPORTE (tentativas / falhas da execução) ---
+        estatisticas_http = cliente.estatisticas()
+
+    print(f"\n📡 Requisições: {estatisticas_http.get('tentativas', 0)} tentativas, "
+          f"{estatisticas_http.get('retentativas', 0)} retentativas, {estatisticas_http.get('falhas', 0)} falhas.")
+    if cache is not None:
+        print(f"💾 Cache: {estatisticas_http.get('paginas_alteradas', 0)} páginas novas/alteradas, "
+              f"{estatisticas_http.get('paginas_inalteradas', 0) + estatisticas_http.get('cache_304', 0) + estatisticas_http.get('cache_fresco', 0)} inalteradas.")
+    relatorio = metricas.relatorio()
+    print(f"⏱️ {relatorio['paginas']} páginas em {relatorio['duracao_segundos']:.1f} s "
+          f"({relatorio['paginas_por_segundo'] or 0:.2f} páginas/s, {relatorio['bytes'] / 1e6:.1f} MB).")
+    if urls_com_falha:
+        print(f"⚠️ {len(urls_com_falha)} lutadores NÃO foram coletados (veja 'lutadores_com_falha.txt').")
+    if com_lutas:
+        print(f"🥊 {checkpoint.total_lutas()} lutas únicas na tabela de lutas.")
+    if lutas_com_falha:
+        print(f"⚠️ {len(lutas_com_falha)} páginas de luta falharam (serão tentadas na próxima execução).")
+
+    total_lutadores = checkpoint.total_lutadores()
+    if total_lutadores:
+        print(f"\n✅ Pipeline de Coleta FINALIZADO. {total_lutadores} lutadores coletados.")
+    else:
+        print("\n❌ Nenhum dado de lutador foi coletado.")
+
+    return {
+        'lutadores': total_lutadores,
+        'urls_com_falha': urls_com_falha,
+        'estatisticas_http': estatisticas_http,
+        'lutas_com_falha': lutas_com_falha,
+        'metricas': metricas,
+    }
+
+
+def registrar_historico(caminho_csv=ARQUIVO_BRUTO, caminho_historico=HISTORICO_PADRAO, marcar_removidos=True):
+    """
+    Registra o CSV bruto desta coleta no histórico de versões (historico.py): só os
+    lutadores novos ou alterados desde a coleta anterior ganham uma nova versão.
+    Coletas com falhas não marcam ninguém como removido (o lutador pode só ter falhado).
+    """
+    historico = HistoricoLutadores(caminho_historico)
+    try:
+        resumo = historico.registrar_csv(caminho_csv, marcar_removidos=marcar_removidos)
+    finally:
+        historico.fechar()
+    print(f"🗂️ Histórico ({resumo['data']}): {resumo['novos']} novos, {resumo['alterados']} alterados, "
+          f"{resumo['removidos']} removidos de {resumo['lutadores']} lutadores.")
+    return resumo
+
+
+# --------------------------------------------------------------------------------
+# 5. COLETA PARTICIONADA (vários processos ou máquinas)
+# --------------------------------------------------------------------------------
+
+def mesclar_saidas_dos_shards(diretorio=DIR_SHARDS, caminho_saida=ARQUIVO_BRUTO, caminho_lutas=ARQUIVO_LUTAS_BRUTO,
+                              total=None):
+    """
+    Junta as saídas parciais de todos os shards de `diretorio` no CSV bruto final
+    (deduplicado pela URL do lutador) e, se todos os shards rodaram no modo por luta,
+    na tabela de lutas (deduplicada pelo 'ID_Luta'). Com `total`, só considera as
+    saídas de uma coleta em `total` shards. Não mescla nada se faltar algum shard.
+    Retorna o número de lutadores escritos (0 em caso de erro).
+    """
+    try:
+        arquivos, total, faltantes = arquivos_de_shards(diretorio, ARQUIVO_BRUTO, total)
+    except ValueError as e:
+        print(f"❌ {e}; apague as saídas antigas antes de mesclar.")
+        return 0
+    if not arquivos:
+        print(f"❌ Nenhuma saída de shard encontrada em '{diretorio}'.")
+        return 0
+    if faltantes:
+        print(f"❌ Faltam os shards {', '.join(map(str, faltantes))} de {total}; rode-os antes de mesclar.")
+        return 0
+
+    arquivos_lutas, _, faltantes_lutas = arquivos_de_shards(diretorio, ARQUIVO_LUTAS_BRUTO, total)
+    if arquivos_lutas and faltantes_lutas:
+        print(f"⚠️ Tabela de lutas ausente nos shards {', '.join(map(str, faltantes_lutas))}; as lutas não serão mescladas.")
+        arquivos_lutas = []
+
+    print(f"🧩 Mesclando {len(arquivos)} shards de '{diretorio}'...")
+    lutadores, lutas = mesclar_shards(arquivos, caminho_saida, arquivos_lutas, caminho_lutas)
+    print(f"✅ {lutadores} lutadores salvos em '{caminho_saida}'.")
+    if arquivos_lutas:
+        print(f"🥊 {lutas} lutas salvas em '{caminho_lutas}'.")
+    print("Execute o transform.py para atualizar o data mart.")
+    return lutadores
+
+
+def completar_lutas_dos_shards(caminho_lutas=ARQUIVO_LUTAS_BRUTO, max_workers=MAX_WORKERS,
+                               requisicoes_por_segundo=REQUISICOES_POR_SEGUNDO, max_em_voo=MAX_EM_VOO, parser=None):
+    """
+    Passada final do modo por luta na coleta particionada. Cada shard só busca as lutas
+    cujo lado 1 está na sua fronteira, então uma luta cujo lado 1 não foi coletado por
+    nenhum shard (adversário fora do índice, ou cuja página falhou) chega à mescla sem
+    detalhes. Busca as páginas dessas lutas na tabela já mesclada e a regrava.
+    Retorna os IDs das lutas que falharam.
+    """
+    if not os.path.exists(caminho_lutas):
+        return []
+    checkpoint = CheckpointColeta(caminho_lutas + '.detalhes.sqlite')
+    try:
+        checkpoint.carregar_lutas_csv(caminho_lutas)
+        if not checkpoint.lutas_sem_detalhes():
+            return []
+        print("----------------------------------------------------------------------")
+        print("🥊 Lutas que nenhum shard detalhou (lado 1 fora das fronteiras dos shards):")
+        limitador = LimitadorDeTaxa(requisicoes_por_segundo=requisicoes_por_segundo, max_em_voo=max_em_voo)
+        with ClienteHTTP(limitador=limitador, tamanho_pool=max(max_workers, max_em_voo)) as cliente:
+            lutas_com_falha = coletar_detalhes_lutas(cliente, checkpoint, max_workers, obter_parser(parser))
+        _exportar_lutas(checkpoint, caminho_lutas)
+    finally:
+        checkpoint.descartar()
+    if lutas_com_falha:
+        print(f"⚠️ {len(lutas_com_falha)} páginas de luta falharam (rode --mesclar-shards --lutas de novo para tentar).")
+    return lutas_com_falha
+
+
+def mesclar_relatorios_dos_shards(diretorio, total, lutadores, caminho_relatorio=RELATORIO_PADRAO, caminho_prometheus=None):
+    """
+    Junta os relatórios JSON dos `total` shards de `diretorio` no relatório da coleta
+    inteira (contadores e latências somados, veja MetricasColeta.incorporar) e, se
+    `caminho_prometheus` for informado, grava as métricas juntas no formato do Prometheus.
+    """
+    arquivos, _, faltantes = arquivos_de_shards(diretorio, caminho_relatorio, total)
+    if faltantes:
+        print(f"⚠️ Relatório ausente nos shards {', '.join(map(str, faltantes))}; as métricas deles ficam de fora.")
+    if not arquivos:
+        return
+
+    metricas = MetricasColeta()
+    extras = {'lutadores': lutadores, 'lutadores_com_falha': 0, 'lutas_com_falha': 0, 'estatisticas_http': {},
+              'shards': total, 'shards_sem_relatorio': faltantes}
+    for caminho in arquivos:
+        with open(caminho, encoding='utf-8') as f:
+            relatorio = json.load(f)
+        metricas.incorporar(relatorio)
+        for chave in ('lutadores_com_falha', 'lutas_com_falha'):
+            extras[chave] += relatorio.get(chave, 0)
+        for chave, valor in relatorio.get('estatisticas_http', {}).items():
+            extras['estatisticas_http'][chave] = extras['estatisticas_http'].get(chave, 0) + valor
+
+    metricas.salvar_json(caminho_relatorio, extras)
+    print(f"📈 Relatório dos {total} shards salvo em '{caminho_relatorio}'.")
+    if caminho_prometheus:
+        metricas.salvar_prometheus(caminho_prometheus)
+
+
+def coordenar_shards(total, argumentos_worker=(), particao='letra', requisicoes_por_segundo=REQUISICOES_POR_SEGUNDO,
+                     max_em_voo=MAX_EM_VOO, diretorio=DIR_SHARDS, caminho_relatorio=RELATORIO_PADRAO,
+                     caminho_prometheus=None):
+    """
+    Coordenador local: inicia um processo worker por shard (`--shard I/N`), espera todos
+    e mescla as saídas e os relatórios de métricas. Os workers saem do mesmo IP, então
+    a taxa e o limite de requisições simultâneas são divididos entre eles (o total fica
+    igual ao de uma coleta única). Saídas deixadas em `diretorio` por coletas com outro número de shards
+    são ignoradas. Em várias máquinas, rode `--shard I/N` em cada uma e `--mesclar-shards`
+    no final. Retorna o código de saída (0 = sucesso).
+    """
+    comando_base = [sys.executable, os.path.abspath(__file__), '--particao', particao, '--dir-shards', diretorio,
+                    '--rps', str(requisicoes_por_segundo / total), '--max-em-voo', str(max(1, max_em_voo // total)),
+                    *argumentos_worker]
+    print(f"🧱 Iniciando {total} workers (partição por {particao})...")
+    processos = [subprocess.Popen(comando_base + ['--shard', f'{indice}/{total}']) for indice in range(total)]
+    codigos = [processo.wait() for processo in processos]
+
+    com_erro = [indice for indice, codigo in enumerate(codigos) if codigo != 0]
+    if com_erro:
+        print(f"❌ Os shards {', '.join(map(str, com_erro))} terminaram com erro; rode de novo para retomar (checkpoint).")
+        return 1
+    lutadores = mesclar_saidas_dos_shards(diretorio, total=total)
+    if not lutadores:
+        return 1
+    mesclar_relatorios_dos_shards(diretorio, total, lutadores, caminho_relatorio, caminho_prometheus)
+    return 0
+
+
+def _argumentos_worker(args):
+    """Opções da linha de comando repassadas do coordenador para cada worker."""
+    # O relatório de cada worker vai para o diretório dos shards; o coordenador junta os
+    # relatórios (e grava o arquivo do Prometheus) depois da mescla
+    argumentos = ['--workers', str(args.workers), '--parser', obter_parser(args.parser).nome,
+                  '--processos-parse', str(args.processos_parse), '--spool', args.spool, '--cache', args.cache,
+                  '--relatorio', args.relatorio]
+    if args.frescor_horas:
+        argumentos += ['--frescor-horas', str(args.frescor_horas)]
+    for opcao in ('sem_cache', 'completo', 'lutas', 'lutas_sem_detalhes'):
+        if getattr(args, opcao):
+            argumentos.append('--' + opcao.replace('_', '-'))
+    return argumentos
+
+
+def _houve_falhas_nos_shards(diretorio, total=None):
+    """True se algum shard deixou a lista de lutadores que falharam (não marca removidos no histórico)."""
+    arquivos, _, _ = arquivos_de_shards(diretorio, ARQUIVO_FALHAS, total)
+    return any(os.path.getsize(caminho) for caminho in arquivos)
 
 
 # --------------------------------------------------------------------------------
-# 4. EXECUÇÃO PRINCIPAL
+# 6. EXECUÇÃO PRINCIPAL
 # --------------------------------------------------------------------------------
 
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Coleta as estatísticas de todos os lutadores do UFCStats.")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Número de threads de coleta.")
+    parser.add_argument("--rps", type=float, default=REQUISICOES_POR_SEGUNDO, help="Requisições por segundo (limite global).")
+    parser.add_argument("--max-em-voo", type=int, default=MAX_EM_VOO, help="Máximo de requisições simultâneas.")
+    parser.add_argument("--cache", default=CACHE_PADRAO, help="Arquivo do cache HTTP persistente.")
+    parser.add_argument("--sem-cache", action="store_true", help="Desativa o cache HTTP (re-coleta tudo).")
+    parser.add_argument("--frescor-horas", type=float, default=None,
+                        help="Não re-requisita páginas buscadas há menos de N horas.")
+    parser.add_argument("--completo", action="store_true",
+                        help="Ignora o snapshot anterior e re-processa todos os lutadores.")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PADRAO,
+                        help="Arquivo de checkpoint usado para retomar uma coleta interrompida.")
+    parser.add_argument("--parser", choices=list(BACKENDS), default=None,
+                        help="Backend de parsing do HTML (padrão: o mais rápido disponível).")
+    parser.add_argument("--processos-parse", type=int, default=0,
+                        help="Processos da etapa de parsing (0 = parsing junto com o download).")
+    parser.add_argument("--spool", default=SPOOL_PADRAO, help="Diretório do spool de HTML bruto.")
+    parser.add_argument("--somente-parse", action="store_true",
+                        help="Não acessa a rede: re-deriva o CSV bruto a partir do spool existente.")
+    parser.add_argument("--lutas", action="store_true",
+                        help=f"Modo por luta: também gera a tabela de lutas ('{ARQUIVO_LUTAS_BRUTO}').")
+    parser.add_argument("--lutas-sem-detalhes", action="store_true",
+                        help="No modo por luta, usa só as tabelas das páginas dos lutadores (sem buscar as páginas de luta).")
+    parser.add_argument("--shard", default=None,
+                        help="Roda só a fatia I/N da coleta (ex: 0/4); a saída parcial vai para --dir-shards.")
+    parser.add_argument("--particao", choices=PARTICOES, default='letra',
+                        help="Como dividir os lutadores entre os shards: por letra do índice ou por faixa de hash do ID.")
+    parser.add_argument("--dir-shards", default=DIR_SHARDS, help="Diretório das saídas parciais dos shards.")
+    parser.add_argument("--mesclar-shards", action="store_true",
+                        help="Junta as saídas dos shards no CSV bruto final (só acessa a rede com --lutas, "
+                             "para as páginas de luta que nenhum shard buscou).")
+    parser.add_argument("--coordenar", type=int, default=0, metavar="N",
+                        help="Inicia N workers locais (um por shard) e mescla as saídas no final.")
+    parser.add_argument("--historico", default=HISTORICO_PADRAO,
+                        help="Arquivo do histórico de versões dos lutadores (uma versão por alteração).")
+    parser.add_argument("--sem-historico", action="store_true",
+                        help="Não registra esta coleta no histórico de versões.")
+    parser.add_argument("--relatorio", default=RELATORIO_PADRAO,
+                        help="Relatório JSON da execução (latências por etapa, páginas/s, bytes, falhas, campos ausentes).")
+    parser.add_argument("--prometheus", default=None, metavar="ARQUIVO",
+                        help="Também grava as métricas no formato texto do Prometheus (textfile collector).")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
     
+    args = _parse_args()
+
+    if args.somente_parse:
+        reprocessar_spool(args.spool, ARQUIVO_BRUTO, max(1, args.processos_parse), args.parser, args.lutas)
+        raise SystemExit(0)
+
+    if args.mesclar_shards:
+        lutadores = mesclar_saidas_dos_shards(args.dir_shards)
+        if not lutadores:
+            raise SystemExit(1)
+        if args.lutas and not args.lutas_sem_detalhes:
+            completar_lutas_dos_shards(ARQUIVO_LUTAS_BRUTO, args.workers, args.rps, args.max_em_voo, args.parser)
+        _, total_shards, _ = arquivos_de_shards(args.dir_shards, ARQUIVO_BRUTO)
+        mesclar_relatorios_dos_shards(args.dir_shards, total_shards, lutadores, args.relatorio, args.prometheus)
+        if not args.sem_historico:
+            registrar_historico(ARQUIVO_BRUTO, args.historico,
+                                marcar_removidos=not _houve_falhas_nos_shards(args.dir_shards, total_shards))
+        raise SystemExit(0)
+
+    if args.coordenar:
+        codigo = coordenar_shards(args.coordenar, _argumentos_worker(args), args.particao, args.rps,
+                                  args.max_em_voo, args.dir_shards, args.relatorio, args.prometheus)
+        if codigo == 0 and args.lutas and not args.lutas_sem_detalhes:
+            completar_lutas_dos_shards(ARQUIVO_LUTAS_BRUTO, args.workers, args.rps, args.max_em_voo, args.parser)
+        if codigo == 0 and not args.sem_historico:
+            registrar_historico(ARQUIVO_BRUTO, args.historico,
+                                marcar_removidos=not _houve_falhas_nos_shards(args.dir_shards, args.coordenar))
+        raise SystemExit(codigo)
+
+    # Coleta particionada: saída, checkpoint e cache próprios de cada shard
+    try:
+        shard = Shard.de_texto(args.shard, args.particao) if args.shard else None
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    caminho_saida, caminho_lutas, arquivo_falhas = ARQUIVO_BRUTO, ARQUIVO_LUTAS_BRUTO, ARQUIVO_FALHAS
+    if shard is not None:
+        os.makedirs(args.dir_shards, exist_ok=True)
+        caminho_saida = shard.caminho(args.dir_shards, ARQUIVO_BRUTO)
+        caminho_lutas = shard.caminho(args.dir_shards, ARQUIVO_LUTAS_BRUTO)
+        arquivo_falhas = shard.caminho(args.dir_shards, arquivo_falhas)
+        args.relatorio = shard.caminho(args.dir_shards, args.relatorio)
+        args.checkpoint = shard.caminho(os.path.dirname(args.checkpoint), args.checkpoint)
+        args.cache = shard.caminho(os.path.dirname(args.cache), args.cache)
+
     print("Iniciando Projeto de Web Scraping e Data Engineering do UFC...")
+
+    # Snapshot anterior para o merge incremental (só funciona se ele já tiver a coluna 'URL')
+    snapshot_csv = None
+    if not args.completo and os.path.exists(ARQUIVO_BRUTO):
+        if 'URL' in pd.read_csv(ARQUIVO_BRUTO, nrows=0).columns:
+            snapshot_csv = ARQUIVO_BRUTO
+        else:
+            print(f"ℹ️ '{ARQUIVO_BRUTO}' não possui a coluna 'URL'; executando coleta completa.")
+
+    # No modo por luta, páginas inalteradas não são re-processadas: as lutas delas vêm da tabela anterior
+    snapshot_lutas_csv = ARQUIVO_LUTAS_BRUTO if args.lutas and os.path.exists(ARQUIVO_LUTAS_BRUTO) else None
+    if args.lutas and snapshot_csv is not None and snapshot_lutas_csv is None:
+        print(f"ℹ️ '{ARQUIVO_LUTAS_BRUTO}' não existe; executando coleta completa para montar a tabela de lutas.")
+        snapshot_csv = None
+
+    cache = None if args.sem_cache else CacheHTTP(args.cache)
+    metricas = MetricasColeta()
     
-    # Executa o Pipeline de Coleta Total
-    df_stats_brutos = pipeline_coleta_completa()
+    # Executa o Pipeline de Coleta Total (com checkpoint em disco)
+    resumo = pipeline_coleta_resumivel(
+        caminho_saida=caminho_saida,
+        caminho_checkpoint=args.checkpoint,
+        max_workers=args.workers,
+        requisicoes_por_segundo=args.rps,
+        max_em_voo=args.max_em_voo,
+        cache=cache,
+        frescor=args.frescor_horas * 3600 if args.frescor_horas else None,
+        snapshot_csv=snapshot_csv,
+        parser=args.parser,
+        processos_parse=args.processos_parse,
+        spool_dir=args.spool,
+        com_lutas=args.lutas,
+        detalhes_lutas=not args.lutas_sem_detalhes,
+        snapshot_lutas_csv=snapshot_lutas_csv,
+        caminho_lutas=caminho_lutas,
+        shard=shard,
+        metricas=metricas,
+    )
 
-    # Salva os dados brutos em um arquivo CSV 
-    if not df_stats_brutos.empty:
-        df_stats_brutos.to_csv('dados_ufc_brutos.csv', index=False)
-        print("\nOs dados brutos foram salvos em 'dados_ufc_brutos.csv'.")
-    else:
-        print("\nNão foi possível salvar os dados brutos, pois o DataFrame está vazio.")
\ No newline at end of file
+    if cache is not None:
+        cache.despejar()
+        cache.fechar()
+
+    # Relatório da execução (e o arquivo do Prometheus, se pedido)
+    metricas.salvar_json(args.relatorio, extras={
+        'lutadores': resumo['lutadores'],
+        'lutadores_com_falha': len(resumo['urls_com_falha']),
+        'lutas_com_falha': len(resumo['lutas_com_falha']),
+        'estatisticas_http': resumo['estatisticas_http'],
+        'shard': str(shard) if shard is not None else None,
+    })
+    print(f"📈 Relatório da coleta salvo em '{args.relatorio}'.")
+    if args.prometheus:
+        metricas.salvar_prometheus(args.prometheus)
+
+    # Lista os lutadores descartados para que possam ser recoletados (a lista sempre é a
+    # da última coleta: sem falhas, a de uma coleta anterior é apagada)
+    if resumo['urls_com_falha']:
+        with open(arquivo_falhas, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(resumo['urls_com_falha']) + '\n')
+    elif os.path.exists(arquivo_falhas):
+        os.remove(arquivo_falhas)
+
+    # Versiona o que mudou desde a coleta anterior (os shards registram só depois da mescla)
+    if shard is None and resumo['lutadores'] and not args.sem_historico:
+        registrar_historico(caminho_saida, args.historico, marcar_removidos=not resumo['urls_com_falha'])